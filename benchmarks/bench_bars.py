@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import time
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from azure_ai_foundry_demo.bars import BarSeries
+from azure_ai_foundry_demo.clients.polygon import _bar_from_entry
+from azure_ai_foundry_demo.metrics import compute_metrics
+
+
+def _polygon_results(bars: int, seed: int) -> list[dict[str, Any]]:
+    # Newest first, as the aggregates endpoint returns them for ``sort=desc``.
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, bars)))
+    start = 1_420_070_400_000
+    return [
+        {
+            "t": start + index * 86_400_000,
+            "o": float(close[index] * 0.998),
+            "h": float(close[index] * 1.01),
+            "l": float(close[index] * 0.99),
+            "c": float(close[index]),
+            "v": float(rng.uniform(1e6, 5e6)),
+        }
+        for index in reversed(range(bars))
+    ]
+
+
+def row_pipeline(results: list[dict[str, Any]]) -> pd.DataFrame:
+    # The previous path: model per bar, row dicts for the payload, per-column lists for the
+    # metrics, and a frame rebuilt from sorted rows in the UI.
+    bars = sorted((_bar_from_entry("MSFT", entry) for entry in results), key=lambda b: b.as_of)
+    rows = [bar.as_dict() for bar in bars]
+    columns = [
+        [math.nan if row[key] is None else row[key] for row in rows]
+        for key in ("open", "high", "low", "close", "volume")
+    ]
+    compute_metrics(*columns).summary()
+    json.dumps(rows)
+    frame = pd.DataFrame(sorted(rows, key=lambda row: row["date"]))
+    frame["date"] = pd.to_datetime(frame["date"])
+    return frame
+
+
+def columnar_pipeline(results: list[dict[str, Any]]) -> pd.DataFrame:
+    series = BarSeries.from_polygon_results("MSFT", results)
+    compute_metrics(series.open, series.high, series.low, series.close, series.volume).summary()
+    json.dumps(series.to_columns())
+    return series.to_frame()
+
+
+def _timed(call: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Daily bars: row models versus columnar series")
+    parser.add_argument("--bars", type=int, default=2520)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    results = _polygon_results(args.bars, args.seed)
+    rows_json = json.dumps([_bar_from_entry("MSFT", entry).as_dict() for entry in results])
+    columns_json = json.dumps(BarSeries.from_polygon_results("MSFT", results).to_columns())
+    timings = {
+        "row models": _timed(lambda: row_pipeline(results), args.repeat),
+        "columnar BarSeries": _timed(lambda: columnar_pipeline(results), args.repeat),
+    }
+    print(f"{args.bars} bars: fetch -> metrics -> serialize -> frame")
+    for label, millis in timings.items():
+        print(f"{label:<24}{millis:>10.2f} ms")
+    print(f"{'payload (rows)':<24}{len(rows_json):>10,} bytes")
+    print(f"{'payload (columns)':<24}{len(columns_json):>10,} bytes")
+
+
+if __name__ == "__main__":
+    main()
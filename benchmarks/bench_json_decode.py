@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+
+import httpx
+import numpy as np
+
+from azure_ai_foundry_demo import json_codec
+from azure_ai_foundry_demo.bars import BarSeries
+from azure_ai_foundry_demo.clients.polygon import _bar_from_entry
+from azure_ai_foundry_demo.clients.serper import SerperClient
+from azure_ai_foundry_demo.models import NewsHeadline
+
+
+def _polygon_body(bars: int, seed: int) -> bytes:
+    # A recorded-style aggregates response, exactly as it arrives on the wire.
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, bars)))
+    start = 1_420_070_400_000
+    results = [
+        {
+            "v": float(rng.uniform(1e6, 5e6)),
+            "vw": float(close[index]),
+            "o": float(close[index] * 0.998),
+            "c": float(close[index]),
+            "h": float(close[index] * 1.01),
+            "l": float(close[index] * 0.99),
+            "t": start + index * 86_400_000,
+            "n": int(rng.integers(1_000, 50_000)),
+        }
+        for index in range(bars)
+    ]
+    payload = {"ticker": "MSFT", "status": "OK", "resultsCount": bars, "results": results}
+    return json.dumps(payload).encode()
+
+
+def _serper_body(items: int) -> bytes:
+    news = [
+        {
+            "title": f"Headline {index} moves the stock",
+            "link": f"https://news.example.com/articles/{index}",
+            "snippet": "Shares traded higher after the company raised guidance. " * 3,
+            "date": "2 hours ago",
+            "source": "Example Wire",
+            "position": index + 1,
+        }
+        for index in range(items)
+    ]
+    return json.dumps({"searchParameters": {"q": "msft"}, "news": news}).encode()
+
+
+def _response(body: bytes) -> httpx.Response:
+    return httpx.Response(200, content=body, headers={"Content-Type": "application/json"})
+
+
+def stdlib_bars(body: bytes) -> object:
+    # The previous path: text decode plus stdlib parse, then one model per bar.
+    data = _response(body).json()
+    return [_bar_from_entry("MSFT", entry) for entry in data["results"]]
+
+
+def fast_bars(body: bytes) -> BarSeries:
+    data = json_codec.response_json(_response(body))
+    return BarSeries.from_polygon_results("MSFT", data["results"])
+
+
+def stdlib_headlines(body: bytes) -> list[NewsHeadline]:
+    data = _response(body).json()
+    return [
+        NewsHeadline(title=item.get("title", ""), link=item["link"], snippet=item.get("snippet"))
+        for item in data["news"]
+    ]
+
+
+def fast_headlines(client: SerperClient, body: bytes) -> list[NewsHeadline]:
+    return client._extract_news(json_codec.response_json(_response(body)))
+
+
+def _timed(call: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Response decoding: stdlib versus fast path")
+    parser.add_argument("--bars", type=int, nargs="+", default=[100, 1_000, 10_000, 50_000])
+    parser.add_argument("--headlines", type=int, nargs="+", default=[10, 100, 1_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    # Without orjson the "fast" column still measures bytes decoding with the stdlib parser.
+    decoder = "orjson" if json_codec.FAST_JSON else "stdlib json (install the fast-json extra)"
+    print(f"fast path decoder: {decoder}")
+    print(f"{'polygon bars':>14}{'bytes':>14}{'stdlib ms':>12}{'fast ms':>12}{'speedup':>10}")
+    for bars in args.bars:
+        body = _polygon_body(bars, args.seed)
+        slow = _timed(lambda body=body: stdlib_bars(body), args.repeat)
+        fast = _timed(lambda body=body: fast_bars(body), args.repeat)
+        print(f"{bars:>14,}{len(body):>14,}{slow:>12.2f}{fast:>12.2f}{slow / fast:>9.1f}x")
+
+    # ``_extract_news`` only reads the response, so a client without a live transport is fine.
+    client = SerperClient.__new__(SerperClient)
+    print(f"{'headlines':>14}{'bytes':>14}{'stdlib ms':>12}{'fast ms':>12}{'speedup':>10}")
+    for items in args.headlines:
+        body = _serper_body(items)
+        slow = _timed(lambda body=body: stdlib_headlines(body), args.repeat)
+        fast = _timed(lambda body=body: fast_headlines(client, body), args.repeat)
+        print(f"{items:>14,}{len(body):>14,}{slow:>12.2f}{fast:>12.2f}{slow / fast:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
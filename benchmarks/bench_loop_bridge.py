@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import concurrent.futures
+import threading
+import time
+from collections.abc import Callable
+
+from azure_ai_foundry_demo.agents.loop_bridge import LoopBridge
+
+
+def legacy_sync_await(coro):
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    if loop.is_running():
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            future = executor.submit(asyncio.run, coro)
+            return future.result()
+    return loop.run_until_complete(coro)
+
+
+async def _noop() -> None:
+    await asyncio.sleep(0)
+
+
+def _time_calls(call: Callable[[], None], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def _in_worker_thread(call: Callable[[], None], iterations: int) -> float:
+    # Streamlit executes scripts on worker threads that have no event loop.
+    result: list[float] = []
+    thread = threading.Thread(target=lambda: result.append(_time_calls(call, iterations)))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+def _in_running_loop(call: Callable[[], None], iterations: int) -> float:
+    async def runner() -> float:
+        return _time_calls(call, iterations)
+
+    return asyncio.run(runner())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-call overhead of sync_await strategies")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    bridge = LoopBridge(name="bench-bridge")
+    bridge.run(_noop())
+    scenarios = {
+        "worker thread (no loop)": _in_worker_thread,
+        "inside running loop": _in_running_loop,
+    }
+    print(f"{'scenario':<26}{'legacy us/call':>16}{'bridge us/call':>16}{'speedup':>10}")
+    for label, scenario in scenarios.items():
+        legacy = scenario(lambda: legacy_sync_await(_noop()), args.iterations)
+        bridged = scenario(lambda: bridge.run(_noop()), args.iterations)
+        print(f"{label:<26}{legacy:>16.1f}{bridged:>16.1f}{legacy / bridged:>9.1f}x")
+    bridge.shutdown()
+
+
+if __name__ == "__main__":
+    main()
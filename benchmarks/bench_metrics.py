@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+
+from azure_ai_foundry_demo.agents.tooling import _calculate_trend_metrics
+from azure_ai_foundry_demo.bars import BarSeries
+from azure_ai_foundry_demo.clients.polygon import PolygonDailyBar
+from azure_ai_foundry_demo.metrics import compute_metrics
+
+
+def legacy_trend_metrics(bars: list[PolygonDailyBar]) -> dict[str, float | None]:
+    # The list-based implementation the engine replaced (change, volume, high, low only).
+    closes = [bar.close for bar in bars if bar.close is not None]
+    volumes = [bar.volume for bar in bars if bar.volume is not None]
+    highs = [bar.high for bar in bars if bar.high is not None]
+    lows = [bar.low for bar in bars if bar.low is not None]
+    change = closes[-1] - closes[0] if len(closes) >= 2 else None
+    return {
+        "absolute_change": change,
+        "percent_change": change / closes[0] * 100 if change is not None else None,
+        "average_volume": sum(volumes) / len(volumes) if volumes else None,
+        "high": max(highs) if highs else None,
+        "low": min(lows) if lows else None,
+    }
+
+
+def _dataset(tickers: int, bars: int, seed: int) -> tuple[np.ndarray, ...]:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (tickers, bars)), axis=1))
+    open_ = close * (1 + rng.normal(0, 0.005, close.shape))
+    high = np.maximum(open_, close) * 1.005
+    low = np.minimum(open_, close) * 0.995
+    volume = rng.uniform(1e6, 5e6, close.shape)
+    return open_, high, low, close, volume
+
+
+def _as_bars(columns: tuple[np.ndarray, ...], row: int) -> list[PolygonDailyBar]:
+    start = datetime(2015, 1, 1, tzinfo=UTC)
+    open_, high, low, close, volume = (column[row].tolist() for column in columns)
+    return [
+        PolygonDailyBar(
+            ticker=f"T{row}",
+            as_of=start + timedelta(days=index),
+            open=open_[index],
+            high=high[index],
+            low=low[index],
+            close=close[index],
+            volume=volume[index],
+        )
+        for index in range(len(close))
+    ]
+
+
+def _as_series(columns: tuple[np.ndarray, ...], row: int) -> BarSeries:
+    start = int(datetime(2015, 1, 1, tzinfo=UTC).timestamp() * 1000)
+    timestamps = start + np.arange(columns[0].shape[1], dtype=np.int64) * 86_400_000
+    return BarSeries(f"T{row}", timestamps, np.stack([column[row] for column in columns]))
+
+
+def _timed(call: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Trend metrics: list-based versus vectorized")
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--bars", type=int, default=2520)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+
+    columns = _dataset(args.tickers, args.bars, args.seed)
+    bars = [_as_bars(columns, row) for row in range(args.tickers)]
+    series = [_as_series(columns, row) for row in range(args.tickers)]
+
+    results = {
+        "legacy lists (5 metrics, per ticker)": _timed(
+            lambda: [legacy_trend_metrics(series) for series in bars], args.repeat
+        ),
+        "tooling from BarSeries (all metrics)": _timed(
+            lambda: [_calculate_trend_metrics(item) for item in series], args.repeat
+        ),
+        "engine per ticker (all metrics)": _timed(
+            lambda: [
+                compute_metrics(*(column[row] for column in columns)).summary()
+                for row in range(args.tickers)
+            ],
+            args.repeat,
+        ),
+        "engine batch (all metrics, one call)": _timed(
+            lambda: compute_metrics(*columns), args.repeat
+        ),
+    }
+    print(f"{args.tickers} tickers x {args.bars} bars")
+    for label, millis in results.items():
+        print(f"{label:<46}{millis:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from pydantic import BaseModel, HttpUrl
+
+from azure_ai_foundry_demo.clients.polygon import PolygonDailyBar, PolygonQuote
+from azure_ai_foundry_demo.models import Headline
+
+
+# The previous pydantic representations, kept here for comparison.
+class ModelDailyBar(BaseModel):
+    ticker: str
+    as_of: datetime
+    open: float | None = None
+    high: float | None = None
+    low: float | None = None
+    close: float | None = None
+    volume: float | None = None
+
+
+class ModelQuote(BaseModel):
+    ticker: str
+    close: float
+    open: float | None = None
+    as_of: datetime
+
+
+class ModelHeadline(BaseModel):
+    title: str
+    link: HttpUrl
+    snippet: str | None = None
+
+
+def _bar_kwargs(records: int) -> list[dict[str, Any]]:
+    as_of = datetime(2024, 10, 1, tzinfo=UTC)
+    return [
+        {
+            "ticker": f"T{index}",
+            "as_of": as_of,
+            "open": 100.0 + index % 50,
+            "high": 101.0 + index % 50,
+            "low": 99.0 + index % 50,
+            "close": 100.5 + index % 50,
+            "volume": 1e6 + index,
+        }
+        for index in range(records)
+    ]
+
+
+def _quote_kwargs(records: int) -> list[dict[str, Any]]:
+    as_of = datetime(2024, 10, 1, tzinfo=UTC)
+    return [
+        {"ticker": f"T{index}", "close": 100.5 + index % 50, "open": 100.0, "as_of": as_of}
+        for index in range(records)
+    ]
+
+
+def _headline_kwargs(records: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "title": f"Headline {index}",
+            "link": f"https://news.example.com/articles/{index}",
+            "snippet": "Shares traded higher after the company raised guidance.",
+        }
+        for index in range(records)
+    ]
+
+
+def _measure(factory: Callable[..., object], rows: list[dict[str, Any]]) -> tuple[float, int]:
+    # Returns (records per second, bytes retained by the built records).
+    gc.collect()
+    start = time.perf_counter()
+    built = [factory(**row) for row in rows]
+    elapsed = time.perf_counter() - start
+    del built
+    gc.collect()
+    tracemalloc.start()
+    built = [factory(**row) for row in rows]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del built
+    return len(rows) / elapsed, retained
+
+
+CASES: dict[str, tuple[Callable[[int], list[dict[str, Any]]], type, type]] = {
+    "daily bar": (_bar_kwargs, ModelDailyBar, PolygonDailyBar),
+    "quote": (_quote_kwargs, ModelQuote, PolygonQuote),
+    "headline": (_headline_kwargs, ModelHeadline, Headline),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Hot-path records: pydantic versus slotted")
+    parser.add_argument("--records", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    header = f"{'record':<11}{'count':>11}{'pydantic rec/s':>16}{'slots rec/s':>14}"
+    print(header + f"{'pydantic B/rec':>16}{'slots B/rec':>13}")
+    for label, (make_rows, model, slotted) in CASES.items():
+        for records in args.records:
+            rows = make_rows(records)
+            model_rate, model_bytes = _measure(model, rows)
+            slot_rate, slot_bytes = _measure(slotted, rows)
+            print(
+                f"{label:<11}{records:>11,}{model_rate:>16,.0f}{slot_rate:>14,.0f}"
+                f"{model_bytes / records:>16.0f}{slot_bytes / records:>13.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
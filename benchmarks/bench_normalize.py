@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import time
+import tracemalloc
+from collections.abc import Callable
+
+from azure_ai_foundry_demo.agents.utils import StreamingNormalizer, _normalize_text
+
+_CODES = "USD|EUR|GBP|JPY|CAD|AUD|CHF"
+_MONTHS = "January|February|March|April|May|June|July|August|September|October|November|December"
+_ESCAPED_NUMBER_RE = re.compile(r"\\(\d)")
+_BOLD_ITALIC_RE = re.compile(r"(\*\*|__|\*|_)(.+?)\1")
+_NUMBERED_LIST_RE = re.compile(r"^(\s*)(\d+)[\.)]\s+", re.MULTILINE)
+_CURRENCY_AFTER_NUMBER_RE = re.compile(rf"(\d)({_CODES})")
+_CURRENCY_BEFORE_LETTER_RE = re.compile(rf"({_CODES})(?=[A-Za-z])")
+_MONTH_DAY_RE = re.compile(rf"({_MONTHS})(\d)")
+_COMMA_NO_SPACE_RE = re.compile(r",(?=\S)")
+
+
+def legacy_normalize(raw: str) -> str:
+    # The previous implementation: eight substitutions, each copying the whole text, then a
+    # line-by-line whitespace pass.
+    text = raw.replace("\r\n", "\n")
+    text = _ESCAPED_NUMBER_RE.sub(r"\1", text)
+    text = _BOLD_ITALIC_RE.sub(lambda m: m.group(2), text)
+    text = _NUMBERED_LIST_RE.sub(lambda m: f"{m.group(1)}- ", text)
+    text = _CURRENCY_AFTER_NUMBER_RE.sub(lambda m: f"{m.group(1)} {m.group(2)}", text)
+    text = _CURRENCY_BEFORE_LETTER_RE.sub(lambda m: f"{m.group(1)} ", text)
+    text = _MONTH_DAY_RE.sub(lambda m: f"{m.group(1)} {m.group(2)}", text)
+    text = _COMMA_NO_SPACE_RE.sub(", ", text)
+    normalized: list[str] = []
+    for raw_line in text.split("\n"):
+        line = raw_line.strip()
+        if not line:
+            if normalized and normalized[-1] != "":
+                normalized.append("")
+            continue
+        if line.startswith("- "):
+            normalized.append(line)
+            continue
+        if normalized and not normalized[-1].startswith("- ") and normalized[-1] != "":
+            normalized[-1] = f"{normalized[-1]} {line}"
+            continue
+        normalized.append(line)
+    return "\n".join(normalized).strip()
+
+
+def _briefing(target_bytes: int, seed: int) -> str:
+    # Analyst-style markdown: headings, wrapped prose with glued currency/date tokens, numbered
+    # and bulleted lists, escaped digits and CRLF line breaks.
+    rng = random.Random(seed)
+    sections: list[str] = []
+    size = 0
+    while size < target_bytes:
+        price = rng.uniform(50, 900)
+        section = (
+            f"**Price Snapshot** \u2014 MSFT closed at {price:.2f}USD,down {rng.uniform(0, 5):.1f}%"
+            f" on September{rng.randint(1, 30)},2025.\r\n"
+            f"The _intraday_ range was {price * 0.98:.2f}USD to {price * 1.02:.2f}USD with volume\n"
+            f"running {rng.randint(5, 40)}% above the 20-day average.\n\n"
+            "**Key Headlines**\n"
+            f"1. Guidance raised for FY{rng.randint(24, 27)}\\1\n"
+            "2) Cloud revenue beat,margins steady\n"
+            "- Analysts lifted targets to EURparity\n\n"
+        )
+        sections.append(section)
+        size += len(section)
+    return "".join(sections)
+
+
+def _streamed(chunk_size: int) -> Callable[[str], str]:
+    # Feeds the document in model-sized deltas, as the UI receives it.
+    def normalize(text: str) -> str:
+        normalizer = StreamingNormalizer()
+        parts = [
+            normalizer.feed(text[start : start + chunk_size])
+            for start in range(0, len(text), chunk_size)
+        ]
+        parts.append(normalizer.flush())
+        return "".join(parts)
+
+    return normalize
+
+
+def _measure(normalize: Callable[[str], str], text: str, repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        normalize(text)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    normalize(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Text normalizer: multi-pass versus single scan")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000, 10_000_000]
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--chunk", type=int, default=16, help="streamed delta size in characters")
+    args = parser.parse_args()
+    streamed = _streamed(args.chunk)
+
+    print(
+        f"{'bytes':>12}{'legacy MB/s':>14}{'single MB/s':>14}{'stream MB/s':>14}"
+        f"{'legacy peak':>14}{'single peak':>14}"
+    )
+    for size in args.sizes:
+        text = _briefing(size, args.seed)
+        expected = _normalize_text(text)
+        if legacy_normalize(text) != expected or streamed(text) != expected:
+            raise SystemExit("normalizers disagree")
+        megabytes = len(text) / 1e6
+        legacy_time, legacy_peak = _measure(legacy_normalize, text, args.repeat)
+        single_time, single_peak = _measure(_normalize_text, text, args.repeat)
+        stream_time, _ = _measure(streamed, text, args.repeat)
+        print(
+            f"{len(text):>12,}{megabytes / legacy_time:>14.1f}{megabytes / single_time:>14.1f}"
+            f"{megabytes / stream_time:>14.1f}"
+            f"{legacy_peak / 1e6:>12.1f}MB{single_peak / 1e6:>12.1f}MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
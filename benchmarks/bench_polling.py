@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+
+from azure_ai_foundry_demo.agents.polling import PollingStrategy
+from azure_ai_foundry_demo.agents.stage_specs import ANALYST_STAGE, PRICE_STAGE, ROUTER_POLLING
+
+
+class FakeRunsApi:
+    # Simulated runs.get: a run reports completion once its duration has elapsed on a virtual clock.
+    def __init__(self, duration: float) -> None:
+        self.duration = duration
+        self.gets = 0
+
+    def is_complete(self, now: float) -> bool:
+        self.gets += 1
+        return now >= self.duration
+
+
+def simulate(strategy: PollingStrategy, duration: float, rng: random.Random) -> tuple[float, int]:
+    api = FakeRunsApi(duration)
+    now = 0.0
+    attempt = 0
+    while not api.is_complete(now):
+        now += strategy.interval(attempt, rng)
+        attempt += 1
+    # The first status check comes from the runs.create response, not a GET.
+    return now - duration, api.gets - 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Polling latency versus runs.get request count")
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+
+    strategies = {
+        "fixed 1.0s (legacy)": PollingStrategy.fixed(1.0),
+        "router": ROUTER_POLLING,
+        "price/news stage": PRICE_STAGE.polling,
+        "analyst stage": ANALYST_STAGE.polling,
+    }
+    workloads = {"short (0.1-0.6s)": (0.1, 0.6), "medium (1-5s)": (1, 5), "long (10-40s)": (10, 40)}
+    rng = random.Random(args.seed)
+    print(
+        f"{'workload':<18}{'strategy':<22}{'mean extra ms':>14}{'p95 extra ms':>14}{'GETs/run':>10}"
+    )
+    for workload, (low, high) in workloads.items():
+        durations = [rng.uniform(low, high) for _ in range(args.samples)]
+        for label, strategy in strategies.items():
+            assert strategy is not None
+            results = [simulate(strategy, duration, rng) for duration in durations]
+            overshoot = sorted(extra * 1000 for extra, _ in results)
+            gets = statistics.fmean(count for _, count in results)
+            p95 = overshoot[int(len(overshoot) * 0.95) - 1]
+            print(
+                f"{workload:<18}{label:<22}{statistics.fmean(overshoot):>14.0f}{p95:>14.0f}"
+                f"{gets:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from collections.abc import Callable, Sequence
+from textwrap import dedent
+
+import numpy as np
+
+from azure_ai_foundry_demo.agents.memory import ConversationMemory
+from azure_ai_foundry_demo.agents.prompt_budget import DEFAULT_TOKEN_BUDGET, count_tokens
+from azure_ai_foundry_demo.agents.prompt_builders import build_analysis_prompt
+from azure_ai_foundry_demo.agents.stage_models import StageResult
+from azure_ai_foundry_demo.bars import BarSeries
+from azure_ai_foundry_demo.models import FinanceResearchPayload
+
+
+def legacy_analysis_prompt(
+    ticker: str,
+    stage_results: Sequence[StageResult],
+    *,
+    last_payload: FinanceResearchPayload | None,
+    summary: str | None,
+    conversation_history: Sequence[dict[str, str]] | None,
+    user_message: str | None,
+) -> str:
+    # The previous builder: indented JSON and every turn and note, without any limit.
+    structured_payload = (
+        json.dumps(last_payload.model_dump(mode="json"), indent=2)
+        if last_payload is not None
+        else "No structured market data captured."
+    )
+    stage_block = "\n\n".join(
+        f"{stage.name.replace('-', ' ').title()} Notes:\n" + "\n".join(stage.messages)
+        for stage in stage_results
+    )
+    history_block = "\n".join(
+        f"{entry['role'].capitalize()}: {entry['content']}" for entry in conversation_history or ()
+    )
+    return dedent(f"""
+        You are the lead financial analyst preparing the final briefing for {ticker.upper()}.
+
+        Previous summary: {summary}
+        User focus: {user_message}
+
+        Conversation history:
+        {history_block}
+
+        Specialist contributions:
+        {stage_block}
+
+        Structured market data:
+        {structured_payload}
+        """).strip()
+
+
+def _inputs(
+    turns: int, bars: int, seed: int
+) -> tuple[list[StageResult], FinanceResearchPayload, list[dict[str, str]]]:
+    rng = random.Random(seed)
+    timestamps = 1_600_000_000_000 + np.arange(bars, dtype=np.int64) * 86_400_000
+    closes = np.cumsum(np.random.default_rng(seed).normal(0, 2, bars)) + 400
+    values = np.vstack([closes - 1, closes + 2, closes - 2, closes, np.full(bars, 2.5e7)])
+    payload = FinanceResearchPayload.model_validate(
+        {
+            "quote": {"ticker": "MSFT", "price": float(closes[-1]), "currency": "USD"},
+            "historical": BarSeries("MSFT", timestamps, values),
+            "news": [
+                {"title": f"Headline {index}", "link": f"https://example.com/{index}"}
+                for index in range(5)
+            ],
+        }
+    )
+    stages = [
+        StageResult(name=name, messages=[f"{name} note {index}. " * 12 for index in range(3)])
+        for name in ("price-stage", "news-stage")
+    ]
+    history = [
+        {
+            "role": "user" if index % 2 == 0 else "assistant",
+            "content": f"Turn {index}: how do margins compare with guidance? " * rng.randint(1, 8),
+        }
+        for index in range(turns)
+    ]
+    return stages, payload, history
+
+
+def _time(build: Callable[[], str], repeat: int) -> tuple[float, str]:
+    best, prompt = float("inf"), ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        prompt = build()
+        best = min(best, time.perf_counter() - start)
+    return best, prompt
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Analysis prompt: unbounded versus budgeted")
+    parser.add_argument("--turns", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--bars", type=int, nargs="+", default=[250, 5000])
+    parser.add_argument("--budget", type=int, default=DEFAULT_TOKEN_BUDGET)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(
+        f"{'turns':>7}{'bars':>7}{'legacy tokens':>15}{'budget tokens':>15}"
+        f"{'legacy ms':>11}{'budget ms':>11}{'memory ms':>11}"
+    )
+    for bars in args.bars:
+        for turns in args.turns:
+            stages, payload, history = _inputs(turns, bars, args.seed)
+            kwargs = {
+                "last_payload": payload,
+                "summary": "Panel summary",
+                "conversation_history": history,
+                "user_message": "What changed since yesterday?",
+            }
+            legacy_time, legacy = _time(
+                lambda: legacy_analysis_prompt("msft", stages, **kwargs), args.repeat
+            )
+            budget_time, budgeted = _time(
+                lambda: build_analysis_prompt("msft", stages, token_budget=args.budget, **kwargs),
+                args.repeat,
+            )
+            # A follow-up with rolling memory: only the newest turn is folded in per build.
+            memory = ConversationMemory.from_history(history)
+            kwargs["conversation_history"] = None
+            memory_time, _ = _time(
+                lambda: build_analysis_prompt(
+                    "msft", stages, token_budget=args.budget, memory=memory, **kwargs
+                ),
+                args.repeat,
+            )
+            print(
+                f"{turns:>7,}{bars:>7,}{count_tokens(legacy):>15,}{count_tokens(budgeted):>15,}"
+                f"{legacy_time * 1e3:>11.2f}{budget_time * 1e3:>11.2f}{memory_time * 1e3:>11.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
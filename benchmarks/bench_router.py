@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from azure_ai_foundry_demo.agents.intent import FastPathRouter
+
+# Follow-ups with the stages a router agent would be expected to pick.
+MESSAGES: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("What's the price now?", ("price", "analysis")),
+    ("Any news?", ("news", "analysis")),
+    ("Where is it trading?", ("price", "analysis")),
+    ("Any headlines today?", ("news", "analysis")),
+    ("How volatile has it been?", ("price", "analysis")),
+    ("Did they announce earnings?", ("news", "analysis")),
+    ("Why did it drop this morning?", ("price", "news", "analysis")),
+    ("Should I buy more?", ("analysis",)),
+    ("Can you summarise that?", ("analysis",)),
+    ("What about their cloud business in Europe?", ("news", "analysis")),
+    ("Compare the valuation with peers and recent coverage", ("price", "news", "analysis")),
+    ("Hi", ("analysis",)),
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Follow-up routing: local fast path vs agent")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument(
+        "--llm-latency", type=float, default=1.5, help="assumed router agent round trip, seconds"
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    router = FastPathRouter()
+    agreed = 0
+    classify_seconds = 0.0
+    for _ in range(args.requests):
+        message, stages = rng.choice(MESSAGES)
+        start = time.perf_counter()
+        routed = router.route(message, lambda stages=stages: stages)
+        classify_seconds += time.perf_counter() - start
+        agreed += set(routed) == set(stages)
+
+    stats = router.stats
+    print(f"requests          {args.requests:>10,} (seed {args.seed})")
+    print(f"fast path         {stats.fast_path:>10,} ({stats.fast_path_rate:.1%})")
+    print(f"router agent      {stats.llm_routed:>10,}")
+    print(f"agreement         {agreed / args.requests:>10.1%}")
+    print(f"local us/request  {classify_seconds / args.requests * 1e6:>10.1f}")
+    print(f"agent time saved  {stats.fast_path * args.llm_latency:>10,.0f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from unittest.mock import MagicMock
+
+from azure_ai_foundry_demo.workflow import StockResearchWorkflow
+
+PAYLOAD = {
+    "quote": {},
+    "news": [],
+    "organic_results": [],
+    "research_notes": [],
+    "analysis": [],
+}
+
+
+class SimulatedOrchestrator:
+    # Each run sleeps for a random latency drawn to resemble a three-stage agent run.
+    def __init__(self, low: float, high: float, seed: int) -> None:
+        self._rng = random.Random(seed)
+        self._low = low
+        self._high = high
+
+    def run(self, ticker: str) -> dict[str, object]:
+        time.sleep(self._rng.uniform(self._low, self._high))
+        return dict(PAYLOAD, ticker=ticker)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="run_many throughput versus concurrency")
+    parser.add_argument("--tickers", type=int, default=200)
+    parser.add_argument("--low", type=float, default=0.01)
+    parser.add_argument("--high", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+
+    tickers = [f"T{index:04d}" for index in range(args.tickers)]
+    print(f"{'concurrency':>12}{'seconds':>10}{'tickers/s':>12}")
+    for concurrency in (1, 2, 4, 8, 16, 32):
+        orchestrator = SimulatedOrchestrator(args.low, args.high, args.seed)
+        workflow = StockResearchWorkflow(settings=MagicMock(), orchestrator=orchestrator)
+        started = time.perf_counter()
+        outcomes = list(workflow.run_many(tickers, concurrency, timeout=60))
+        elapsed = time.perf_counter() - started
+        assert all(outcome.ok for outcome in outcomes)
+        print(f"{concurrency:>12}{elapsed:>10.2f}{len(outcomes) / elapsed:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
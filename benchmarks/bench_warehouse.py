@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from azure_ai_foundry_demo.bars import BarSeries
+from azure_ai_foundry_demo.warehouse import BarWarehouse
+
+DAY_MS = 86_400_000
+
+
+def _series(ticker: str, bars: int, rng: np.random.Generator) -> BarSeries:
+    start = int(datetime(2015, 1, 1, tzinfo=UTC).timestamp() * 1000)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, bars)))
+    values = np.stack(
+        [close * 0.998, close * 1.01, close * 0.99, close, rng.uniform(1e6, 5e6, bars)]
+    )
+    return BarSeries(ticker, start + np.arange(bars, dtype=np.int64) * DAY_MS, values)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="5Y daily lookback: warehouse versus JSON pages")
+    parser.add_argument("--tickers", type=int, default=100)
+    parser.add_argument("--bars", type=int, default=1260)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    universe = [_series(f"T{index:04d}", args.bars, rng) for index in range(args.tickers)]
+    # What the aggregates endpoint would return for each ticker, already downloaded.
+    pages = [
+        json.dumps(
+            {
+                "results": [
+                    {"t": int(t), "o": o, "h": h, "l": low, "c": c, "v": v}
+                    for t, (o, h, low, c, v) in zip(
+                        series.timestamps.tolist(), series.values.T.tolist(), strict=True
+                    )
+                ]
+            }
+        )
+        for series in universe
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        warehouse = BarWarehouse(
+            Path(directory) / "bars.sqlite3", now=lambda: datetime.now(UTC) + timedelta(days=1)
+        )
+        started = time.perf_counter()
+        for series in universe:
+            warehouse.append(series)
+        ingest = time.perf_counter() - started
+
+        end_ms = int(universe[0].timestamps[-1]) + DAY_MS
+        started = time.perf_counter()
+        for series in universe:
+            warehouse.query(series.ticker, 0, end_ms)
+        query = time.perf_counter() - started
+        warehouse.close()
+
+    started = time.perf_counter()
+    for series, page in zip(universe, pages, strict=True):
+        BarSeries.from_polygon_results(series.ticker, json.loads(page)["results"])
+    decode = time.perf_counter() - started
+
+    total = args.tickers * args.bars
+    print(f"{args.tickers} tickers x {args.bars} daily bars")
+    print(f"{'warehouse ingest':<34}{ingest * 1000:>10.1f} ms ({total / ingest:,.0f} bars/s)")
+    print(f"{'warehouse range query':<34}{query / args.tickers * 1000:>10.3f} ms per ticker")
+    print(f"{'decode downloaded JSON page':<34}{decode / args.tickers * 1000:>10.3f} ms per ticker")
+    print("(the network path also pays one or more HTTP round trips per ticker)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,15 @@
+from .loop_bridge import LoopBridge
 from .orchestrator import StockAgentOrchestrator
-from .runner import AgentRunResult, AzureAgentRunner
+from .registry import AgentRegistry
+from .runner import AgentRunResult, AsyncAzureAgentRunner, AzureAgentRunner
 from .tooling import ResearchTooling
 
 __all__ = [
+    "AgentRegistry",
     "AgentRunResult",
+    "AsyncAzureAgentRunner",
     "AzureAgentRunner",
+    "LoopBridge",
     "ResearchTooling",
     "StockAgentOrchestrator",
 ]
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import math
+import re
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import asdict, dataclass
+
+DEFAULT_FAST_PATH_CONFIDENCE = 0.85
+# Longer messages tend to carry several asks; those go to the LLM router.
+DEFAULT_MAX_WORDS = 32
+# The stages the classifier decides on; "analysis" is always part of a follow-up.
+ROUTED_STAGES = ("price", "news")
+# Probability a stage is wanted when one of its rules matches.
+_RULE_CONFIDENCE = 0.97
+
+_WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+_STAGE_RULES = {
+    "price": re.compile(
+        r"\b(?:price[sd]?|quote|trading at|trades? at|share price|stock price|charts?|trend\w*"
+        r"|rsi|moving averages?|volatil\w*|volume|52[- ]week|ytd|intraday|how much is"
+        r"|(?:is|was) it (?:up|down)|perform\w*)\b"
+    ),
+    "news": re.compile(
+        r"\b(?:news|headlines?|announce\w*|press releases?|articles?|reports?|rumou?rs?"
+        r"|coverage|what happened|lawsuits?|mergers?|acquisitions?|filings?)\b"
+    ),
+}
+# Rules cannot tell "price" from "no price"; such requests go to the LLM router.
+_NEGATION_RE = re.compile(r"\b(?:not?|without|skip|except|ignore|don't|dont|never|instead)\b")
+
+# Labelled follow-ups the classifier starts from; LLM routing decisions are added at runtime.
+SEED_EXAMPLES: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("what's the price now", ("price",)),
+    ("where is it trading right now", ("price",)),
+    ("how did the stock do today", ("price",)),
+    ("is it up or down this week", ("price",)),
+    ("show me the latest quote", ("price",)),
+    ("how volatile has it been lately", ("price",)),
+    ("what was the closing level yesterday", ("price",)),
+    ("did shares rally after the open", ("price",)),
+    ("how far is it from the 52 week high", ("price",)),
+    ("what does the chart look like", ("price",)),
+    ("how much did it drop", ("price",)),
+    ("what's the momentum and rsi", ("price",)),
+    ("any news", ("news",)),
+    ("what are the latest headlines", ("news",)),
+    ("anything new from the company", ("news",)),
+    ("what happened with the lawsuit", ("news",)),
+    ("did they announce anything this week", ("news",)),
+    ("any press coverage on the product launch", ("news",)),
+    ("what are analysts saying in the media", ("news",)),
+    ("is there any recent news about the ceo", ("news",)),
+    ("any updates on the merger", ("news",)),
+    ("why did the stock move today", ("price", "news")),
+    ("why is it down so much", ("price", "news")),
+    ("give me a full update on price and news", ("price", "news")),
+    ("what's driving the share price this week", ("price", "news")),
+    ("how did the market react to the earnings announcement", ("price", "news")),
+    ("should i buy it", ()),
+    ("is this a good long term investment", ()),
+    ("can you summarise that", ()),
+    ("explain that in simpler terms", ()),
+    ("what's your recommendation", ()),
+    ("what are the main risks", ()),
+    ("thanks", ()),
+    ("can you shorten the previous answer", ()),
+    ("what would you do in my position", ()),
+    ("compare that with your earlier view", ()),
+)
+
+
+def tokenize(text: str) -> list[str]:
+    # Lowercased words plus adjacent word pairs.
+    words = _WORD_RE.findall(text.lower())
+    return words + [f"{left} {right}" for left, right in zip(words, words[1:], strict=False)]
+
+
+class IntentClassifier:
+    # One binary multinomial naive Bayes model per routed stage, on words and word pairs with
+    # add-one smoothing. Training only updates counts, so it can keep learning from the LLM
+    # router's decisions at runtime. Words it has never seen leave the prior unchanged.
+    def __init__(self, stages: Sequence[str] = ROUTED_STAGES) -> None:
+        self.stages = tuple(stages)
+        # Per stage: counts for [without the stage, with the stage].
+        self._docs = {stage: [0, 0] for stage in self.stages}
+        self._words = {stage: (Counter[str](), Counter[str]()) for stage in self.stages}
+        self._totals = {stage: [0, 0] for stage in self.stages}
+        self._vocabulary: set[str] = set()
+
+    def fit(self, examples: Iterable[tuple[str, Sequence[str]]]) -> IntentClassifier:
+        for text, stages in examples:
+            self.learn(text, stages)
+        return self
+
+    def learn(self, text: str, stages: Sequence[str]) -> None:
+        tokens = tokenize(text)
+        if not tokens:
+            return
+        self._vocabulary.update(tokens)
+        for stage in self.stages:
+            label = int(stage in stages)
+            self._docs[stage][label] += 1
+            self._words[stage][label].update(tokens)
+            self._totals[stage][label] += len(tokens)
+
+    def predict(self, text: str) -> dict[str, float]:
+        # Probability that each stage is wanted.
+        tokens = [token for token in tokenize(text) if token in self._vocabulary]
+        vocabulary = len(self._vocabulary) or 1
+        probabilities = {}
+        for stage in self.stages:
+            docs, words, totals = self._docs[stage], self._words[stage], self._totals[stage]
+            # Log-odds of "wanted" against "not wanted".
+            margin = math.log((docs[1] + 1) / (docs[0] + 1))
+            wanted, unwanted = totals[1] + vocabulary, totals[0] + vocabulary
+            for token in tokens:
+                margin += math.log((words[1][token] + 1) / wanted)
+                margin -= math.log((words[0][token] + 1) / unwanted)
+            probabilities[stage] = 1.0 / (1.0 + math.exp(-max(min(margin, 50.0), -50.0)))
+        return probabilities
+
+
+@dataclass(slots=True, frozen=True)
+class RouteDecision:
+    stages: tuple[str, ...]
+    # The least certain of the per-stage decisions, from 0.5 to 1; 0 when the message is
+    # not classified locally.
+    confidence: float
+
+
+@dataclass
+class RouterStats:
+    fast_path: int = 0
+    llm_routed: int = 0
+    fast_seconds: float = 0.0
+    llm_seconds: float = 0.0
+
+    @property
+    def fast_path_rate(self) -> float:
+        routed = self.fast_path + self.llm_routed
+        return self.fast_path / routed if routed else 0.0
+
+    @property
+    def saved_seconds(self) -> float:
+        # Fast-path decisions valued at the mean observed LLM routing latency.
+        if not self.llm_routed:
+            return 0.0
+        return self.fast_path * self.llm_seconds / self.llm_routed - self.fast_seconds
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            **asdict(self),
+            "fast_path_rate": self.fast_path_rate,
+            "saved_seconds": self.saved_seconds,
+        }
+
+
+class FastPathRouter:
+    # Routes follow-ups locally when the rules and the classifier agree with enough
+    # confidence, and otherwise calls the LLM router, learning from its answer.
+    def __init__(
+        self,
+        *,
+        threshold: float = DEFAULT_FAST_PATH_CONFIDENCE,
+        max_words: int = DEFAULT_MAX_WORDS,
+        classifier: IntentClassifier | None = None,
+        enabled: bool = True,
+    ) -> None:
+        if not 0.5 <= threshold <= 1.0:
+            raise ValueError("threshold must be between 0.5 and 1")
+        self._threshold = threshold
+        self._max_words = max_words
+        self._enabled = enabled
+        self._classifier = classifier or IntentClassifier().fit(SEED_EXAMPLES)
+        self._lock = threading.Lock()
+        self.stats = RouterStats()
+
+    def classify(self, message: str) -> RouteDecision:
+        text = message.lower()
+        words = len(_WORD_RE.findall(text))
+        if not words or words > self._max_words or _NEGATION_RE.search(text):
+            return RouteDecision(stages=(), confidence=0.0)
+        with self._lock:
+            probabilities = self._classifier.predict(text)
+        stages = []
+        confidence = 1.0
+        for stage, probability in probabilities.items():
+            rule = _STAGE_RULES.get(stage)
+            if rule is not None and rule.search(text):
+                probability = max(probability, _RULE_CONFIDENCE)
+            if probability >= 0.5:
+                stages.append(stage)
+            confidence = min(confidence, max(probability, 1.0 - probability))
+        return RouteDecision(stages=(*stages, "analysis"), confidence=confidence)
+
+    def route(self, message: str, fallback: Callable[[], Sequence[str]]) -> list[str]:
+        # ``fallback`` runs the LLM router and returns its stages; an empty answer is not
+        # learned from.
+        started = time.perf_counter()
+        if self._enabled:
+            decision = self.classify(message)
+            if decision.confidence >= self._threshold:
+                with self._lock:
+                    self.stats.fast_path += 1
+                    self.stats.fast_seconds += time.perf_counter() - started
+                return list(decision.stages)
+        started = time.perf_counter()
+        stages = list(fallback())
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.stats.llm_routed += 1
+            self.stats.llm_seconds += elapsed
+            if stages:
+                self._classifier.learn(message, stages)
+        return stages
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LoopBridge:
+    # A single long-running event loop on a daemon thread. Sync code hands coroutines to it with
+    # run_coroutine_threadsafe, so loop-bound resources (pooled HTTP connections) survive between
+    # calls instead of being torn down with a throwaway loop.
+    def __init__(self, name: str = "loop-bridge") -> None:
+        self._name = name
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or not self.is_running:
+                self._start()
+            assert self._loop is not None
+            return self._loop
+
+    def in_bridge_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> concurrent.futures.Future[T]:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+        if self.in_bridge_thread():
+            coro.close()
+            raise RuntimeError("Cannot block on the loop bridge from inside its own event loop")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def shutdown(self, timeout: float | None = 5.0) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is None or thread is None:
+            return
+        if thread.is_alive():
+            cleanup = asyncio.run_coroutine_threadsafe(_cancel_pending_tasks(), loop)
+            try:
+                cleanup.result(timeout)
+            except Exception:
+                logger.debug("Loop bridge cleanup did not finish cleanly", exc_info=True)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+        if thread.is_alive():
+            logger.warning("Loop bridge thread %s did not stop within %.1fs", thread.name, timeout)
+            return
+        loop.close()
+        logger.debug("Loop bridge %s shut down", self._name)
+
+    def _start(self) -> None:
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def _serve() -> None:
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        thread = threading.Thread(target=_serve, name=self._name, daemon=True)
+        thread.start()
+        ready.wait()
+        self._loop = loop
+        self._thread = thread
+        logger.debug("Started loop bridge %s", self._name)
+
+
+async def _cancel_pending_tasks() -> None:
+    current = asyncio.current_task()
+    pending = [task for task in asyncio.all_tasks() if task is not current]
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    await asyncio.get_running_loop().shutdown_asyncgens()
+
+
+_default_bridge = LoopBridge()
+
+
+def get_loop_bridge() -> LoopBridge:
+    return _default_bridge
+
+
+def shutdown_loop_bridge(timeout: float | None = 5.0) -> None:
+    _default_bridge.shutdown(timeout)
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Mapping, Sequence
+
+from azure_ai_foundry_demo.agents.prompt_budget import (
+    condense_turns,
+    render_history,
+    truncate_tokens,
+    turn_topic,
+)
+
+DEFAULT_WINDOW_TURNS = 6
+DEFAULT_TURN_TOKENS = 400
+DEFAULT_SUMMARY_TOPICS = 8
+
+NO_HISTORY = "No prior conversation provided."
+
+
+class ConversationMemory:
+    # Rolling chat memory for follow-ups: the latest turns verbatim (each clipped to
+    # ``turn_tokens``), and a digest of the evicted ones made of a turn count plus the last
+    # ``summary_topics`` user questions. Each turn is folded in once and the rendered block is
+    # cached until the next turn, so building a prompt does not grow with the conversation.
+    def __init__(
+        self,
+        *,
+        window_turns: int = DEFAULT_WINDOW_TURNS,
+        turn_tokens: int = DEFAULT_TURN_TOKENS,
+        summary_topics: int = DEFAULT_SUMMARY_TOPICS,
+    ) -> None:
+        if window_turns < 1 or turn_tokens < 1 or summary_topics < 0:
+            raise ValueError("Conversation memory limits must be positive")
+        self._window_turns = window_turns
+        self._turn_tokens = turn_tokens
+        self._window: deque[str] = deque()
+        self._topics: deque[str] = deque(maxlen=summary_topics)
+        self._evicted = 0
+        # History entries consumed by ``sync`` and the last one, to detect edited histories.
+        self._entries = 0
+        self._last_entry: tuple[str, str] | None = None
+        self._rendered: str | None = None
+        self._shrunk: tuple[int, str] | None = None
+
+    @classmethod
+    def from_history(
+        cls, history: Sequence[Mapping[str, str]], **limits: int
+    ) -> ConversationMemory:
+        memory = cls(**limits)
+        memory.sync(history)
+        return memory
+
+    def __len__(self) -> int:
+        return len(self._window) + self._evicted
+
+    @property
+    def evicted(self) -> int:
+        return self._evicted
+
+    def clear(self) -> None:
+        self._window.clear()
+        self._topics.clear()
+        self._evicted = self._entries = 0
+        self._last_entry = None
+        self._invalidate()
+
+    def append(self, role: str, content: str) -> None:
+        self._entries += 1
+        self._last_entry = (role, content)
+        if not content:
+            return
+        self._window.append(truncate_tokens(f"{role.capitalize()}: {content}", self._turn_tokens))
+        if len(self._window) > self._window_turns:
+            self._evict(self._window.popleft())
+        self._invalidate()
+
+    def sync(self, history: Sequence[Mapping[str, str]]) -> None:
+        # Folds in the entries added since the last call; a history that was shortened or
+        # edited is replayed from the start.
+        seen = self._entries
+        if seen > len(history) or (seen and _entry_key(history[seen - 1]) != self._last_entry):
+            self.clear()
+            seen = 0
+        for index in range(seen, len(history)):
+            self.append(*_entry_key(history[index]))
+
+    def summary(self) -> str:
+        if not self._evicted:
+            return ""
+        return condense_turns((), 1 << 30, evicted=self._evicted, topics=self._topics)
+
+    def render(self) -> str:
+        # The history block without a title, or NO_HISTORY.
+        if self._rendered is None:
+            lines = list(self._window)
+            if self._evicted:
+                lines.insert(0, self.summary())
+            self._rendered = "\n".join(lines) if lines else NO_HISTORY
+        return self._rendered
+
+    def render_within(self, allowance: int, *, title: str) -> str:
+        # ``title`` plus as much of the block as fits in ``allowance`` tokens.
+        if self._shrunk is None or self._shrunk[0] != allowance:
+            text = render_history(
+                list(self._window),
+                allowance,
+                title=title,
+                evicted=self._evicted,
+                topics=self._topics,
+            )
+            self._shrunk = (allowance, text)
+        return self._shrunk[1]
+
+    def _evict(self, turn: str) -> None:
+        self._evicted += 1
+        topic = turn_topic(turn)
+        if topic is not None:
+            self._topics.append(topic)
+
+    def _invalidate(self) -> None:
+        self._rendered = None
+        self._shrunk = None
+
+
+def _entry_key(entry: Mapping[str, str]) -> tuple[str, str]:
+    return entry.get("role", "user"), entry.get("content", "")
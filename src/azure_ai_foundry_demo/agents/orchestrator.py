@@ -1,71 +1,193 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Sequence
+from collections.abc import Callable, Mapping, Sequence
+from typing import Any
 
 from azure.ai.agents.models import Agent
 from azure.ai.projects import AIProjectClient
-from azure.core.exceptions import HttpResponseError
 from azure.identity import DefaultAzureCredential
 
+from azure_ai_foundry_demo.agents.intent import FastPathRouter
+from azure_ai_foundry_demo.agents.memory import ConversationMemory
 from azure_ai_foundry_demo.agents.prompt_builders import (
     build_analysis_prompt,
     build_news_prompt,
     build_price_prompt,
     build_router_prompt,
 )
-from azure_ai_foundry_demo.agents.runner import AzureAgentRunner
+from azure_ai_foundry_demo.agents.registry import AgentRegistry
+from azure_ai_foundry_demo.agents.runner import AgentRunResult, AzureAgentRunner
+from azure_ai_foundry_demo.agents.stage_graph import StageGraph
 from azure_ai_foundry_demo.agents.stage_models import StageResult
 from azure_ai_foundry_demo.agents.stage_specs import (
-    ANALYST_STAGE,
-    NEWS_STAGE,
-    PRICE_STAGE,
     ROUTER_INSTRUCTIONS,
+    ROUTER_POLLING,
     STAGE_REGISTRY,
     StageSpec,
 )
 from azure_ai_foundry_demo.agents.tooling import ResearchTooling
+from azure_ai_foundry_demo.agents.utils import sync_await
+from azure_ai_foundry_demo.bars import BarSeries
+from azure_ai_foundry_demo.cache import build_cache_backend
+from azure_ai_foundry_demo.clients.http import SharedHttpClient
 from azure_ai_foundry_demo.clients.polygon import PolygonClient
+from azure_ai_foundry_demo.clients.polygon_cache import CachedPolygonClient
 from azure_ai_foundry_demo.clients.serper import SerperClient
+from azure_ai_foundry_demo.clients.serper_cache import CachedSerperClient
 from azure_ai_foundry_demo.config import Settings, get_settings
-
+from azure_ai_foundry_demo.rate_limit import RateLimiter, RateLimitPolicy
+from azure_ai_foundry_demo.warehouse import BarWarehouse
 
 FOLLOW_UP_STAGE_ORDER = ["price", "news", "analysis"]
 
+TextDeltaCallback = Callable[[str], None]
+
 
 class StockAgentOrchestrator:
-    def __init__(self, settings: Settings | None = None) -> None:
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        *,
+        http_client: SharedHttpClient | None = None,
+    ) -> None:
         self._settings = settings or get_settings()
+        self._rate_limiters = {
+            "polygon": RateLimiter(
+                "polygon",
+                rate=self._settings.polygon_rate_limit,
+                max_in_flight=self._settings.polygon_max_in_flight,
+            ),
+            "serper": RateLimiter(
+                "serper",
+                rate=self._settings.serper_rate_limit,
+                max_in_flight=self._settings.serper_max_in_flight,
+            ),
+            "azure_agents": RateLimiter(
+                "azure_agents",
+                rate=self._settings.azure_agents_rate_limit,
+                max_in_flight=self._settings.azure_agents_max_in_flight,
+            ),
+        }
         credential = DefaultAzureCredential()
         self._project_client = AIProjectClient(
             endpoint=self._settings.project_endpoint(),
             credential=credential,
+            per_retry_policies=[RateLimitPolicy(self._rate_limiters["azure_agents"])],
         )
         self._runner = AzureAgentRunner(self._project_client)
-        self._polygon_client = PolygonClient(self._settings)
-        self._serper_client = SerperClient(self._settings)
-        self._tooling = ResearchTooling(self._polygon_client, self._serper_client)
-
-    def run(self, ticker: str) -> dict[str, Any]:
-        self._tooling.reset()
-        specialists: list[StageResult] = []
-        price_stage = self._run_stage(spec=PRICE_STAGE, prompt=build_price_prompt(ticker))
-        specialists.append(price_stage)
-        news_stage = self._run_stage(spec=NEWS_STAGE, prompt=build_news_prompt(ticker))
-        specialists.append(news_stage)
-        analysis_stage = self._run_stage(
-            spec=ANALYST_STAGE,
-            prompt=build_analysis_prompt(
-                ticker,
-                specialists,
-                last_payload=self._tooling.last_payload,
-                summary=None,
-                conversation_history=None,
-                user_message=None,
+        self._router = FastPathRouter(
+            threshold=self._settings.router_fast_path_confidence,
+            enabled=self._settings.router_fast_path,
+        )
+        self._agent_registry = AgentRegistry(
+            self._project_client.agents, self._settings.azure_ai_agent_model
+        )
+        self._owns_http_client = http_client is None
+        self._http_client = http_client or SharedHttpClient(self._settings)
+        self._polygon_cache = build_cache_backend(
+            self._settings.polygon_cache_backend,
+            path=self._settings.polygon_cache_path,
+            max_entries=self._settings.polygon_cache_max_entries,
+            max_bytes=self._settings.polygon_cache_max_bytes,
+        )
+        self._warehouse: BarWarehouse | None = None
+        if self._settings.bar_warehouse_mode != "off":
+            self._warehouse = BarWarehouse(
+                self._settings.bar_warehouse_path,
+                mmap_bytes=self._settings.bar_warehouse_mmap_bytes,
+            )
+        # In warehouse-first mode BarWarehouse.load stores what it fetches, so the client only
+        # ingests in ingest mode; attaching it in both places would write every page twice.
+        ingest_into = self._warehouse if self._settings.bar_warehouse_mode == "ingest" else None
+        self._polygon_client: PolygonClient
+        if self._polygon_cache is None:
+            self._polygon_client = PolygonClient(
+                self._settings,
+                http_client=self._http_client,
+                rate_limiter=self._rate_limiters["polygon"],
+                warehouse=ingest_into,
+            )
+        else:
+            self._polygon_client = CachedPolygonClient(
+                self._settings,
+                self._polygon_cache,
+                http_client=self._http_client,
+                rate_limiter=self._rate_limiters["polygon"],
+                warehouse=ingest_into,
+            )
+        self._serper_cache = build_cache_backend(
+            self._settings.serper_cache_backend,
+            path=self._settings.serper_cache_path,
+            max_entries=self._settings.serper_cache_max_entries,
+            max_bytes=self._settings.serper_cache_max_bytes,
+        )
+        self._serper_client: SerperClient
+        if self._serper_cache is None:
+            self._serper_client = SerperClient(
+                self._settings,
+                http_client=self._http_client,
+                rate_limiter=self._rate_limiters["serper"],
+            )
+        else:
+            self._serper_client = CachedSerperClient(
+                self._settings,
+                self._serper_cache,
+                http_client=self._http_client,
+                rate_limiter=self._rate_limiters["serper"],
+                ttl=self._settings.serper_cache_ttl,
+                stale_ttl=self._settings.serper_cache_stale_ttl,
+            )
+        self._tooling = ResearchTooling(
+            self._polygon_client,
+            self._serper_client,
+            warehouse=(
+                self._warehouse if self._settings.bar_warehouse_mode == "warehouse-first" else None
             ),
         )
+
+    def rate_limit_stats(self) -> dict[str, dict[str, float]]:
+        return {name: limiter.stats.as_dict() for name, limiter in self._rate_limiters.items()}
+
+    def router_stats(self) -> dict[str, float]:
+        return self._router.stats.as_dict()
+
+    def close(self) -> None:
+        self._agent_registry.shutdown()
+        if self._owns_http_client and self._http_client.is_open:
+            sync_await(self._http_client.aclose())
+        for cache in (self._polygon_cache, self._serper_cache):
+            if cache is not None:
+                cache.close()
+        if self._warehouse is not None:
+            self._warehouse.close()
+        self._project_client.close()
+
+    def __enter__(self) -> StockAgentOrchestrator:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def conversation_memory(self) -> ConversationMemory:
+        return ConversationMemory(
+            window_turns=self._settings.conversation_window_turns,
+            turn_tokens=self._settings.conversation_turn_tokens,
+        )
+
+    def prefetch_quotes(self, tickers: Sequence[str]) -> int:
+        # Warms the grouped-daily index so each run's previous-close lookup is answered locally.
+        quotes = sync_await(self._polygon_client.fetch_previous_closes(tickers))
+        return len(quotes)
+
+    def run(self, ticker: str, *, on_delta: TextDeltaCallback | None = None) -> dict[str, Any]:
+        tooling = self._tooling.fork()
+        specialists, analysis_stage = self._run_stages(
+            ticker, FOLLOW_UP_STAGE_ORDER, tooling, on_delta=on_delta
+        )
         return self._build_payload(
             ticker,
+            tooling,
             stage_results=specialists,
             final_analysis=analysis_stage.messages,
         )
@@ -77,72 +199,33 @@ class StockAgentOrchestrator:
         user_message: str,
         summary: str | None = None,
         conversation_history: list[dict[str, str]] | None = None,
+        memory: ConversationMemory | None = None,
+        on_delta: TextDeltaCallback | None = None,
     ) -> dict[str, Any]:
-        self._tooling.reset()
-        history = conversation_history or []
+        # Pass the same ``memory`` every turn to fold in only the new history entries.
+        if memory is None:
+            memory = self.conversation_memory()
+        memory.sync(conversation_history or [])
+        tooling = self._tooling.fork()
         requested = self._route_follow_up(
             ticker,
+            tooling,
             summary=summary,
-            conversation_history=history,
+            memory=memory,
             user_message=user_message,
         )
-        stage_sequence = self._ordered_stage_list(requested)
-
-        specialists: list[StageResult] = []
-        analysis_stage: StageResult | None = None
-
-        for stage_name in stage_sequence:
-            spec = STAGE_REGISTRY.get(stage_name)
-            if spec is None:
-                continue
-            if stage_name == "price":
-                stage = self._run_stage(
-                    spec=spec,
-                    prompt=build_price_prompt(
-                        ticker,
-                        summary=summary,
-                        focus=user_message,
-                    ),
-                )
-                specialists.append(stage)
-            elif stage_name == "news":
-                stage = self._run_stage(
-                    spec=spec,
-                    prompt=build_news_prompt(
-                        ticker,
-                        summary=summary,
-                        focus=user_message,
-                    ),
-                )
-                specialists.append(stage)
-            elif stage_name == "analysis":
-                analysis_stage = self._run_stage(
-                    spec=spec,
-                    prompt=build_analysis_prompt(
-                        ticker,
-                        specialists,
-                        last_payload=self._tooling.last_payload,
-                        summary=summary,
-                        conversation_history=history,
-                        user_message=user_message,
-                    ),
-                )
-
-        if analysis_stage is None:
-            analysis_stage = self._run_stage(
-                spec=ANALYST_STAGE,
-                prompt=build_analysis_prompt(
-                    ticker,
-                    specialists,
-                    last_payload=self._tooling.last_payload,
-                    summary=summary,
-                    conversation_history=history,
-                    user_message=user_message,
-                ),
-            )
-
+        specialists, analysis_stage = self._run_stages(
+            ticker,
+            self._ordered_stage_list(requested),
+            tooling,
+            summary=summary,
+            memory=memory,
+            user_message=user_message,
+            on_delta=on_delta,
+        )
         payload = self._build_payload(
             ticker,
+            tooling,
             stage_results=specialists,
             final_analysis=analysis_stage.messages,
         )
@@ -150,61 +233,127 @@ class StockAgentOrchestrator:
         payload["messages"] = payload["research_notes"] + analysis_stage.messages
         return payload
 
-    def _create_agent(self, *, name: str, instructions: str, tools: Sequence[Any]) -> Agent:
-        return self._project_client.agents.create_agent(
-            model=self._settings.azure_ai_agent_model,
-            name=name,
-            instructions=instructions,
-            tools=list(tools),
-        )
+    def _run_stages(
+        self,
+        ticker: str,
+        stage_names: Sequence[str],
+        tooling: ResearchTooling,
+        *,
+        summary: str | None = None,
+        memory: ConversationMemory | None = None,
+        user_message: str | None = None,
+        on_delta: TextDeltaCallback | None = None,
+    ) -> tuple[list[StageResult], StageResult]:
+        graph = StageGraph({name: STAGE_REGISTRY[name] for name in stage_names})
 
-    def _run_stage(self, *, spec: StageSpec, prompt: str) -> StageResult:
-        tools = self._tooling.get_function_definitions() if spec.uses_tools else []
-        agent = self._create_agent(name=spec.name, instructions=spec.instructions, tools=tools)
-        try:
+        def execute(name: str, finished: Mapping[str, StageResult]) -> StageResult:
+            spec = STAGE_REGISTRY[name]
+            if name == "price":
+                prompt = build_price_prompt(ticker, summary=summary, focus=user_message)
+            elif name == "news":
+                prompt = build_news_prompt(ticker, summary=summary, focus=user_message)
+            else:
+                prompt = build_analysis_prompt(
+                    ticker,
+                    [finished[dep] for dep in graph.order if dep in finished],
+                    last_payload=tooling.last_payload,
+                    summary=summary,
+                    user_message=user_message,
+                    token_budget=self._settings.prompt_token_budget,
+                    memory=memory,
+                )
+                return self._run_stage(spec=spec, prompt=prompt, tooling=tooling, on_delta=on_delta)
+            return self._run_stage(spec=spec, prompt=prompt, tooling=tooling)
+
+        results = graph.run(execute)
+        analysis_stage = results.pop("analysis")
+        return list(results.values()), analysis_stage
+
+    def _run_stage(
+        self,
+        *,
+        spec: StageSpec,
+        prompt: str,
+        tooling: ResearchTooling,
+        on_delta: TextDeltaCallback | None = None,
+    ) -> StageResult:
+        tools = tooling.get_function_definitions() if spec.uses_tools else []
+        agent = self._agent_registry.get_or_create(
+            name=spec.name, instructions=spec.instructions, tools=tools
+        )
+        stage_tooling = tooling if spec.uses_tools else None
+        if on_delta is None:
             result = self._runner.run_with_functions(
                 agent=agent,
                 user_prompt=prompt,
-                tooling=self._tooling if spec.uses_tools else None,
+                tooling=stage_tooling,
+                polling=spec.polling,
             )
-        finally:
-            self._delete_agent(agent)
-        return StageResult(name=spec.name, messages=result.messages)
+        else:
+            result = self._stream_stage(agent, prompt, stage_tooling, on_delta)
+        return StageResult(name=spec.name, messages=result.messages, poll_count=result.poll_count)
 
-    def _delete_agent(self, agent: Agent) -> None:
-        try:
-            self._project_client.agents.delete_agent(agent.id)
-        except HttpResponseError:
-            pass
+    def _stream_stage(
+        self,
+        agent: Agent,
+        prompt: str,
+        tooling: ResearchTooling | None,
+        on_delta: TextDeltaCallback,
+    ) -> AgentRunResult:
+        result: AgentRunResult | None = None
+        for event in self._runner.stream_with_functions(agent, prompt, tooling):
+            if event.kind == "text_delta":
+                on_delta(event.text)
+            elif event.kind == "completed":
+                result = event.result
+        if result is None:
+            raise RuntimeError("Streaming run finished without a result")
+        return result
 
     def _route_follow_up(
         self,
         ticker: str,
+        tooling: ResearchTooling,
+        *,
+        summary: str | None,
+        memory: ConversationMemory,
+        user_message: str,
+    ) -> list[str]:
+        # Obvious requests are classified locally; the rest go to the router agent.
+        return self._router.route(
+            user_message,
+            lambda: self._llm_route_follow_up(
+                ticker, tooling, summary=summary, memory=memory, user_message=user_message
+            ),
+        )
+
+    def _llm_route_follow_up(
+        self,
+        ticker: str,
+        tooling: ResearchTooling,
         *,
         summary: str | None,
-        conversation_history: Sequence[dict[str, str]] | None,
+        memory: ConversationMemory,
         user_message: str,
     ) -> list[str]:
         router_prompt = build_router_prompt(
             ticker,
             summary=summary,
-            conversation_history=conversation_history,
             user_message=user_message,
-            last_payload=self._tooling.last_payload,
+            last_payload=tooling.last_payload,
+            memory=memory,
         )
-        agent = self._create_agent(
+        agent = self._agent_registry.get_or_create(
             name="followup-router",
             instructions=ROUTER_INSTRUCTIONS,
             tools=[],
         )
-        try:
-            result = self._runner.run_with_functions(
-                agent=agent,
-                user_prompt=router_prompt,
-                tooling=None,
-            )
-        finally:
-            self._delete_agent(agent)
+        result = self._runner.run_with_functions(
+            agent=agent,
+            user_prompt=router_prompt,
+            tooling=None,
+            polling=ROUTER_POLLING,
+        )
         decision_text = result.messages[-1] if result.messages else ""
         return self._parse_router_response(decision_text)
 
@@ -241,6 +390,7 @@ class StockAgentOrchestrator:
     def _build_payload(
         self,
         ticker: str,
+        tooling: ResearchTooling,
         *,
         stage_results: Sequence[StageResult],
         final_analysis: list[str],
@@ -248,17 +398,18 @@ class StockAgentOrchestrator:
         quote: dict[str, Any] = {}
         news: list[dict[str, Any]] = []
         organic_results: list[dict[str, Any]] = []
-        historical: list[dict[str, Any]] = []
+        historical = BarSeries.empty(ticker.upper())
         metrics: dict[str, Any] | None = None
-        if self._tooling.last_payload is not None:
-            data = self._tooling.last_payload.model_dump()
+        if tooling.last_payload is not None:
+            data = tooling.last_payload.model_dump()
             quote = data.get("quote", {}) or {}
             news = data.get("news", []) or []
             organic_results = data.get("organic_results", []) or []
-            historical = data.get("historical", []) or []
+            # Bars stay columnar; the UI turns them into a frame without another pass.
+            historical = tooling.last_payload.historical
             metrics = data.get("metrics") or None
-        if not organic_results and self._tooling.last_news_results:
-            organic_results = self._tooling.last_news_results
+        if not organic_results and tooling.last_news_results:
+            organic_results = tooling.last_news_results
         stage_notes = self._format_stage_notes(stage_results)
         return {
             "ticker": ticker.upper(),
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class PollingStrategy:
+    initial_interval: float = 0.2
+    fast_polls: int = 3
+    multiplier: float = 1.6
+    max_interval: float = 2.0
+    jitter: float = 0.1
+
+    def __post_init__(self) -> None:
+        if self.initial_interval < 0 or self.max_interval < self.initial_interval:
+            raise ValueError("Polling intervals must satisfy 0 <= initial_interval <= max_interval")
+        if self.fast_polls < 0 or self.multiplier < 1 or not 0 <= self.jitter < 1:
+            raise ValueError("Invalid polling backoff parameters")
+
+    @classmethod
+    def fixed(cls, interval: float) -> PollingStrategy:
+        return cls(
+            initial_interval=interval, fast_polls=0, multiplier=1.0, max_interval=interval, jitter=0
+        )
+
+    def interval(self, attempt: int, rng: random.Random | None = None) -> float:
+        # ``attempt`` counts polls since the run was created or last resumed after tool outputs.
+        if attempt < self.fast_polls:
+            base = self.initial_interval
+        else:
+            exponent = min(attempt - self.fast_polls + 1, 64)
+            base = min(self.initial_interval * self.multiplier**exponent, self.max_interval)
+        if not self.jitter:
+            return base
+        spread = base * self.jitter
+        return max(0.0, base + (rng or random).uniform(-spread, spread))
+
+
+@dataclass
+class PollStats:
+    polls: int = 0
+    waited_seconds: float = 0.0
+
+    def record(self, delay: float) -> None:
+        self.polls += 1
+        self.waited_seconds += delay
+
+
+DEFAULT_POLLING = PollingStrategy()
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import math
+import re
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from functools import cache
+from itertools import chain, islice
+from typing import Any
+
+import numpy as np
+
+from azure_ai_foundry_demo import json_codec
+from azure_ai_foundry_demo.bars import BarSeries
+from azure_ai_foundry_demo.models import FinanceResearchPayload
+
+# Exact counts need the optional ``exact-tokens`` extra; without it every count is the
+# pre-tokenizer estimate below.
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - exercised only without the optional tokenizer
+    tiktoken = None
+
+DEFAULT_TOKEN_BUDGET = 6000
+TRUNCATION_MARK = "…"
+
+# The pre-tokenizer of the GPT encodings: words with their leading space, digit groups of up
+# to three, punctuation runs and whitespace. Counting its pieces approximates the token count
+# closely enough for budgeting; it is the default when tiktoken is not installed.
+_PIECE_RE = re.compile(r" ?[^\W\d_]+| ?\d{1,3}| ?[^\s\w]+|\s+|_")
+# Below this many characters per allowed token a full count in C beats stopping early.
+_EARLY_EXIT_CHARS_PER_TOKEN = 8
+# Recent bars rendered to estimate the tokens each bar costs.
+_BAR_SAMPLE = 32
+
+
+@cache
+def _encoding() -> Any:
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:  # pragma: no cover - the encoding file could not be loaded
+        return None
+
+
+def count_tokens(text: str, *, limit: int | None = None) -> int:
+    # With ``limit`` the count may stop early once it exceeds the limit, which keeps budget
+    # checks on large sections proportional to the budget rather than the text.
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    if limit is not None and len(text) > _EARLY_EXIT_CHARS_PER_TOKEN * limit:
+        return sum(1 for _ in islice(_PIECE_RE.finditer(text), max(limit, 0) + 1))
+    # ``subn`` counts the pieces in C without materialising them.
+    return _PIECE_RE.subn("", text)[1]
+
+
+def truncate_tokens(text: str, limit: int) -> str:
+    # Cuts ``text`` to at most ``limit`` tokens, marking the cut.
+    if limit <= 0:
+        return ""
+    if count_tokens(text) <= limit:
+        return text
+    encoding = _encoding()
+    if encoding is not None:
+        head = encoding.decode(encoding.encode(text, disallowed_special=())[: limit - 1])
+    else:
+        pieces = list(islice(_PIECE_RE.finditer(text), limit - 1))
+        head = text[: pieces[-1].end()] if pieces else ""
+    return f"{head.rstrip()}{TRUNCATION_MARK}"
+
+
+@dataclass(slots=True)
+class PromptSection:
+    name: str
+    text: str
+    # Lower numbers are granted tokens first; sections are still rendered in list order.
+    priority: int
+    # Renders the section within a token allowance when the full text does not fit. Sections
+    # without one are kept whole at priority 0 and dropped otherwise.
+    shrink: Callable[[int], str] | None = None
+    # Caps the section so one large block cannot starve the lower-priority ones.
+    max_tokens: int | None = None
+
+
+def assemble_prompt(
+    sections: Sequence[PromptSection], budget: int, *, separator: str = "\n\n"
+) -> str:
+    remaining = budget
+    separator_tokens = count_tokens(separator)
+    rendered = [""] * len(sections)
+    for index in sorted(range(len(sections)), key=lambda position: sections[position].priority):
+        section = sections[index]
+        text = section.text
+        if not text:
+            continue
+        allowance = remaining if section.max_tokens is None else min(remaining, section.max_tokens)
+        tokens = count_tokens(text, limit=allowance)
+        if tokens > allowance and (section.shrink is not None or section.priority > 0):
+            text = section.shrink(max(allowance, 0)) if section.shrink is not None else ""
+            tokens = count_tokens(text) if text else 0
+        rendered[index] = text
+        if text:
+            remaining -= tokens + separator_tokens
+    return separator.join(text for text in rendered if text)
+
+
+def compact_payload(
+    payload: FinanceResearchPayload,
+    *,
+    max_bars: int | None = None,
+    digits: int = 2,
+    include_news: bool = True,
+    include_organic: bool = True,
+) -> str:
+    # Unindented JSON with rounded floats and bars as one list per column.
+    exclude = {"historical"}
+    if not include_news:
+        exclude.add("news")
+    if not include_organic:
+        exclude.add("organic_results")
+    data = _rounded(payload.model_dump(mode="json", exclude=exclude, exclude_none=True), digits)
+    historical = payload.historical if max_bars is None else payload.historical.tail(max_bars)
+    if len(historical) and max_bars != 0:
+        rounded = BarSeries(
+            historical.ticker,
+            historical.timestamps,
+            np.round(historical.values, digits),
+            timespan=historical.timespan,
+        )
+        data["historical"] = rounded.to_columns()
+    return json_codec.dumps(data).decode()
+
+
+def shrink_payload(payload: FinanceResearchPayload, allowance: int, *, digits: int = 2) -> str:
+    # Keeps the most recent bars that fit, then drops organic results and news. The bar count
+    # is estimated from the tokens per bar, so only a few candidates are rendered.
+    text = compact_payload(payload, max_bars=0, digits=digits)
+    base_tokens = count_tokens(text)
+    bars = len(payload.historical)
+    if bars and base_tokens < allowance:
+        sample = min(bars, _BAR_SAMPLE)
+        sample_tokens = count_tokens(compact_payload(payload, max_bars=sample, digits=digits))
+        per_bar = max((sample_tokens - base_tokens) / sample, 1.0)
+        keep = min(int((allowance - base_tokens) / per_bar), bars)
+        while keep > 0:
+            candidate = compact_payload(payload, max_bars=keep, digits=digits)
+            if count_tokens(candidate, limit=allowance) <= allowance:
+                return candidate
+            keep = min(keep - 1, keep * 9 // 10)
+    for options in ({"include_organic": False}, {"include_organic": False, "include_news": False}):
+        if count_tokens(text) <= allowance:
+            break
+        text = compact_payload(payload, max_bars=0, digits=digits, **options)
+    return text if count_tokens(text) <= allowance else ""
+
+
+def render_history(
+    turns: Sequence[str],
+    allowance: int,
+    *,
+    title: str,
+    evicted: int = 0,
+    topics: Sequence[str] = (),
+) -> str:
+    # Newest turns verbatim within three quarters of the allowance; the older ones, plus any
+    # ``evicted`` turns already reduced to ``topics``, are condensed into one line.
+    used = count_tokens(title) + 1
+    verbatim = allowance - allowance // 4
+    kept: list[str] = []
+    for turn in reversed(turns):
+        cost = count_tokens(turn) + 1
+        if used + cost > verbatim:
+            break
+        kept.append(turn)
+        used += cost
+    older = turns[: len(turns) - len(kept)]
+    if older or evicted:
+        digest = condense_turns(older, allowance - used, evicted=evicted, topics=topics)
+        if digest:
+            kept.append(digest)
+    if not kept:
+        return ""
+    return "\n".join((title, *reversed(kept)))
+
+
+def condense_turns(
+    turns: Sequence[str],
+    allowance: int,
+    *,
+    evicted: int = 0,
+    topics: Sequence[str] = (),
+) -> str:
+    # One line of clipped user questions, newest kept first when they do not all fit.
+    total = len(turns) + evicted
+    prefix = f"Earlier ({total} turns, condensed):"
+    used = count_tokens(prefix)
+    if used > allowance:
+        return ""
+    candidates = chain(
+        (topic for turn in reversed(turns) if (topic := turn_topic(turn)) is not None),
+        reversed(topics),
+    )
+    kept: list[str] = []
+    for topic in candidates:
+        cost = count_tokens(topic) + 1
+        if used + cost > allowance:
+            break
+        kept.append(topic)
+        used += cost
+    if not kept:
+        return f"Earlier ({total} turns) omitted."
+    return f"{prefix} {'; '.join(reversed(kept))}"
+
+
+def turn_topic(turn: str, *, words: int = 16) -> str | None:
+    # The first sentence of a user turn, clipped to ``words``; None for other roles.
+    if not turn.startswith("User: "):
+        return None
+    sentence = re.split(r"(?<=[.?!])\s", turn[len("User: ") :].strip(), maxsplit=1)[0]
+    parts = sentence.split()
+    if len(parts) <= words:
+        return " ".join(parts)
+    return " ".join(parts[:words]) + TRUNCATION_MARK
+
+
+def _rounded(value: Any, digits: int) -> Any:
+    if isinstance(value, float):
+        return round(value, digits) if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _rounded(item, digits) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_rounded(item, digits) for item in value]
+    return value
@@ -1,9 +1,21 @@
 from __future__ import annotations
 
-import json
+from collections.abc import Callable
+from functools import partial
 from textwrap import dedent
 from typing import Sequence
 
+from azure_ai_foundry_demo.agents.memory import NO_HISTORY, ConversationMemory
+from azure_ai_foundry_demo.agents.prompt_budget import (
+    DEFAULT_TOKEN_BUDGET,
+    PromptSection,
+    assemble_prompt,
+    compact_payload,
+    count_tokens,
+    render_history,
+    shrink_payload,
+    truncate_tokens,
+)
 from azure_ai_foundry_demo.agents.stage_models import StageResult
 from azure_ai_foundry_demo.models import FinanceResearchPayload
 
@@ -24,6 +36,7 @@ def build_price_prompt(
 
     Instructions:
     - Call the `lookup_stock_overview` function exactly once to obtain the latest data.
+    - Pass `lookback` (e.g. 1M, 6M, 5Y) or `timespan` only if the focus asks for that horizon.
     - Report price, absolute change, percent change, currency, and any returned metrics.
     - Present your findings as a short bullet list (maximum four items) without speculation.
         """
@@ -58,48 +71,22 @@ def build_analysis_prompt(
     *,
     last_payload: FinanceResearchPayload | None,
     summary: str | None,
-    conversation_history: Sequence[dict[str, str]] | None,
+    conversation_history: Sequence[dict[str, str]] | None = None,
     user_message: str | None,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    memory: ConversationMemory | None = None,
 ) -> str:
-    structured_payload = (
-        json.dumps(last_payload.model_dump(mode="json"), indent=2)
-        if last_payload is not None
-        else "No structured market data captured."
-    )
-    stage_sections: list[str] = []
-    for stage in stage_results:
-        if stage.messages:
-            stage_text = "\n".join(stage.messages)
-        else:
-            stage_text = "No notes recorded."
-        stage_sections.append(f"{stage.name.replace('-', ' ').title()} Notes:\n{stage_text}")
-    stage_block = "\n\n".join(stage_sections) if stage_sections else "No specialist notes captured."
-    history_lines: list[str] = []
-    if conversation_history:
-        for entry in conversation_history:
-            role = entry.get("role", "user").capitalize()
-            content = entry.get("content", "")
-            if content:
-                history_lines.append(f"{role}: {content}")
-    history_block = "\n".join(history_lines) if history_lines else "No prior conversation provided."
     summary_line = summary or "No previous summary available."
     focus_line = user_message or "Provide an updated, comprehensive viewpoint."
-    return dedent(
+    header = dedent(
         f"""
         You are the lead financial analyst preparing the final briefing for {ticker.upper()}.
 
-        Previous summary: {summary_line}
         User focus: {focus_line}
-
-        Conversation history:
-        {history_block}
-
-        Specialist contributions:
-        {stage_block}
-
-        Structured market data:
-        {structured_payload}
-
+        """
+    ).strip()
+    instructions = dedent(
+        """
         Deliver the final report with the following structure:
         - Price Snapshot — two sentences highlighting price level and intraday or recent moves.
         - Key Headlines — bullet list (up to five) summarising headline, source, and implication.
@@ -111,25 +98,85 @@ def build_analysis_prompt(
         ensure bullet lists use a single style (hyphen prefixes).
         """
     ).strip()
+    stage_sections: list[str] = []
+    for stage in stage_results:
+        if stage.messages:
+            stage_text = "\n".join(stage.messages)
+        else:
+            stage_text = "No notes recorded."
+        stage_sections.append(f"{stage.name.replace('-', ' ').title()} Notes:\n{stage_text}")
+    stage_block = "\n\n".join(stage_sections) if stage_sections else "No specialist notes captured."
+    history_title = "Conversation history:"
+    shrink_history: Callable[[int], str]
+    if memory is not None:
+        # Rendered once per turn by the memory, whatever the length of the conversation.
+        history_block = f"{history_title}\n{memory.render()}"
+        shrink_history = partial(memory.render_within, title=history_title)
+    else:
+        history_turns = _history_turns(conversation_history)
+        history_block = "\n".join((history_title, *(history_turns or [NO_HISTORY])))
+        shrink_history = partial(render_history, history_turns, title=history_title)
+    summary_text = f"Previous summary: {summary_line}"
+    notes_text = f"Specialist contributions:\n{stage_block}"
+    market_title = "Structured market data:"
+    if last_payload is not None:
+        market_text = f"{market_title}\n{compact_payload(last_payload)}"
+    else:
+        market_text = f"{market_title}\nNo structured market data captured."
+
+    def shrink_market_data(allowance: int) -> str:
+        body = shrink_payload(last_payload, allowance - count_tokens(market_title) - 1)
+        return f"{market_title}\n{body}" if body else ""
+
+    # Sections are rendered in this order; under a tight budget the conversation history is
+    # condensed first, then the specialist notes, the market data (at most half the budget)
+    # and the summary.
+    sections = [
+        PromptSection("header", header, priority=0),
+        PromptSection(
+            "summary",
+            summary_text,
+            priority=1,
+            shrink=lambda allowance: truncate_tokens(summary_text, allowance),
+        ),
+        PromptSection(
+            "history",
+            history_block,
+            priority=4,
+            shrink=shrink_history,
+        ),
+        PromptSection(
+            "stages",
+            notes_text,
+            priority=3,
+            shrink=lambda allowance: truncate_tokens(notes_text, allowance),
+        ),
+        PromptSection(
+            "market-data",
+            market_text,
+            priority=2,
+            shrink=shrink_market_data if last_payload is not None else None,
+            max_tokens=token_budget // 2,
+        ),
+        PromptSection("instructions", instructions, priority=0),
+    ]
+    return assemble_prompt(sections, token_budget)
 
 
 def build_router_prompt(
     ticker: str,
     *,
     summary: str | None,
-    conversation_history: Sequence[dict[str, str]] | None,
+    conversation_history: Sequence[dict[str, str]] | None = None,
     user_message: str,
     last_payload: FinanceResearchPayload | None,
+    memory: ConversationMemory | None = None,
 ) -> str:
     summary_line = summary or "No previous summary available."
-    history_lines: list[str] = []
-    if conversation_history:
-        for entry in conversation_history:
-            role = entry.get("role", "user").capitalize()
-            content = entry.get("content", "")
-            if content:
-                history_lines.append(f"{role}: {content}")
-    history_block = "\n".join(history_lines) if history_lines else "No prior conversation provided."
+    if memory is not None:
+        history_block = memory.render()
+    else:
+        history_block = "\n".join(_history_turns(conversation_history)) or NO_HISTORY
     payload_snippet = "No charted data available."
     if last_payload is not None:
         quote = last_payload.quote
@@ -154,3 +201,13 @@ def build_router_prompt(
         the required JSON object.
         """
     ).strip()
+
+
+def _history_turns(conversation_history: Sequence[dict[str, str]] | None) -> list[str]:
+    turns: list[str] = []
+    for entry in conversation_history or ():
+        role = entry.get("role", "user").capitalize()
+        content = entry.get("content", "")
+        if content:
+            turns.append(f"{role}: {content}")
+    return turns
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from collections.abc import Sequence
+from typing import Any
+
+from azure.ai.agents.models import Agent
+from azure.core.exceptions import HttpResponseError
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_APP = "azure-ai-foundry-demo"
+# Bump when the way agents are configured changes so previously registered agents are collected.
+REGISTRY_VERSION = "1"
+
+
+def agent_key(*, name: str, instructions: str, tools: Sequence[Any], model: str) -> str:
+    schema = [tool.as_dict() if hasattr(tool, "as_dict") else tool for tool in tools]
+    fingerprint = json.dumps(
+        {"name": name, "instructions": instructions, "tools": schema, "model": model},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(fingerprint.encode()).hexdigest()[:32]
+
+
+class AgentRegistry:
+    # Creates one Azure agent per (name, instructions, tool schema, model) and reuses it across
+    # runs. Agents are tagged with metadata so later processes can adopt them instead of creating
+    # new ones, and superseded or older-version agents are deleted by ``collect_garbage``.
+    def __init__(self, agents_client: Any, model: str) -> None:
+        self._agents = agents_client
+        self._model = model
+        self._lock = threading.Lock()
+        self._active: dict[str, Agent] = {}
+        self._active_names: dict[str, str] = {}
+        self._discovered: dict[str, Agent] | None = None
+        self._stale: dict[str, Agent] = {}
+        self.created = 0
+        self.reused = 0
+
+    def get_or_create(self, *, name: str, instructions: str, tools: Sequence[Any]) -> Agent:
+        key = agent_key(name=name, instructions=instructions, tools=tools, model=self._model)
+        with self._lock:
+            agent = self._active.get(key)
+            if agent is not None:
+                self.reused += 1
+                return agent
+            agent = self._discover().pop(key, None)
+            if agent is None:
+                agent = self._agents.create_agent(
+                    model=self._model,
+                    name=name,
+                    instructions=instructions,
+                    tools=list(tools),
+                    metadata={
+                        "app": REGISTRY_APP,
+                        "registry_version": REGISTRY_VERSION,
+                        "registry_key": key,
+                    },
+                )
+                self.created += 1
+                logger.info("Registered agent %s for stage %s", agent.id, name)
+            else:
+                self.reused += 1
+                logger.info("Adopted existing agent %s for stage %s", agent.id, name)
+            previous_key = self._active_names.get(name)
+            if previous_key is not None and previous_key != key:
+                superseded = self._active.pop(previous_key)
+                self._stale[superseded.id] = superseded
+            self._active[key] = agent
+            self._active_names[name] = key
+            return agent
+
+    def collect_garbage(self) -> int:
+        with self._lock:
+            discovered = self._discover()
+            active_names = set(self._active_names)
+            for key, agent in list(discovered.items()):
+                if agent.name in active_names:
+                    self._stale[agent.id] = discovered.pop(key)
+            stale = list(self._stale.values())
+            self._stale.clear()
+        deleted = 0
+        for agent in stale:
+            try:
+                self._agents.delete_agent(agent.id)
+                deleted += 1
+            except HttpResponseError:
+                logger.debug("Failed to delete stale agent %s", agent.id, exc_info=True)
+        if deleted:
+            logger.info("Deleted %d stale agents", deleted)
+        return deleted
+
+    def shutdown(self, *, delete_active: bool = False) -> None:
+        if delete_active:
+            with self._lock:
+                self._stale.update({agent.id: agent for agent in self._active.values()})
+                self._active.clear()
+                self._active_names.clear()
+        self.collect_garbage()
+
+    def _discover(self) -> dict[str, Agent]:
+        if self._discovered is not None:
+            return self._discovered
+        discovered: dict[str, Agent] = {}
+        try:
+            for agent in self._agents.list_agents():
+                metadata = agent.metadata or {}
+                if metadata.get("app") != REGISTRY_APP:
+                    continue
+                key = metadata.get("registry_key")
+                if metadata.get("registry_version") != REGISTRY_VERSION or not key:
+                    self._stale[agent.id] = agent
+                elif key in discovered:
+                    self._stale[agent.id] = agent
+                else:
+                    discovered[key] = agent
+        except HttpResponseError:
+            logger.warning("Could not list existing agents; new agents will be created")
+        self._discovered = discovered
+        return discovered
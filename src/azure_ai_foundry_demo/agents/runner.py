@@ -1,15 +1,27 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import time
+from collections.abc import Iterator
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Optional
+from typing import TYPE_CHECKING, Any, Literal
 
-from azure.ai.agents.models import Agent, RunStatus, SubmitToolOutputsAction, ToolOutput
+from azure.ai.agents.models import (
+    Agent,
+    AgentStreamEvent,
+    MessageDeltaChunk,
+    RunStatus,
+    SubmitToolOutputsAction,
+    ThreadRun,
+    ToolOutput,
+)
 from azure.ai.projects import AIProjectClient
+from azure.ai.projects.aio import AIProjectClient as AsyncAIProjectClient
 from azure.core.exceptions import HttpResponseError
 
+from azure_ai_foundry_demo.agents.polling import DEFAULT_POLLING, PollingStrategy, PollStats
 from azure_ai_foundry_demo.agents.utils import message_to_text
 
 if TYPE_CHECKING:
@@ -23,23 +35,40 @@ class AgentRunResult:
     run_id: str
     thread_id: str
     messages: list[str]
+    poll_count: int = 0
+    poll_wait_seconds: float = 0.0
+
+
+@dataclass
+class RunStreamEvent:
+    kind: Literal["text_delta", "tool_call", "completed"]
+    text: str = ""
+    tool_name: str | None = None
+    arguments: dict[str, Any] | None = None
+    result: AgentRunResult | None = None
 
 
 class AzureAgentRunner:
     def __init__(
-        self, project_client: AIProjectClient, poll_interval: float = 1.0, timeout: float = 120.0
+        self,
+        project_client: AIProjectClient,
+        poll_interval: float | None = None,
+        timeout: float = 120.0,
+        *,
+        polling: PollingStrategy | None = None,
     ) -> None:
         self._threads = project_client.agents.threads
         self._runs = project_client.agents.runs
         self._messages = project_client.agents.messages
-        self._poll_interval = poll_interval
+        self._polling = _resolve_polling(poll_interval, polling)
         self._timeout = timeout
 
     def run_with_functions(
         self,
         agent: Agent,
         user_prompt: str,
-        tooling: Optional["ResearchTooling"] = None,
+        tooling: ResearchTooling | None = None,
+        polling: PollingStrategy | None = None,
     ) -> AgentRunResult:
         logger.info("Starting function-enabled run for agent %s", getattr(agent, "id", "<unknown>"))
         thread = self._threads.create()
@@ -52,24 +81,39 @@ class AzureAgentRunner:
         )
         run = self._runs.create(thread_id=thread.id, agent_id=agent.id)
         logger.info("Created run %s for agent %s", run.id, getattr(agent, "id", "<unknown>"))
-        completed = self._poll_until_complete(run, tooling)
+        stats = PollStats()
+        completed = self._poll_until_complete(run, tooling, polling or self._polling, stats)
         messages = self._collect_messages(thread.id, completed.id)
         logger.info(
-            "Completed run %s for agent %s with %d assistant messages",
+            "Completed run %s for agent %s with %d assistant messages after %d polls",
             completed.id,
             getattr(agent, "id", "<unknown>"),
             len(messages),
+            stats.polls,
         )
         try:
             self._threads.delete(thread_id=thread.id)
             logger.debug("Deleted thread %s", thread.id)
         except HttpResponseError:
             logger.debug("Failed to delete thread %s", thread.id, exc_info=True)
-        return AgentRunResult(run_id=completed.id, thread_id=thread.id, messages=messages)
+        return AgentRunResult(
+            run_id=completed.id,
+            thread_id=thread.id,
+            messages=messages,
+            poll_count=stats.polls,
+            poll_wait_seconds=stats.waited_seconds,
+        )
 
-    def _poll_until_complete(self, run, tooling: Optional["ResearchTooling"]):
+    def _poll_until_complete(
+        self,
+        run,
+        tooling: ResearchTooling | None,
+        polling: PollingStrategy,
+        stats: PollStats,
+    ):
         deadline = time.monotonic() + self._timeout
         current = run
+        attempt = 0
         while True:
             if time.monotonic() > deadline:
                 logger.error("Run %s timed out after %.1fs", run.id, self._timeout)
@@ -83,31 +127,102 @@ class AzureAgentRunner:
                     logger.error("Run %s requested tools but none were provided", current.id)
                     raise RuntimeError("Agent requested tool execution but no tooling is available")
                 current = self._handle_function_calls(current, tooling)
+                attempt = 0
                 continue
             if current.status in {RunStatus.FAILED, RunStatus.CANCELLED, RunStatus.EXPIRED}:
                 logger.error("Run %s failed with status %s", current.id, current.status)
                 raise RuntimeError(f"Agent run failed with status: {current.status}")
-            time.sleep(self._poll_interval)
+            delay = _next_delay(polling, attempt, deadline)
+            time.sleep(delay)
+            stats.record(delay)
+            attempt += 1
             current = self._runs.get(thread_id=current.thread_id, run_id=current.id)
 
-    def _handle_function_calls(self, run, tooling: ResearchTooling):
-        required = run.required_action
-        if not isinstance(required, SubmitToolOutputsAction):
-            logger.error(
-                "Unsupported required action type %s for run %s",
-                getattr(required, "type", "<unknown>"),
-                run.id,
+    def stream_with_functions(
+        self,
+        agent: Agent,
+        user_prompt: str,
+        tooling: ResearchTooling | None = None,
+    ) -> Iterator[RunStreamEvent]:
+        logger.info("Starting streaming run for agent %s", getattr(agent, "id", "<unknown>"))
+        thread = self._threads.create()
+        self._messages.create(thread_id=thread.id, role="user", content=user_prompt)
+        deadline = time.monotonic() + self._timeout
+        run_id: str | None = None
+        try:
+            with self._runs.stream(thread_id=thread.id, agent_id=agent.id) as stream:
+                for event_type, data, _ in stream:
+                    if time.monotonic() > deadline:
+                        logger.error("Streaming run on thread %s timed out", thread.id)
+                        raise TimeoutError("Agent run did not complete before timeout")
+                    if isinstance(data, MessageDeltaChunk):
+                        if data.text:
+                            yield RunStreamEvent(kind="text_delta", text=data.text)
+                    elif isinstance(data, ThreadRun):
+                        run_id = data.id
+                        if data.status == RunStatus.REQUIRES_ACTION:
+                            if tooling is None:
+                                logger.error(
+                                    "Run %s requested tools but none were provided", data.id
+                                )
+                                raise RuntimeError(
+                                    "Agent requested tool execution but no tooling is available"
+                                )
+                            calls = _pending_function_calls(data)
+                            for call, arguments in calls:
+                                yield RunStreamEvent(
+                                    kind="tool_call",
+                                    tool_name=call.function.name,
+                                    arguments=arguments,
+                                )
+                            self._runs.submit_tool_outputs_stream(
+                                thread_id=data.thread_id,
+                                run_id=data.id,
+                                tool_outputs=self._execute_function_calls(data, calls, tooling),
+                                event_handler=stream,
+                            )
+                        elif data.status in {
+                            RunStatus.FAILED,
+                            RunStatus.CANCELLED,
+                            RunStatus.EXPIRED,
+                        }:
+                            logger.error("Run %s failed with status %s", data.id, data.status)
+                            raise RuntimeError(f"Agent run failed with status: {data.status}")
+                    elif event_type == AgentStreamEvent.ERROR:
+                        logger.error(
+                            "Streaming run on thread %s reported an error: %s", thread.id, data
+                        )
+                        raise RuntimeError(f"Agent run stream failed: {data}")
+            if run_id is None:
+                raise RuntimeError("Agent run stream ended without reporting a run")
+            messages = self._collect_messages(thread.id, run_id)
+            logger.info(
+                "Completed streaming run %s with %d assistant messages", run_id, len(messages)
             )
-            raise RuntimeError("Unsupported required action type")
-        outputs: list[ToolOutput] = []
-        for call in required.submit_tool_outputs.tool_calls:
-            if call.type != "function":
-                continue
+            yield RunStreamEvent(
+                kind="completed",
+                result=AgentRunResult(run_id=run_id, thread_id=thread.id, messages=messages),
+            )
+        finally:
             try:
-                arguments = self._parse_function_arguments(call.function.arguments)
-            except json.JSONDecodeError as exc:
-                logger.error("Invalid JSON arguments for function %s", call.function.name)
-                raise ValueError("Agent tool arguments were not valid JSON") from exc
+                self._threads.delete(thread_id=thread.id)
+            except HttpResponseError:
+                logger.debug("Failed to delete thread %s", thread.id, exc_info=True)
+
+    def _handle_function_calls(self, run, tooling: ResearchTooling):
+        outputs = self._execute_function_calls(run, _pending_function_calls(run), tooling)
+        return self._runs.submit_tool_outputs(
+            thread_id=run.thread_id,
+            run_id=run.id,
+            tool_outputs=outputs,
+        )
+
+    @staticmethod
+    def _execute_function_calls(
+        run, calls: list[tuple[Any, dict[str, Any]]], tooling: ResearchTooling
+    ) -> list[ToolOutput]:
+        outputs: list[ToolOutput] = []
+        for call, arguments in calls:
             logger.info(
                 "Processing function call %s (tool_call_id=%s)", call.function.name, call.id
             )
@@ -120,21 +235,11 @@ class AzureAgentRunner:
         if not outputs:
             logger.error("Run %s requested tool outputs but none were generated", run.id)
             raise RuntimeError("Agent requested tool outputs but none were generated")
-        return self._runs.submit_tool_outputs(
-            thread_id=run.thread_id,
-            run_id=run.id,
-            tool_outputs=outputs,
-        )
+        return outputs
 
     @staticmethod
     def _parse_function_arguments(raw_arguments: str | None) -> dict[str, Any]:
-        raw = (raw_arguments or "").strip()
-        if not raw:
-            return {}
-        parsed = json.loads(raw)
-        if not isinstance(parsed, dict):
-            raise json.JSONDecodeError("Tool arguments must decode to a JSON object", raw, 0)
-        return parsed
+        return _parse_function_arguments(raw_arguments)
 
     def _collect_messages(self, thread_id: str, run_id: str) -> list[str]:
         messages: list[str] = []
@@ -150,3 +255,177 @@ class AzureAgentRunner:
         except HttpResponseError:
             logger.debug("Failed to list messages for thread %s", thread_id, exc_info=True)
         return messages
+
+
+class AsyncAzureAgentRunner:
+    def __init__(
+        self,
+        project_client: AsyncAIProjectClient,
+        poll_interval: float | None = None,
+        timeout: float = 120.0,
+        *,
+        polling: PollingStrategy | None = None,
+    ) -> None:
+        self._threads = project_client.agents.threads
+        self._runs = project_client.agents.runs
+        self._messages = project_client.agents.messages
+        self._polling = _resolve_polling(poll_interval, polling)
+        self._timeout = timeout
+
+    async def run_with_functions(
+        self,
+        agent: Agent,
+        user_prompt: str,
+        tooling: ResearchTooling | None = None,
+        polling: PollingStrategy | None = None,
+    ) -> AgentRunResult:
+        logger.info(
+            "Starting async function-enabled run for agent %s", getattr(agent, "id", "<unknown>")
+        )
+        thread = await self._threads.create()
+        await self._messages.create(thread_id=thread.id, role="user", content=user_prompt)
+        run = await self._runs.create(thread_id=thread.id, agent_id=agent.id)
+        logger.info("Created run %s for agent %s", run.id, getattr(agent, "id", "<unknown>"))
+        stats = PollStats()
+        completed = await self._poll_until_complete(run, tooling, polling or self._polling, stats)
+        messages = await self._collect_messages(thread.id, completed.id)
+        logger.info(
+            "Completed run %s for agent %s with %d assistant messages after %d polls",
+            completed.id,
+            getattr(agent, "id", "<unknown>"),
+            len(messages),
+            stats.polls,
+        )
+        try:
+            await self._threads.delete(thread_id=thread.id)
+        except HttpResponseError:
+            logger.debug("Failed to delete thread %s", thread.id, exc_info=True)
+        return AgentRunResult(
+            run_id=completed.id,
+            thread_id=thread.id,
+            messages=messages,
+            poll_count=stats.polls,
+            poll_wait_seconds=stats.waited_seconds,
+        )
+
+    async def _poll_until_complete(
+        self,
+        run,
+        tooling: ResearchTooling | None,
+        polling: PollingStrategy,
+        stats: PollStats,
+    ):
+        deadline = time.monotonic() + self._timeout
+        current = run
+        attempt = 0
+        while True:
+            if time.monotonic() > deadline:
+                logger.error("Run %s timed out after %.1fs", run.id, self._timeout)
+                raise TimeoutError("Agent run did not complete before timeout")
+            if current.status == RunStatus.COMPLETED:
+                return current
+            if current.status == RunStatus.REQUIRES_ACTION:
+                if tooling is None:
+                    logger.error("Run %s requested tools but none were provided", current.id)
+                    raise RuntimeError("Agent requested tool execution but no tooling is available")
+                current = await self._handle_function_calls(current, tooling)
+                attempt = 0
+                continue
+            if current.status in {RunStatus.FAILED, RunStatus.CANCELLED, RunStatus.EXPIRED}:
+                logger.error("Run %s failed with status %s", current.id, current.status)
+                raise RuntimeError(f"Agent run failed with status: {current.status}")
+            delay = _next_delay(polling, attempt, deadline)
+            await asyncio.sleep(delay)
+            stats.record(delay)
+            attempt += 1
+            current = await self._runs.get(thread_id=current.thread_id, run_id=current.id)
+
+    async def _handle_function_calls(self, run, tooling: ResearchTooling):
+        calls = _pending_function_calls(run)
+        if not calls:
+            logger.error("Run %s requested tool outputs but none were generated", run.id)
+            raise RuntimeError("Agent requested tool outputs but none were generated")
+        for call, _ in calls:
+            logger.info(
+                "Processing function call %s (tool_call_id=%s)", call.function.name, call.id
+            )
+        try:
+            results = await asyncio.gather(
+                *(
+                    tooling.aexecute_function(call.function.name, arguments)
+                    for call, arguments in calls
+                )
+            )
+        except Exception:
+            logger.exception("Tool execution failed for run %s", run.id)
+            raise
+        outputs = [
+            ToolOutput(tool_call_id=call.id, output=result)
+            for (call, _), result in zip(calls, results, strict=True)
+        ]
+        return await self._runs.submit_tool_outputs(
+            thread_id=run.thread_id,
+            run_id=run.id,
+            tool_outputs=outputs,
+        )
+
+    async def _collect_messages(self, thread_id: str, run_id: str) -> list[str]:
+        messages: list[str] = []
+        try:
+            async for message in self._messages.list(thread_id=thread_id):
+                if getattr(message, "role", None) != "assistant":
+                    continue
+                if hasattr(message, "run_id") and message.run_id != run_id:
+                    continue
+                rendered = message_to_text(message)
+                if rendered:
+                    messages.append(rendered)
+        except HttpResponseError:
+            logger.debug("Failed to list messages for thread %s", thread_id, exc_info=True)
+        return messages
+
+
+def _resolve_polling(
+    poll_interval: float | None, polling: PollingStrategy | None
+) -> PollingStrategy:
+    if polling is not None:
+        return polling
+    if poll_interval is not None:
+        return PollingStrategy.fixed(poll_interval)
+    return DEFAULT_POLLING
+
+
+def _next_delay(polling: PollingStrategy, attempt: int, deadline: float) -> float:
+    return min(polling.interval(attempt), max(0.0, deadline - time.monotonic()))
+
+
+def _pending_function_calls(run) -> list[tuple[Any, dict[str, Any]]]:
+    required = run.required_action
+    if not isinstance(required, SubmitToolOutputsAction):
+        logger.error(
+            "Unsupported required action type %s for run %s",
+            getattr(required, "type", "<unknown>"),
+            run.id,
+        )
+        raise RuntimeError("Unsupported required action type")
+    calls: list[tuple[Any, dict[str, Any]]] = []
+    for call in required.submit_tool_outputs.tool_calls:
+        if call.type != "function":
+            continue
+        try:
+            arguments = _parse_function_arguments(call.function.arguments)
+        except json.JSONDecodeError as exc:
+            logger.error("Invalid JSON arguments for function %s", call.function.name)
+            raise ValueError("Agent tool arguments were not valid JSON") from exc
+        calls.append((call, arguments))
+    return calls
+
+
+def _parse_function_arguments(raw_arguments: str | None) -> dict[str, Any]:
+    raw = (raw_arguments or "").strip()
+    if not raw:
+        return {}
+    parsed = json.loads(raw)
+    if not isinstance(parsed, dict):
+        raise json.JSONDecodeError("Tool arguments must decode to a JSON object", raw, 0)
+    return parsed
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from azure_ai_foundry_demo.agents.stage_models import StageResult
+from azure_ai_foundry_demo.agents.stage_specs import StageSpec
+
+# Receives the stage key and the results of every stage finished so far.
+StageExecutor = Callable[[str, Mapping[str, StageResult]], StageResult]
+
+
+class StageGraph:
+    # Runs stages as soon as their dependencies have finished, so independent specialists overlap.
+    # Dependencies on stages that are not part of the plan are ignored, which lets follow-ups run
+    # any subset of the registry.
+    def __init__(self, stages: Mapping[str, StageSpec]) -> None:
+        self._stages = dict(stages)
+        self._dependencies = {
+            key: tuple(dep for dep in spec.depends_on if dep in self._stages)
+            for key, spec in self._stages.items()
+        }
+        self._order = self._topological_order()
+
+    @property
+    def order(self) -> list[str]:
+        return list(self._order)
+
+    def run(
+        self, execute: StageExecutor, *, max_workers: int | None = None
+    ) -> dict[str, StageResult]:
+        results: dict[str, StageResult] = {}
+        pending = list(self._order)
+        in_flight: dict[Future[StageResult], str] = {}
+        workers = max_workers or max(len(self._stages), 1)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stage") as pool:
+            try:
+                while pending or in_flight:
+                    ready = [key for key in pending if self._is_ready(key, results)]
+                    for key in ready:
+                        pending.remove(key)
+                    if len(ready) == 1 and not in_flight:
+                        # Nothing to overlap with; run inline so callbacks stay on the caller's
+                        # thread (the analyst stage streams into UI placeholders).
+                        key = ready[0]
+                        results[key] = execute(key, dict(results))
+                        continue
+                    for key in ready:
+                        in_flight[pool.submit(execute, key, dict(results))] = key
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results[in_flight.pop(future)] = future.result()
+            except BaseException:
+                for future in in_flight:
+                    future.cancel()
+                raise
+        return {key: results[key] for key in self._order}
+
+    def _is_ready(self, key: str, results: Mapping[str, StageResult]) -> bool:
+        return all(dep in results for dep in self._dependencies[key])
+
+    def _topological_order(self) -> list[str]:
+        order: list[str] = []
+        remaining = dict(self._dependencies)
+        while remaining:
+            ready = [key for key, deps in remaining.items() if all(dep in order for dep in deps)]
+            if not ready:
+                raise ValueError(f"Stage dependencies contain a cycle: {sorted(remaining)}")
+            for key in ready:
+                order.append(key)
+                del remaining[key]
+        return order
@@ -7,3 +7,4 @@ from dataclasses import dataclass
 class StageResult:
     name: str
     messages: list[str]
+    poll_count: int = 0
@@ -3,12 +3,17 @@ from __future__ import annotations
 from dataclasses import dataclass
 from textwrap import dedent
 
+from azure_ai_foundry_demo.agents.polling import PollingStrategy
+
 
 @dataclass(frozen=True)
 class StageSpec:
     name: str
     instructions: str
     uses_tools: bool
+    polling: PollingStrategy | None = None
+    # ``STAGE_REGISTRY`` keys that must finish before this stage starts.
+    depends_on: tuple[str, ...] = ()
 
 
 PRICE_STAGE = StageSpec(
@@ -20,6 +25,7 @@ PRICE_STAGE = StageSpec(
         """
     ).strip(),
     uses_tools=True,
+    polling=PollingStrategy(initial_interval=0.2, fast_polls=4, max_interval=1.5),
 )
 
 NEWS_STAGE = StageSpec(
@@ -31,6 +37,7 @@ NEWS_STAGE = StageSpec(
         """
     ).strip(),
     uses_tools=True,
+    polling=PollingStrategy(initial_interval=0.2, fast_polls=4, max_interval=1.5),
 )
 
 ANALYST_STAGE = StageSpec(
@@ -42,8 +49,12 @@ ANALYST_STAGE = StageSpec(
         """
     ).strip(),
     uses_tools=False,
+    polling=PollingStrategy(initial_interval=0.5, fast_polls=2, max_interval=3.0),
+    depends_on=("price", "news"),
 )
 
+ROUTER_POLLING = PollingStrategy(initial_interval=0.15, fast_polls=5, max_interval=1.0)
+
 ROUTER_INSTRUCTIONS = dedent(
     """
     You are the orchestration coordinator for a financial research team. Based on the latest request
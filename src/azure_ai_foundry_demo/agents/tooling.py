@@ -1,59 +1,100 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+from datetime import timedelta
 from typing import Any
+
 from azure.ai.agents.models import FunctionDefinition, FunctionToolDefinition
 
 from azure_ai_foundry_demo.agents.utils import sync_await
-from azure_ai_foundry_demo.clients.polygon import PolygonClient, PolygonDailyBar
+from azure_ai_foundry_demo.bars import TIMESPANS, BarSeries, Lookback
+from azure_ai_foundry_demo.clients.polygon import PolygonClient
 from azure_ai_foundry_demo.clients.serper import SerperClient
+from azure_ai_foundry_demo.metrics import compute_metrics
 from azure_ai_foundry_demo.models import (
     FinanceResearchPayload,
-    HistoricalBar,
-    NewsHeadline,
     StockQuote,
     TrendMetrics,
+    validate_headlines,
 )
+from azure_ai_foundry_demo.warehouse import BarWarehouse
 
 logger = logging.getLogger(__name__)
 
+# Without a lookback the overview covers the last week of daily bars.
+DEFAULT_RECENT_DAYS = 7
+# Metrics use the whole lookback; the tool output shows the model only the most recent bars.
+TOOL_HISTORY_BARS = 60
+
 
 class ResearchTooling:
-    def __init__(self, polygon_client: PolygonClient, serper_client: SerperClient) -> None:
+    def __init__(
+        self,
+        polygon_client: PolygonClient,
+        serper_client: SerperClient,
+        *,
+        warehouse: BarWarehouse | None = None,
+    ) -> None:
         self._polygon_client = polygon_client
         self._serper_client = serper_client
+        # When set, bars are read from the local warehouse and only the missing days are fetched.
+        self._warehouse = warehouse
         self.last_payload: FinanceResearchPayload | None = None
         self.last_news_results: list[dict[str, Any]] = []
 
+    def fork(self) -> ResearchTooling:
+        # Fresh per-run state sharing the (pooled, cached) upstream clients.
+        return ResearchTooling(self._polygon_client, self._serper_client, warehouse=self._warehouse)
+
     def reset(self) -> None:
         self.last_payload = None
         self.last_news_results = []
 
-    def lookup_stock_overview(self, ticker: str) -> str:
+    def lookup_stock_overview(
+        self, ticker: str, lookback: str | None = None, timespan: str = "day"
+    ) -> str:
+        return sync_await(self.alookup_stock_overview(ticker, lookback, timespan))
+
+    async def alookup_stock_overview(
+        self, ticker: str, lookback: str | None = None, timespan: str = "day"
+    ) -> str:
         try:
-            payload = self._fetch_overview(ticker)
+            payload = await self._fetch_overview_async(ticker, lookback, timespan)
         except Exception as exc:
             logger.exception("Failed to fetch stock overview for %s", ticker)
             return json.dumps({"error": f"Failed to get stock overview: {exc}"})
+        if self.last_news_results:
+            # A concurrent news lookup may have finished first; keep its results.
+            _attach_news(payload, self.last_news_results)
         self.last_payload = payload
         self.last_news_results = payload.organic_results
+        if len(payload.historical) > TOOL_HISTORY_BARS:
+            shown = payload.model_copy(
+                update={"historical": payload.historical.tail(TOOL_HISTORY_BARS)}
+            )
+            return json.dumps(shown.model_dump(mode="json"))
         return json.dumps(payload.model_dump(mode="json"))
 
     def search_related_news(self, query: str) -> str:
+        return sync_await(self.asearch_related_news(query))
+
+    async def asearch_related_news(self, query: str) -> str:
         try:
-            headlines = sync_await(self._serper_client.fetch_news(query))
+            headlines = await self._serper_client.fetch_news(query)
             if headlines:
-                results = [headline.model_dump(mode="json") for headline in headlines]
+                # The tool output boundary: headlines are validated here, not in the client.
+                validated = validate_headlines(headline.as_dict() for headline in headlines)
+                results = [headline.model_dump(mode="json") for headline in validated]
             else:
-                results = sync_await(self._serper_client.search_web(query))
+                results = await self._serper_client.search_web(query)
         except Exception as exc:
             logger.exception("Failed to search news for query %s", query)
             return json.dumps({"error": f"Failed to search news: {exc}"})
         self.last_news_results = results
         if self.last_payload is not None:
-            self.last_payload.news = [NewsHeadline.model_validate(item) for item in results]
-            self.last_payload.organic_results = results
+            _attach_news(self.last_payload, results)
         return json.dumps(results)
 
     def get_function_definitions(self) -> list[FunctionToolDefinition]:
@@ -67,7 +108,19 @@ class ResearchTooling:
                         "ticker": {
                             "type": "string",
                             "description": "The stock ticker symbol to look up",
-                        }
+                        },
+                        "lookback": {
+                            "type": "string",
+                            "description": (
+                                "History window such as 7D, 1M, 6M, 1Y or 5Y; omit for the"
+                                " last 7 trading days"
+                            ),
+                        },
+                        "timespan": {
+                            "type": "string",
+                            "enum": list(TIMESPANS),
+                            "description": "Bar size; minute or hour for intraday history",
+                        },
                     },
                     "required": ["ticker"],
                 },
@@ -94,6 +147,9 @@ class ResearchTooling:
         return [overview, news]
 
     def execute_function(self, name: str, arguments: dict[str, Any]) -> str:
+        return sync_await(self.aexecute_function(name, arguments))
+
+    async def aexecute_function(self, name: str, arguments: dict[str, Any]) -> str:
         if name == "lookup_stock_overview":
             ticker = (
                 arguments.get("ticker")
@@ -103,65 +159,76 @@ class ResearchTooling:
             )
             if not ticker:
                 raise ValueError("lookup_stock_overview requires a 'ticker' argument")
-            return self.lookup_stock_overview(str(ticker))
+            lookback = arguments.get("lookback") or arguments.get("period")
+            return await self.alookup_stock_overview(
+                str(ticker),
+                str(lookback) if lookback else None,
+                str(arguments.get("timespan") or "day"),
+            )
         if name == "search_related_news":
             query = arguments.get("query") or arguments.get("topic") or arguments.get("search")
             if not query:
                 raise ValueError("search_related_news requires a 'query' argument")
-            return self.search_related_news(str(query))
+            return await self.asearch_related_news(str(query))
         return json.dumps({"error": f"Unknown function: {name}"})
 
-    def _fetch_overview(self, ticker: str) -> FinanceResearchPayload:
-        payload: FinanceResearchPayload | None = None
-        try:
-            polygon_quote = sync_await(self._polygon_client.fetch_previous_close(ticker))
-            payload = FinanceResearchPayload(quote=polygon_quote.to_stock_quote())
-            bars = sync_await(self._polygon_client.fetch_recent_bars(ticker, days=7))
-            if bars:
-                payload.historical = [
-                    HistoricalBar(
-                        date=bar.as_of.date().isoformat(),
-                        open=bar.open,
-                        high=bar.high,
-                        low=bar.low,
-                        close=bar.close,
-                        volume=bar.volume,
-                    )
-                    for bar in bars
-                ]
-                metrics = _calculate_trend_metrics(bars)
-                if metrics is not None:
-                    payload.metrics = metrics
-        except Exception:
-            logger.warning("Polygon data unavailable for %s", ticker, exc_info=True)
-        if payload is None:
-            payload = FinanceResearchPayload(quote=StockQuote(ticker=ticker.upper()))
+    async def _fetch_overview_async(
+        self, ticker: str, lookback: str | None = None, timespan: str = "day"
+    ) -> FinanceResearchPayload:
+        if timespan not in TIMESPANS:
+            raise ValueError(f"timespan must be one of {', '.join(TIMESPANS)}")
+        window = None if lookback is None else Lookback.parse(lookback)
+        if self._warehouse is not None:
+            bars = self._warehouse_bars(self._warehouse, ticker, window, timespan)
+        elif window is None and timespan == "day":
+            bars = self._polygon_client.fetch_recent_bars(ticker, days=DEFAULT_RECENT_DAYS)
+        else:
+            window = window or Lookback(DEFAULT_RECENT_DAYS)
+            bars = self._polygon_client.fetch_history(ticker, window, timespan=timespan)
+        quote_result, bars_result = await asyncio.gather(
+            self._polygon_client.fetch_previous_close(ticker),
+            bars,
+            return_exceptions=True,
+        )
+        if isinstance(quote_result, BaseException):
+            logger.warning("Polygon quote unavailable for %s", ticker, exc_info=quote_result)
+            quote = StockQuote(ticker=ticker.upper())
+        else:
+            quote = quote_result.to_stock_quote()
+        payload = FinanceResearchPayload(quote=quote)
+        if isinstance(bars_result, BaseException):
+            logger.warning("Polygon bars unavailable for %s", ticker, exc_info=bars_result)
+        elif len(bars_result):
+            payload.historical = bars_result
+            payload.metrics = _calculate_trend_metrics(bars_result)
         return payload
 
+    async def _warehouse_bars(
+        self, warehouse: BarWarehouse, ticker: str, window: Lookback | None, timespan: str
+    ) -> BarSeries:
+        end = warehouse.today()
+        if window is None and timespan == "day":
+            # Calendar padding so weekends and holidays still leave a week of sessions.
+            start = end - timedelta(days=DEFAULT_RECENT_DAYS * 2)
+            series = await warehouse.load(self._polygon_client, ticker, start, end)
+            return series.tail(DEFAULT_RECENT_DAYS)
+        start = (window or Lookback(DEFAULT_RECENT_DAYS)).start(end)
+        return await warehouse.load(self._polygon_client, ticker, start, end, timespan=timespan)
+
+
+def _attach_news(payload: FinanceResearchPayload, results: list[dict[str, Any]]) -> None:
+    payload.news = validate_headlines(results)
+    payload.organic_results = results
+
 
-def _calculate_trend_metrics(bars: list[PolygonDailyBar]) -> TrendMetrics | None:
-    if not bars:
+def _calculate_trend_metrics(bars: BarSeries) -> TrendMetrics | None:
+    if not len(bars):
         return None
-    closes = [bar.close for bar in bars if bar.close is not None]
-    volumes = [bar.volume for bar in bars if bar.volume is not None]
-    highs = [bar.high for bar in bars if bar.high is not None]
-    lows = [bar.low for bar in bars if bar.low is not None]
-    absolute_change = None
-    percent_change = None
-    if len(closes) >= 2:
-        start_price = closes[0]
-        end_price = closes[-1]
-        if start_price not in (None, 0) and end_price is not None:
-            absolute_change = end_price - start_price
-            percent_change = (absolute_change / start_price) * 100
-    average_volume = sum(volumes) / len(volumes) if volumes else None
-    period_high = max(highs) if highs else (max(closes) if closes else None)
-    period_low = min(lows) if lows else (min(closes) if closes else None)
-    return TrendMetrics(
-        period_days=len(bars),
-        absolute_change=absolute_change,
-        percent_change=percent_change,
-        average_volume=average_volume,
-        high=period_high,
-        low=period_low,
+    # The column views go straight into the engine; no per-bar conversion.
+    result = compute_metrics(
+        bars.open, bars.high, bars.low, bars.close, bars.volume, timespan=bars.timespan
     )
+    metrics = result.summary()
+    if metrics is not None:
+        metrics.period_days = len(bars)
+    return metrics
@@ -1,22 +1,20 @@
 from __future__ import annotations
 
-import asyncio
-import concurrent.futures
 import re
+import string
+from collections.abc import Coroutine
+from typing import Any, TypeVar
 
 from azure.ai.agents.models import MessageTextContent
 
+from azure_ai_foundry_demo.agents.loop_bridge import get_loop_bridge
+
+T = TypeVar("T")
+
+
+def sync_await(coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+    return get_loop_bridge().run(coro, timeout=timeout)
 
-def sync_await(coro):
-    try:
-        loop = asyncio.get_event_loop()
-    except RuntimeError:
-        return asyncio.run(coro)
-    if loop.is_running():
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future = executor.submit(asyncio.run, coro)
-            return future.result()
-    return loop.run_until_complete(coro)
 
 def message_to_text(message) -> str:
     parts: list[str] = []
@@ -39,16 +37,13 @@ def message_to_text(message) -> str:
     return _normalize_text(raw_text)
 
 
-_BOLD_ITALIC_RE = re.compile(r"(\*\*|__|\*|_)(.+?)\1")
-_NUMBERED_LIST_RE = re.compile(r"^(\s*)(\d+)[\.)]\s+", re.MULTILINE)
 _ESCAPED_NUMBER_RE = re.compile(r"\\(\d)")
-_COMMA_NO_SPACE_RE = re.compile(r",(?=\S)")
+# Windows line breaks, escaped digits and bold/italic spans, scanned in one pass. Every branch
+# starts with a literal so the engine can skip straight to candidate characters.
+_INLINE_RE = re.compile(r"\r\n|\\(?=\d)|\*\*(.+?)\*\*|__(.+?)__|\*(.+?)\*|_(.+?)_")
+_LIST_MARKER_RE = re.compile(r"\d+[\.)]")
 
 _CURRENCY_CODES = ("USD", "EUR", "GBP", "JPY", "CAD", "AUD", "CHF")
-_CURRENCY_PATTERN = "|".join(_CURRENCY_CODES)
-_CURRENCY_AFTER_NUMBER_RE = re.compile(rf"(\d)({_CURRENCY_PATTERN})")
-_CURRENCY_BEFORE_LETTER_RE = re.compile(rf"({_CURRENCY_PATTERN})(?=[A-Za-z])")
-
 _MONTH_NAMES = (
     "January",
     "February",
@@ -63,51 +58,312 @@ _MONTH_NAMES = (
     "November",
     "December",
 )
-_MONTH_DAY_RE = re.compile(rf"({'|'.join(_MONTH_NAMES)})(\d)")
+# Currency codes and month names followed by a day; the callback decides which side of a
+# currency code needs a space.
+_BOUNDARY_RE = re.compile(
+    "|".join((*_CURRENCY_CODES, *(f"{month}(?=\\d)" for month in _MONTH_NAMES)))
+)
+_COMMA_NO_SPACE_RE = re.compile(r",(?=\S)")
+_ASCII_LETTERS = frozenset(string.ascii_letters)
 
 
 def _normalize_text(raw: str) -> str:
-    text = raw.replace("\r\n", "\n")
-    text = _ESCAPED_NUMBER_RE.sub(r"\1", text)
-    text = _strip_markdown(text)
-    text = _normalize_lists(text)
-    text = _normalize_boundaries(text)
-    return _normalize_whitespace(text).strip()
+    # Same output as applying, in order: CRLF -> LF, unescaping ``\\1``, stripping emphasis,
+    # turning numbered list markers into ``- ``, spacing currency/month/comma boundaries and
+    # collapsing wrapped lines, but in one tokenizing scan, one line loop and two boundary
+    # scans. Boundary spaces never land on a line edge, so they are added after assembly.
+    text = _assemble_lines(_INLINE_RE.sub(_inline_token, raw).split("\n"))
+    text = _COMMA_NO_SPACE_RE.sub(", ", text)
+    return _BOUNDARY_RE.sub(_boundary_token, text)
 
 
-def _strip_markdown(text: str) -> str:
-    def replacer(match: re.Match[str]) -> str:
-        return match.group(2)
+def _assemble_lines(lines: list[str]) -> str:
+    last = len(lines) - 1
+    normalized: list[str] = []
+    # A list marker whose whitespace runs past the line break absorbs the following blank
+    # lines; the marker waits here for the next text.
+    pending = ""
+    for index, raw_line in enumerate(lines):
+        line = raw_line.strip()
+        if pending:
+            if not line:
+                continue
+            if raw_line[0].isspace():
+                line, pending = pending + line, ""
+        if line[:1].isdecimal() and (marker := _LIST_MARKER_RE.match(line)) is not None:
+            rest = line[marker.end() :]
+            if rest[:1].isspace():
+                line = "- " + rest.lstrip()
+            elif not rest and index != last:
+                pending += "- "
+                continue
+            elif not rest and raw_line[-1].isspace():
+                line = "-"
+        if pending:
+            line, pending = (pending + line).rstrip(), ""
+        _append_line(normalized, line)
+    if pending:
+        _append_line(normalized, pending.rstrip())
+    return "\n".join(normalized).strip()
 
-    return _BOLD_ITALIC_RE.sub(replacer, text)
 
+def _append_line(normalized: list[str], line: str) -> None:
+    # Blank runs collapse to one empty line, list items stay on their own line and wrapped
+    # prose is joined back onto the previous line.
+    if not line:
+        if normalized and normalized[-1] != "":
+            normalized.append("")
+    elif line.startswith("- "):
+        normalized.append(line)
+    elif normalized and not normalized[-1].startswith("- ") and normalized[-1] != "":
+        normalized[-1] = f"{normalized[-1]} {line}"
+    else:
+        normalized.append(line)
 
-def _normalize_lists(text: str) -> str:
-    return _NUMBERED_LIST_RE.sub(lambda m: f"{m.group(1)}- ", text)
 
+def _inline_token(match: re.Match[str]) -> str:
+    if match.lastindex is None:
+        return "\n" if match.group() == "\r\n" else ""
+    body = match.group(match.lastindex)
+    return _ESCAPED_NUMBER_RE.sub(r"\1", body) if "\\" in body else body
 
-def _normalize_boundaries(text: str) -> str:
-    text = _CURRENCY_AFTER_NUMBER_RE.sub(lambda m: f"{m.group(1)} {m.group(2)}", text)
-    text = _CURRENCY_BEFORE_LETTER_RE.sub(lambda m: f"{m.group(1)} ", text)
-    text = _MONTH_DAY_RE.sub(lambda m: f"{m.group(1)} {m.group(2)}", text)
-    text = _COMMA_NO_SPACE_RE.sub(", ", text)
-    return text
 
+def _boundary_token(match: re.Match[str]) -> str:
+    token = match.group()
+    if token not in _CURRENCY_CODES:
+        return f"{token} "
+    text = match.string
+    start, end = match.span()
+    if start and text[start - 1].isdecimal():
+        token = f" {token}"
+    if text[end : end + 1] in _ASCII_LETTERS:
+        token = f"{token} "
+    return token
 
-def _normalize_whitespace(text: str) -> str:
-    lines = text.split("\n")
-    normalized: list[str] = []
-    for raw_line in lines:
-        line = raw_line.strip()
-        if not line:
-            if normalized and normalized[-1] != "":
-                normalized.append("")
-            continue
-        if line.startswith("- "):
-            normalized.append(line)
-            continue
-        if normalized and not normalized[-1].startswith("- ") and normalized[-1] != "":
-            normalized[-1] = f"{normalized[-1]} {line}"
-            continue
-        normalized.append(line)
-    return "\n".join(normalized)
+
+# Characters that may start an inline token.
+_INLINE_START_RE = re.compile(r"[\r\\*_]")
+# The boundary rules and the comma rule in one scan; a streamed window has no room for two.
+_STREAM_BOUNDARY_RE = re.compile(f"{_BOUNDARY_RE.pattern}|,(?=\\S)")
+# Window tails that may still become a boundary match once the next character arrives.
+_BOUNDARY_PREFIXES = frozenset(
+    token[:size]
+    for token in (*_CURRENCY_CODES, *_MONTH_NAMES, ",")
+    for size in range(1, len(token) + 1)
+)
+_BOUNDARY_LOOKAHEAD = max(len(month) for month in _MONTH_NAMES)
+
+
+class StreamingNormalizer:
+    # Incremental ``_normalize_text`` for streamed deltas: the outputs of ``feed`` followed by
+    # ``flush`` concatenate to exactly the batch result. Each stage emits what no later input
+    # can change and keeps only its lookahead: an emphasis span until it closes (or its line
+    # ends), a trailing backslash or CR, a line head until it is known whether it is a list
+    # item, trailing whitespace of the current line, and the last few characters for the
+    # currency/month/comma boundaries. Work per call is proportional to the chunk plus that
+    # lookahead.
+    def __init__(self) -> None:
+        self._reset()
+
+    def feed(self, chunk: str) -> str:
+        return self._advance(chunk, final=False)
+
+    def flush(self) -> str:
+        # Ends the message; the normalizer can be reused for the next one.
+        text = self._advance("", final=True)
+        self._reset()
+        return text
+
+    def _reset(self) -> None:
+        self._raw = ""
+        self._scanned = 0
+        self._head: str | None = ""
+        self._trailing = ""
+        self._pending = ""
+        self._started = False
+        self._blank = False
+        # The first two characters of the current output entry: one starting with "- " is a
+        # list item, which the next line never joins (a lone "-" joined with prose becomes one).
+        self._entry = ""
+        self._context = ""
+        self._tail = ""
+
+    def _advance(self, chunk: str, *, final: bool) -> str:
+        self._raw += chunk
+        text = self._assemble(self._resolve_inline(final), final)
+        return self._space_boundaries(text, final)
+
+    def _resolve_inline(self, final: bool) -> str:
+        buf = self._raw
+        pieces: list[str] = []
+        pos, held = 0, False
+        while True:
+            candidate = _INLINE_START_RE.search(buf, pos)
+            if candidate is None:
+                pieces.append(buf[pos:])
+                pos = len(buf)
+                break
+            start = candidate.start()
+            pieces.append(buf[pos:start])
+            pos = start
+            if not final and not self._inline_resolved(buf, start):
+                held = True
+                break
+            token = _INLINE_RE.match(buf, start)
+            if token is None:
+                pieces.append(buf[start])
+                pos = start + 1
+            else:
+                pieces.append(_inline_token(token))
+                pos = token.end()
+        self._raw = buf[pos:]
+        self._scanned = len(self._raw) if held else 0
+        return "".join(pieces)
+
+    def _inline_resolved(self, buf: str, start: int) -> bool:
+        char, following = buf[start], buf[start + 1 : start + 2]
+        if not following:
+            return False
+        if char in "\r\\":
+            return True
+        # Only the preferred delimiter settles a span early: ``**`` may still close later on
+        # the line even when a single ``*`` already would.
+        delimiter = char * 2 if following == char else char
+        # Text before ``_scanned`` was searched by the previous call holding this position.
+        resume = self._scanned if start == 0 else 0
+        closing = buf.find(delimiter, max(start + len(delimiter) + 1, resume - len(delimiter) + 1))
+        line_end = buf.find("\n", max(start, resume))
+        if line_end != -1:
+            return True
+        return closing != -1
+
+    def _assemble(self, text: str, final: bool) -> str:
+        out: list[str] = []
+        for index, segment in enumerate(text.split("\n")):
+            if index:
+                self._end_line(out, last=False)
+            if self._head is None:
+                self._stream(out, segment)
+            else:
+                self._head += segment
+                content = self._line_start(self._head)
+                if content is not None:
+                    self._start_line(out, content)
+        if final:
+            self._end_line(out, last=True)
+            if self._pending:
+                self._emit_line(out, self._pending.rstrip())
+        return "".join(out)
+
+    def _line_start(self, head: str) -> str | None:
+        # The stripped start of a still-open line once no continuation can change how
+        # ``_assemble_lines`` treats it, or None while that is undecided.
+        stripped = head.lstrip()
+        if not stripped:
+            return None
+        pending = self._pending
+        if pending and head[0].isspace():
+            return pending + stripped
+        if stripped.isdecimal():
+            return None
+        if stripped[0].isdecimal() and (marker := _LIST_MARKER_RE.match(stripped)) is not None:
+            rest = stripped[marker.end() :]
+            if not rest.strip():
+                return None
+            if rest[0].isspace():
+                return f"{pending}- {rest.lstrip()}"
+        elif not pending and stripped[0] == "-":
+            if len(stripped) == 1 or (stripped[1] == " " and not stripped[2:].strip()):
+                return None
+        return pending + stripped
+
+    def _start_line(self, out: list[str], content: str) -> None:
+        if self._blank:
+            out.append("\n\n")
+            self._entry = ""
+        elif self._started and (content.startswith("- ") or self._entry == "- "):
+            out.append("\n")
+            self._entry = ""
+        elif self._started:
+            out.append(" ")
+            self._entry = f"{self._entry} "[:2]
+        self._started, self._blank = True, False
+        self._head, self._pending = None, ""
+        self._stream(out, content)
+
+    def _stream(self, out: list[str], segment: str) -> None:
+        # Whitespace at the end of a line is only kept if more text follows on it.
+        text = self._trailing + segment
+        body = text.rstrip()
+        if body:
+            out.append(body)
+            if len(self._entry) < 2:
+                self._entry = (self._entry + body)[:2]
+        self._trailing = text[len(body) :]
+
+    def _end_line(self, out: list[str], *, last: bool) -> None:
+        head = self._head
+        self._head, self._trailing = "", ""
+        if head is None:
+            return
+        # The line never settled early, so it is complete here; mirror ``_assemble_lines``.
+        line = head.strip()
+        if self._pending:
+            if not line:
+                return
+            if head[0].isspace():
+                line, self._pending = self._pending + line, ""
+        if line[:1].isdecimal() and (marker := _LIST_MARKER_RE.match(line)) is not None:
+            rest = line[marker.end() :]
+            if rest[:1].isspace():
+                line = "- " + rest.lstrip()
+            elif not rest and not last:
+                self._pending += "- "
+                return
+            elif not rest and head[-1].isspace():
+                line = "-"
+        if self._pending:
+            line, self._pending = (self._pending + line).rstrip(), ""
+        self._emit_line(out, line)
+
+    def _emit_line(self, out: list[str], line: str) -> None:
+        if line:
+            self._start_line(out, line)
+            self._head = ""
+        elif self._started:
+            self._blank = True
+
+    def _space_boundaries(self, text: str, final: bool) -> str:
+        # ``_context`` is the last emitted character, needed to space a code after a digit.
+        self._tail += text
+        buf = self._context + self._tail
+        offset = len(self._context)
+        cut = len(buf)
+        if not final:
+            cut = next(
+                (
+                    start
+                    for start in range(max(offset, cut - _BOUNDARY_LOOKAHEAD), cut)
+                    if buf[start:] in _BOUNDARY_PREFIXES
+                ),
+                cut,
+            )
+        if cut <= offset:
+            return ""
+        pieces: list[str] = []
+        pos = offset
+        for match in _STREAM_BOUNDARY_RE.finditer(buf, offset):
+            start, end = match.span()
+            if start >= cut:
+                break
+            if end > cut:
+                cut = start
+                break
+            pieces.append(buf[pos:start])
+            pieces.append(_boundary_token(match))
+            pos = end
+        pieces.append(buf[pos:cut])
+        if cut > offset:
+            self._context = buf[cut - 1]
+        self._tail = buf[cut:]
+        return "".join(pieces)
@@ -0,0 +1,364 @@
+from __future__ import annotations
+
+import calendar
+import re
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from numpy.typing import NDArray
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import core_schema
+
+from azure_ai_foundry_demo import json_codec
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+FloatArray = NDArray[np.float64]
+
+COLUMNS = ("open", "high", "low", "close", "volume")
+# Polygon aggregate keys, in COLUMNS order.
+_POLYGON_KEYS = ("o", "h", "l", "c", "v")
+TIMESPANS = ("minute", "hour", "day", "week", "month")
+INTRADAY_TIMESPANS = frozenset({"minute", "hour"})
+# Weekly and monthly bars are aligned to period starts that can precede a requested range, so
+# only these bar sizes are stored and extended span by span.
+INCREMENTAL_TIMESPANS = frozenset({"minute", "hour", "day"})
+
+_LOOKBACK_PATTERN = re.compile(r"^\s*(\d+)\s*([dwmy])\s*$", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class Lookback:
+    # A calendar window ending today: ``7D``, ``2W``, ``6M``, ``5Y``.
+    amount: int
+    unit: str = "D"
+
+    def __post_init__(self) -> None:
+        if self.amount < 1 or self.unit not in ("D", "W", "M", "Y"):
+            raise ValueError("Lookback needs a positive amount and a unit of D, W, M or Y")
+
+    @classmethod
+    def parse(cls, value: str | int | Lookback) -> Lookback:
+        if isinstance(value, Lookback):
+            return value
+        if isinstance(value, int):
+            return cls(value, "D")
+        match = _LOOKBACK_PATTERN.match(value)
+        if match is None:
+            raise ValueError(f"Invalid lookback {value!r}; expected e.g. 7D, 1M, 6M or 5Y")
+        return cls(int(match.group(1)), match.group(2).upper())
+
+    def start(self, end: date) -> date:
+        if self.unit == "D":
+            return end - timedelta(days=self.amount)
+        if self.unit == "W":
+            return end - timedelta(weeks=self.amount)
+        months = self.amount * (12 if self.unit == "Y" else 1)
+        return _shift_months(end, -months)
+
+    def __str__(self) -> str:
+        return f"{self.amount}{self.unit}"
+
+
+class BarSeries:
+    # Daily OHLCV bars for one ticker, held as one (5, bars) float64 block plus epoch-millisecond
+    # timestamps in ascending order. NaN marks missing values. The column properties are views of
+    # the block, so the metrics engine and pandas read them without copying. ``timespan`` is the
+    # Polygon bar size ("day" unless the series holds intraday or weekly/monthly bars).
+    __slots__ = ("ticker", "timestamps", "values", "timespan")
+
+    def __init__(
+        self,
+        ticker: str,
+        timestamps: NDArray[np.int64],
+        values: FloatArray,
+        *,
+        timespan: str = "day",
+    ) -> None:
+        if values.shape != (len(COLUMNS), timestamps.shape[0]):
+            raise ValueError("values must be shaped (5, len(timestamps))")
+        if timespan not in TIMESPANS:
+            raise ValueError(f"timespan must be one of {', '.join(TIMESPANS)}")
+        self.ticker = ticker
+        self.timestamps = timestamps
+        self.values = values
+        self.timespan = timespan
+
+    @classmethod
+    def empty(cls, ticker: str = "", *, timespan: str = "day") -> BarSeries:
+        return cls(
+            ticker,
+            np.empty(0, dtype=np.int64),
+            np.empty((len(COLUMNS), 0)),
+            timespan=timespan,
+        )
+
+    @classmethod
+    def concat(cls, parts: Sequence[BarSeries]) -> BarSeries:
+        # Joins pages or cached and freshly fetched spans; later parts win on equal timestamps.
+        if not parts:
+            raise ValueError("concat needs at least one series")
+        first = parts[0]
+        if any(part.timespan != first.timespan for part in parts):
+            raise ValueError("Cannot combine series with different timespans")
+        if len(parts) == 1:
+            return first
+        timestamps = np.concatenate([part.timestamps for part in parts])
+        values = np.concatenate([part.values for part in parts], axis=1)
+        _, last_index = np.unique(timestamps[::-1], return_index=True)
+        keep = timestamps.shape[0] - 1 - last_index
+        ticker = next((part.ticker for part in parts if part.ticker), "")
+        return cls(ticker, timestamps[keep], values[:, keep], timespan=first.timespan)
+
+    @classmethod
+    def from_polygon_results(
+        cls, ticker: str, results: Sequence[Mapping[str, Any]], *, timespan: str = "day"
+    ) -> BarSeries:
+        # One list pass per column converted in C; missing values (None) become NaN and bars
+        # without a timestamp are dropped.
+        try:
+            stamps = np.array([entry.get("t") for entry in results], dtype=np.float64)
+            values = np.array(
+                [[entry.get(key) for entry in results] for key in _POLYGON_KEYS],
+                dtype=np.float64,
+            ).reshape(len(COLUMNS), len(results))
+        except (TypeError, ValueError):
+            return cls._from_entries(ticker, results, timespan)
+        present = ~np.isnan(stamps)
+        if not present.all():
+            stamps, values = stamps[present], values[:, present]
+        return cls._ordered(ticker, stamps.astype(np.int64), values, timespan)
+
+    @classmethod
+    def _from_entries(
+        cls, ticker: str, results: Sequence[Mapping[str, Any]], timespan: str
+    ) -> BarSeries:
+        # Entry-by-entry fallback for payloads with non-numeric fields.
+        timestamps = np.empty(len(results), dtype=np.int64)
+        values = np.full((len(COLUMNS), len(results)), np.nan)
+        count = 0
+        for entry in results:
+            timestamp = entry.get("t")
+            if not isinstance(timestamp, int | float):
+                continue
+            timestamps[count] = timestamp
+            for row, key in enumerate(_POLYGON_KEYS):
+                value = entry.get(key)
+                if isinstance(value, int | float):
+                    values[row, count] = value
+            count += 1
+        return cls._ordered(ticker, timestamps[:count], values[:, :count], timespan)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping[str, Any]], ticker: str = "") -> BarSeries:
+        # Row dicts with an ISO ``date`` (the pre-columnar payload shape).
+        rows = [record for record in records if record.get("date")]
+        timestamps = np.array(
+            [_date_to_millis(str(record["date"])) for record in rows], dtype=np.int64
+        )
+        values = np.array(
+            [[_float(record.get(column)) for record in rows] for column in COLUMNS],
+            dtype=np.float64,
+        ).reshape(len(COLUMNS), len(rows))
+        return cls._ordered(ticker, timestamps, values)
+
+    @classmethod
+    def from_columns(cls, columns: Mapping[str, Sequence[Any]], ticker: str = "") -> BarSeries:
+        dates = columns.get("date") or []
+        timestamps = np.array([_date_to_millis(str(day)) for day in dates], dtype=np.int64)
+        values = np.full((len(COLUMNS), len(dates)), np.nan)
+        for row, column in enumerate(COLUMNS):
+            series = columns.get(column)
+            if series is not None:
+                values[row] = [_float(value) for value in series]
+        return cls._ordered(ticker, timestamps, values)
+
+    @classmethod
+    def from_json(cls, data: bytes | str) -> BarSeries:
+        return cls.from_dict(json_codec.loads(data))
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> BarSeries:
+        timestamps = np.array(data["t"], dtype=np.int64)
+        values = np.array(data["values"], dtype=np.float64).reshape(
+            len(COLUMNS), timestamps.shape[0]
+        )
+        return cls(data.get("ticker", ""), timestamps, values, timespan=data.get("timespan", "day"))
+
+    @classmethod
+    def coerce(cls, value: Any) -> BarSeries:
+        if isinstance(value, BarSeries):
+            return value
+        if value is None:
+            return cls.empty()
+        if isinstance(value, Mapping):
+            return cls.from_columns(value)
+        if isinstance(value, Iterable) and not isinstance(value, str | bytes):
+            return cls.from_records(value)
+        raise TypeError(f"Cannot build a BarSeries from {type(value).__name__}")
+
+    @classmethod
+    def _ordered(
+        cls,
+        ticker: str,
+        timestamps: NDArray[np.int64],
+        values: FloatArray,
+        timespan: str = "day",
+    ) -> BarSeries:
+        steps = np.diff(timestamps)
+        if np.all(steps < 0):
+            # Polygon returns newest-first when asked for the most recent N bars.
+            timestamps, values = timestamps[::-1], values[:, ::-1]
+        elif not np.all(steps >= 0):
+            order = np.argsort(timestamps, kind="stable")
+            timestamps, values = timestamps[order], values[:, order]
+        return cls(ticker, timestamps, values, timespan=timespan)
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        # Python-mode dumps keep the series itself; JSON dumps serialize it column-wise.
+        return core_schema.no_info_plain_validator_function(
+            cls.coerce,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda series: series.to_columns(), when_used="json"
+            ),
+        )
+
+    @property
+    def open(self) -> FloatArray:
+        return self.values[0]
+
+    @property
+    def high(self) -> FloatArray:
+        return self.values[1]
+
+    @property
+    def low(self) -> FloatArray:
+        return self.values[2]
+
+    @property
+    def close(self) -> FloatArray:
+        return self.values[3]
+
+    @property
+    def volume(self) -> FloatArray:
+        return self.values[4]
+
+    def __len__(self) -> int:
+        return int(self.timestamps.shape[0])
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BarSeries):
+            return NotImplemented
+        return (
+            self.ticker == other.ticker
+            and self.timespan == other.timespan
+            and np.array_equal(self.timestamps, other.timestamps)
+            and np.array_equal(self.values, other.values, equal_nan=True)
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"BarSeries(ticker={self.ticker!r}, timespan={self.timespan!r}, bars={len(self)})"
+
+    def tail(self, count: int) -> BarSeries:
+        if count >= len(self):
+            return self
+        return self._slice(len(self) - max(count, 0), len(self))
+
+    def between(self, start_ms: int, end_ms: int) -> BarSeries:
+        # Bars with start_ms <= timestamp < end_ms, as a view.
+        lower, upper = np.searchsorted(self.timestamps, (start_ms, end_ms), side="left")
+        if lower == 0 and upper == len(self):
+            return self
+        return self._slice(int(lower), int(upper))
+
+    def _slice(self, lower: int, upper: int) -> BarSeries:
+        return BarSeries(
+            self.ticker,
+            self.timestamps[lower:upper],
+            self.values[:, lower:upper],
+            timespan=self.timespan,
+        )
+
+    def dates(self) -> list[str]:
+        # Day precision for daily and longer bars, minute precision (UTC) for intraday bars.
+        unit = "m" if self.timespan in INTRADAY_TIMESPANS else "D"
+        return np.datetime_as_string(self.timestamps.astype("datetime64[ms]"), unit=unit).tolist()
+
+    def to_columns(self) -> dict[str, list[Any]]:
+        columns: dict[str, list[Any]] = {"date": self.dates()}
+        for column, series in zip(COLUMNS, self.values, strict=True):
+            columns[column] = _nullable(series)
+        return columns
+
+    def to_json(self) -> bytes:
+        return json_codec.dumps(self.to_dict())
+
+    def to_dict(self) -> dict[str, Any]:
+        # Lossless (millisecond timestamps) form used by the bar cache.
+        return {
+            "ticker": self.ticker,
+            "timespan": self.timespan,
+            "t": self.timestamps.tolist(),
+            "values": [_nullable(series) for series in self.values],
+        }
+
+    def to_frame(self) -> pd.DataFrame:
+        import pandas as pd
+
+        frame = pd.DataFrame(dict(zip(COLUMNS, self.values, strict=True)), copy=False)
+        frame.insert(0, "date", self.timestamps.astype("datetime64[ms]").astype("datetime64[s]"))
+        return frame
+
+
+def _nullable(series: FloatArray) -> list[float | None]:
+    return np.where(np.isnan(series), None, series).tolist()
+
+
+def _float(value: Any) -> float:
+    return np.nan if value is None else float(value)
+
+
+Span = tuple[date, date]
+
+
+def missing_spans(start: date, end: date, covered: Span | None) -> list[Span]:
+    # Day ranges to fetch so [start, end] is complete. Spans always touch the covered range so
+    # the stored coverage stays contiguous.
+    if covered is None:
+        return [(start, end)]
+    low, high = covered
+    spans: list[Span] = []
+    if start < low:
+        spans.append((start, low - timedelta(days=1)))
+    if end > high:
+        spans.append((high + timedelta(days=1), end))
+    return spans
+
+
+def extend_coverage(covered: Span | None, start: date, settled_end: date) -> Span | None:
+    if covered is None:
+        return (start, settled_end) if start <= settled_end else None
+    return min(covered[0], start), max(covered[1], settled_end)
+
+
+def _shift_months(day: date, months: int) -> date:
+    month_index = day.year * 12 + day.month - 1 + months
+    year, month = divmod(month_index, 12)
+    last_day = calendar.monthrange(year, month + 1)[1]
+    return date(year, month + 1, min(day.day, last_day))
+
+
+def _date_to_millis(value: str) -> int:
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return int(parsed.timestamp() * 1000)
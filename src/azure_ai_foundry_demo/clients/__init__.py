@@ -1,9 +1,15 @@
+from .http import SharedHttpClient
 from .polygon import PolygonClient, PolygonDailyBar, PolygonQuote
+from .polygon_cache import CachedPolygonClient
 from .serper import SerperClient
+from .serper_cache import CachedSerperClient
 
 __all__ = [
+    "CachedPolygonClient",
+    "CachedSerperClient",
     "PolygonClient",
     "PolygonDailyBar",
     "PolygonQuote",
     "SerperClient",
+    "SharedHttpClient",
 ]
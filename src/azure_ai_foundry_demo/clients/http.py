@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import importlib.util
+import logging
+from collections.abc import Awaitable, Callable
+
+import httpx
+
+from azure_ai_foundry_demo.config import Settings
+from azure_ai_foundry_demo.rate_limit import DEFAULT_RETRY_AFTER, RateLimiter, retry_after_seconds
+
+AsyncClientFactory = Callable[[], httpx.AsyncClient]
+
+logger = logging.getLogger(__name__)
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def build_async_client(settings: Settings) -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry,
+    )
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(settings.http_timeout, connect=settings.http_connect_timeout),
+        limits=limits,
+        http2=settings.http2_enabled and http2_available(),
+    )
+
+
+class SharedHttpClient:
+    # httpx connection pools are bound to the event loop that opened them, so the pooled client
+    # is rebuilt if it is used from a different loop.
+    def __init__(
+        self, settings: Settings, client_factory: AsyncClientFactory | None = None
+    ) -> None:
+        self._client_factory = client_factory or (lambda: build_async_client(settings))
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is not None and not self._client.is_closed and self._loop is loop:
+            return self._client
+        if self._client is not None and not self._client.is_closed:
+            logger.debug("Event loop changed; closing pooled HTTP client on its own loop")
+            _close_on_loop(self._client, self._loop)
+        self._client = self._client_factory()
+        self._loop = loop
+        return self._client
+
+    @property
+    def is_open(self) -> bool:
+        return self._client is not None and not self._client.is_closed
+
+    async def aclose(self) -> None:
+        client, loop = self._client, self._loop
+        self._client = None
+        self._loop = None
+        if client is None or client.is_closed:
+            return
+        if loop is not asyncio.get_running_loop():
+            _close_on_loop(client, loop)
+            return
+        await client.aclose()
+
+    async def __aenter__(self) -> SharedHttpClient:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+
+def _close_on_loop(client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop | None) -> None:
+    # Pooled connections can only be closed on the loop that opened them. Once that loop has
+    # stopped there is nothing to schedule the close on, so the client is left to the GC.
+    if loop is None or loop.is_closed() or not loop.is_running():
+        logger.debug("Event loop of the pooled HTTP client has stopped; dropping the client")
+        return
+    future = asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+    future.add_done_callback(_log_close_failure)
+
+
+def _log_close_failure(future: concurrent.futures.Future[None]) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.debug("Closing a pooled HTTP client failed", exc_info=future.exception())
+
+
+async def send_rate_limited(
+    send: Callable[[], Awaitable[httpx.Response]],
+    limiter: RateLimiter | None,
+    *,
+    max_retries: int = 0,
+) -> httpx.Response:
+    # 429s pause the limiter for Retry-After and are retried instead of surfacing as tool errors.
+    if limiter is None:
+        return await send()
+    attempt = 0
+    while True:
+        async with limiter.acquire():
+            response = await send()
+        if response.status_code != 429 or attempt >= max_retries:
+            return response
+        retry_after = retry_after_seconds(response.headers)
+        limiter.defer(retry_after if retry_after is not None else DEFAULT_RETRY_AFTER)
+        attempt += 1
@@ -1,19 +1,40 @@
 from __future__ import annotations
 
-from collections.abc import Callable
-from datetime import UTC, datetime, timedelta
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Callable, Iterable
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
 from typing import Any
 
 import httpx
-from pydantic import BaseModel
 
+from azure_ai_foundry_demo.bars import TIMESPANS, BarSeries, Lookback
+from azure_ai_foundry_demo.clients.http import AsyncClientFactory, SharedHttpClient
+from azure_ai_foundry_demo.clients.retry import ResilientSender, RetryPolicy, RetryStats
 from azure_ai_foundry_demo.config import Settings
+from azure_ai_foundry_demo.json_codec import response_json
+from azure_ai_foundry_demo.market_hours import EXCHANGE_TZ, MarketCalendar
 from azure_ai_foundry_demo.models import StockQuote
+from azure_ai_foundry_demo.rate_limit import RateLimiter
+from azure_ai_foundry_demo.warehouse import BarWarehouse
 
-AsyncClientFactory = Callable[[], httpx.AsyncClient]
+logger = logging.getLogger(__name__)
 
+# Grouped daily bars are empty for unlisted holidays; walk back this many sessions at most.
+GROUPED_LOOKBACK_SESSIONS = 5
+# When the latest closed session is not published yet, an older one is used for this long
+# before the latest is requested again.
+GROUPED_RECHECK = timedelta(minutes=10)
+# Guards against a cursor that never terminates; 100 pages of 50,000 bars is ~50 years of minutes.
+MAX_RANGE_PAGES = 100
 
-class PolygonDailyBar(BaseModel):
+
+# Hot-path records are plain slotted dataclasses: grouped daily responses build one per listed
+# symbol (~10k) and nothing here needs validation. Pydantic models are only built at the tool
+# output boundary (``PolygonQuote.to_stock_quote``).
+@dataclass(slots=True)
+class PolygonDailyBar:
     ticker: str
     as_of: datetime
     open: float | None = None
@@ -33,12 +54,37 @@ class PolygonDailyBar(BaseModel):
             "volume": self.volume,
         }
 
+    def to_dict(self) -> dict[str, Any]:
+        # Lossless form for the response cache; ``as_dict`` is the date-only payload row.
+        return {
+            "ticker": self.ticker,
+            "as_of": self.as_of.isoformat(),
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> PolygonDailyBar:
+        return cls(
+            ticker=data["ticker"],
+            as_of=datetime.fromisoformat(data["as_of"]),
+            open=data.get("open"),
+            high=data.get("high"),
+            low=data.get("low"),
+            close=data.get("close"),
+            volume=data.get("volume"),
+        )
+
 
-class PolygonQuote(BaseModel):
+@dataclass(slots=True)
+class PolygonQuote:
     ticker: str
     close: float
-    open: float | None = None
     as_of: datetime
+    open: float | None = None
 
     def to_stock_quote(self) -> StockQuote:
         change = None
@@ -55,21 +101,87 @@ class PolygonQuote(BaseModel):
             as_of=self.as_of.isoformat(),
         )
 
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "ticker": self.ticker,
+            "close": self.close,
+            "open": self.open,
+            "as_of": self.as_of.isoformat(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> PolygonQuote:
+        return cls(
+            ticker=data["ticker"],
+            close=data["close"],
+            open=data.get("open"),
+            as_of=datetime.fromisoformat(data["as_of"]),
+        )
+
+    @classmethod
+    def from_bar(cls, bar: PolygonDailyBar) -> PolygonQuote | None:
+        if bar.close is None:
+            return None
+        return cls(ticker=bar.ticker, close=bar.close, open=bar.open, as_of=bar.as_of)
+
 
 class PolygonClient:
     def __init__(
-        self, settings: Settings, client_factory: AsyncClientFactory | None = None
+        self,
+        settings: Settings,
+        client_factory: AsyncClientFactory | None = None,
+        *,
+        http_client: SharedHttpClient | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        calendar: MarketCalendar | None = None,
+        now: Callable[[], datetime] | None = None,
+        warehouse: BarWarehouse | None = None,
     ) -> None:
         self._settings = settings
-        self._client_factory = client_factory or (lambda: httpx.AsyncClient(timeout=10.0))
+        self._warehouse = warehouse
+        self._owns_http_client = http_client is None
+        self._http_client = http_client or SharedHttpClient(settings, client_factory)
+        self._sender = ResilientSender(
+            retry_policy or RetryPolicy.from_settings(settings),
+            rate_limiter,
+            rate_limit_retries=settings.rate_limit_max_retries,
+        )
+        self._calendar = calendar or MarketCalendar()
+        self._now = now or (lambda: datetime.now(UTC))
+        # Grouped daily bars of the newest session fetched; older sessions are dropped.
+        self._grouped_day: date | None = None
+        self._grouped_bars: dict[str, PolygonDailyBar] = {}
+        # The last closed session the lookup started from, the session it resolved to, and
+        # when to look again if that was an older one.
+        self._session_key: date | None = None
+        self._session: date | None = None
+        self._session_recheck: datetime | None = None
+        self._grouped_lock = asyncio.Lock()
+
+    @property
+    def retry_stats(self) -> RetryStats:
+        return self._sender.stats
+
+    async def aclose(self) -> None:
+        if self._owns_http_client:
+            await self._http_client.aclose()
+
+    async def __aenter__(self) -> PolygonClient:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
 
     async def fetch_previous_close(self, ticker: str) -> PolygonQuote:
+        indexed = self._indexed_previous_close(ticker)
+        if indexed is not None:
+            return indexed
         url = self._settings.polygon_url(f"v2/aggs/ticker/{ticker.upper()}/prev")
         params = self._settings.polygon_params() | {"adjusted": "true"}
-        async with self._client_factory() as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            payload = response.json()
+        response = await self._get(url, params)
+        response.raise_for_status()
+        payload = response_json(response)
         results = payload.get("results") or []
         if not results:
             raise ValueError(f"Polygon response did not include results for ticker {ticker}")
@@ -90,7 +202,104 @@ class PolygonClient:
             as_of=as_of,
         )
 
-    async def fetch_recent_bars(self, ticker: str, days: int = 7) -> list[PolygonDailyBar]:
+    async def fetch_previous_closes(self, tickers: Iterable[str]) -> dict[str, PolygonQuote]:
+        # One grouped-daily request answers every ticker; anything missing from the grouped
+        # bars (new listings, OTC symbols) falls back to the per-ticker endpoint.
+        symbols = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+        await self.load_previous_session()
+        quotes: dict[str, PolygonQuote] = {}
+        missing: list[str] = []
+        for symbol in symbols:
+            quote = self._indexed_previous_close(symbol)
+            if quote is None:
+                missing.append(symbol)
+            else:
+                quotes[symbol] = quote
+        if missing:
+            results = await asyncio.gather(
+                *(self.fetch_previous_close(symbol) for symbol in missing), return_exceptions=True
+            )
+            for symbol, result in zip(missing, results, strict=True):
+                if isinstance(result, BaseException):
+                    logger.warning("Polygon quote unavailable for %s", symbol, exc_info=result)
+                else:
+                    quotes[symbol] = result
+        return quotes
+
+    async def load_previous_session(self) -> date | None:
+        # The newest closed session with grouped bars: today's once the market has closed,
+        # walking back over holidays the calendar does not list.
+        now = self._now()
+        latest = self._calendar.last_closed_session(now)
+        async with self._grouped_lock:
+            if self._resolved_session(latest, now):
+                return self._session
+            session = latest
+            for _ in range(GROUPED_LOOKBACK_SESSIONS):
+                bars = await self.fetch_grouped_daily(session)
+                if bars:
+                    self._session_key, self._session = latest, session
+                    self._session_recheck = now + GROUPED_RECHECK if session != latest else None
+                    return session
+                session = self._calendar.previous_trading_day(session)
+        logger.warning(
+            "No grouped daily bars found in the last %d sessions", GROUPED_LOOKBACK_SESSIONS
+        )
+        return None
+
+    async def fetch_grouped_daily(self, day: date) -> dict[str, PolygonDailyBar]:
+        indexed = self._indexed_grouped(day)
+        if indexed is not None:
+            return indexed
+        url = self._settings.polygon_url(
+            f"v2/aggs/grouped/locale/us/market/stocks/{day.isoformat()}"
+        )
+        params = self._settings.polygon_params() | {"adjusted": "true"}
+        response = await self._get(url, params)
+        response.raise_for_status()
+        bars: dict[str, PolygonDailyBar] = {}
+        for entry in response_json(response).get("results") or []:
+            symbol = entry.get("T")
+            timestamp = entry.get("t")
+            if not symbol or not isinstance(timestamp, int | float):
+                continue
+            bars[symbol] = _bar_from_entry(symbol, entry)
+        return self._index_grouped(day, bars)
+
+    def _indexed_grouped(self, day: date) -> dict[str, PolygonDailyBar] | None:
+        return self._grouped_bars if day == self._grouped_day else None
+
+    def _index_grouped(
+        self, day: date, bars: dict[str, PolygonDailyBar]
+    ) -> dict[str, PolygonDailyBar]:
+        # A full-market snapshot is ~10k bars, so only the newest session stays in memory.
+        if bars and (self._grouped_day is None or day >= self._grouped_day):
+            self._grouped_day, self._grouped_bars = day, bars
+        return bars
+
+    def _resolved_session(self, latest: date, now: datetime) -> bool:
+        if self._session is None or self._session_key != latest:
+            return False
+        return self._session_recheck is None or now < self._session_recheck
+
+    def _indexed_previous_close(self, ticker: str) -> PolygonQuote | None:
+        now = self._now()
+        if not self._resolved_session(self._calendar.last_closed_session(now), now):
+            return None
+        indexed = self._indexed_grouped(self._session) if self._session is not None else None
+        bar = indexed.get(ticker.upper()) if indexed is not None else None
+        return PolygonQuote.from_bar(bar) if bar is not None else None
+
+    async def _ingest(self, series: BarSeries, multiplier: int = 1) -> None:
+        # Append-only: downloaded settled bars are kept in the warehouse when one is attached.
+        # The sqlite write runs in a worker thread to keep the event loop free.
+        if self._warehouse is not None and len(series):
+            await asyncio.to_thread(self._warehouse.append, series, multiplier=multiplier)
+
+    async def _get(self, url: str, params: dict[str, Any]) -> httpx.Response:
+        return await self._sender.send(lambda: self._http_client.client.get(url, params=params))
+
+    async def fetch_recent_bars(self, ticker: str, days: int = 7) -> BarSeries:
         if days <= 0:
             raise ValueError("days must be greater than zero")
         end = datetime.now(UTC).date()
@@ -103,27 +312,95 @@ class PolygonClient:
             "sort": "desc",
             "limit": days,
         }
-        async with self._client_factory() as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            payload = response.json()
+        response = await self._get(url, params)
+        response.raise_for_status()
+        payload = response_json(response)
         results = payload.get("results") or []
-        bars: list[PolygonDailyBar] = []
-        for entry in results:
-            timestamp = entry.get("t")
-            if not isinstance(timestamp, int | float):
-                continue
-            as_of = datetime.fromtimestamp(timestamp / 1000, tz=UTC)
-            bars.append(
-                PolygonDailyBar(
-                    ticker=ticker.upper(),
-                    as_of=as_of,
-                    open=float(entry["o"]) if entry.get("o") is not None else None,
-                    high=float(entry["h"]) if entry.get("h") is not None else None,
-                    low=float(entry["l"]) if entry.get("l") is not None else None,
-                    close=float(entry["c"]) if entry.get("c") is not None else None,
-                    volume=float(entry["v"]) if entry.get("v") is not None else None,
-                )
+        series = BarSeries.from_polygon_results(ticker.upper(), results).tail(days)
+        await self._ingest(series)
+        return series
+
+    async def fetch_history(
+        self,
+        ticker: str,
+        lookback: str | int | Lookback = "1M",
+        *,
+        timespan: str = "day",
+        multiplier: int = 1,
+    ) -> BarSeries:
+        end = self._now().astimezone(EXCHANGE_TZ).date()
+        start = Lookback.parse(lookback).start(end)
+        return await self.fetch_range(ticker, start, end, timespan=timespan, multiplier=multiplier)
+
+    async def fetch_range(
+        self,
+        ticker: str,
+        start: date,
+        end: date,
+        *,
+        timespan: str = "day",
+        multiplier: int = 1,
+    ) -> BarSeries:
+        pages = [
+            page
+            async for page in self.iter_range_pages(
+                ticker, start, end, timespan=timespan, multiplier=multiplier
             )
-        bars.sort(key=lambda bar: bar.as_of)
-        return bars[-days:]
+        ]
+        if not pages:
+            return BarSeries.empty(ticker.upper(), timespan=timespan)
+        return BarSeries.concat(pages)
+
+    async def iter_range_pages(
+        self,
+        ticker: str,
+        start: date,
+        end: date,
+        *,
+        timespan: str = "day",
+        multiplier: int = 1,
+    ) -> AsyncIterator[BarSeries]:
+        # Yields one BarSeries per aggregates page, following ``next_url`` until it is absent.
+        if timespan not in TIMESPANS:
+            raise ValueError(f"timespan must be one of {', '.join(TIMESPANS)}")
+        if multiplier < 1 or start > end:
+            raise ValueError("multiplier must be positive and start must not be after end")
+        symbol = ticker.upper()
+        url = self._settings.polygon_url(
+            f"v2/aggs/ticker/{symbol}/range/{multiplier}/{timespan}"
+            f"/{start.isoformat()}/{end.isoformat()}"
+        )
+        params = self._settings.polygon_params() | {
+            "adjusted": "true",
+            "sort": "asc",
+            "limit": self._settings.polygon_page_size,
+        }
+        for _ in range(MAX_RANGE_PAGES):
+            response = await self._get(url, params)
+            response.raise_for_status()
+            payload = response_json(response)
+            results = payload.get("results") or []
+            if results:
+                page = BarSeries.from_polygon_results(symbol, results, timespan=timespan)
+                await self._ingest(page, multiplier)
+                yield page
+            next_url = payload.get("next_url")
+            if not next_url:
+                return
+            # next_url carries the cursor and query string but not the API key.
+            url, params = next_url, self._settings.polygon_params()
+        logger.warning(
+            "Stopped paging %s bars for %s after %d pages", timespan, symbol, MAX_RANGE_PAGES
+        )
+
+
+def _bar_from_entry(ticker: str, entry: dict[str, Any]) -> PolygonDailyBar:
+    return PolygonDailyBar(
+        ticker=ticker,
+        as_of=datetime.fromtimestamp(entry["t"] / 1000, tz=UTC),
+        open=float(entry["o"]) if entry.get("o") is not None else None,
+        high=float(entry["h"]) if entry.get("h") is not None else None,
+        low=float(entry["l"]) if entry.get("l") is not None else None,
+        close=float(entry["c"]) if entry.get("c") is not None else None,
+        volume=float(entry["v"]) if entry.get("v") is not None else None,
+    )
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Iterable
+from datetime import date, datetime, timedelta
+
+from azure_ai_foundry_demo import json_codec
+from azure_ai_foundry_demo.bars import (
+    INCREMENTAL_TIMESPANS,
+    BarSeries,
+    extend_coverage,
+    missing_spans,
+)
+from azure_ai_foundry_demo.cache import CacheBackend, CacheStats
+from azure_ai_foundry_demo.clients.http import AsyncClientFactory, SharedHttpClient
+from azure_ai_foundry_demo.clients.polygon import (
+    GROUPED_RECHECK,
+    PolygonClient,
+    PolygonDailyBar,
+    PolygonQuote,
+)
+from azure_ai_foundry_demo.clients.retry import RetryPolicy
+from azure_ai_foundry_demo.config import Settings
+from azure_ai_foundry_demo.market_hours import EXCHANGE_TZ, MarketCalendar, day_start_ms
+from azure_ai_foundry_demo.rate_limit import RateLimiter
+from azure_ai_foundry_demo.warehouse import BarWarehouse
+
+logger = logging.getLogger(__name__)
+
+
+class CachedPolygonClient(PolygonClient):
+    # Previous-close quotes and daily bars only change when a session closes, so entries
+    # expire on that market boundary rather than a fixed TTL.
+    def __init__(
+        self,
+        settings: Settings,
+        cache: CacheBackend,
+        client_factory: AsyncClientFactory | None = None,
+        *,
+        http_client: SharedHttpClient | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        calendar: MarketCalendar | None = None,
+        now: Callable[[], datetime] | None = None,
+        warehouse: BarWarehouse | None = None,
+    ) -> None:
+        super().__init__(
+            settings,
+            client_factory,
+            http_client=http_client,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            calendar=calendar,
+            now=now,
+            warehouse=warehouse,
+        )
+        self._cache = cache
+
+    @property
+    def cache_stats(self) -> CacheStats:
+        return self._cache.stats
+
+    async def fetch_previous_close(self, ticker: str) -> PolygonQuote:
+        key = f"polygon:prev:{ticker.upper()}"
+        cached = self._cache.get(key)
+        if cached is not None:
+            logger.debug("Polygon cache hit for %s", key)
+            return PolygonQuote.from_dict(json_codec.loads(cached))
+        quote = await super().fetch_previous_close(ticker)
+        self._cache.set(key, json_codec.dumps(quote.to_dict()), self._quote_expiry(quote))
+        return quote
+
+    async def fetch_previous_closes(self, tickers: Iterable[str]) -> dict[str, PolygonQuote]:
+        quotes = await super().fetch_previous_closes(tickers)
+        for symbol, quote in quotes.items():
+            payload = json_codec.dumps(quote.to_dict())
+            self._cache.set(f"polygon:prev:{symbol}", payload, self._quote_expiry(quote))
+        return quotes
+
+    async def fetch_grouped_daily(self, day: date) -> dict[str, PolygonDailyBar]:
+        # A grouped session is only consulted as the "previous session" until the next close.
+        indexed = self._indexed_grouped(day)
+        if indexed is not None:
+            return indexed
+        key = f"polygon:grouped:{day.isoformat()}"
+        cached = self._cache.get(key)
+        if cached is not None:
+            logger.debug("Polygon cache hit for %s", key)
+            bars = [PolygonDailyBar.from_dict(item) for item in json_codec.loads(cached)]
+            return self._index_grouped(day, {bar.ticker: bar for bar in bars})
+        grouped = await super().fetch_grouped_daily(day)
+        if grouped:
+            expires_at = self._calendar.next_close(self._now())
+            payload = json_codec.dumps([bar.to_dict() for bar in grouped.values()])
+            self._cache.set(key, payload, expires_at.timestamp())
+        return grouped
+
+    def _quote_expiry(self, quote: PolygonQuote) -> float:
+        # Until the next close, unless the quote predates the latest closed session (not yet
+        # published upstream), which is asked for again shortly.
+        now = self._now()
+        if quote.as_of.astimezone(EXCHANGE_TZ).date() < self._calendar.last_closed_session(now):
+            return (now + GROUPED_RECHECK).timestamp()
+        return self._calendar.next_close(now).timestamp()
+
+    async def fetch_recent_bars(self, ticker: str, days: int = 7) -> BarSeries:
+        key = f"polygon:bars:{ticker.upper()}:{days}"
+        cached = self._cache.get(key)
+        if cached is not None:
+            logger.debug("Polygon cache hit for %s", key)
+            return BarSeries.from_json(cached)
+        bars = await super().fetch_recent_bars(ticker, days=days)
+        expires_at = self._calendar.next_close(self._now())
+        self._cache.set(key, bars.to_json(), expires_at.timestamp())
+        return bars
+
+    async def fetch_range(
+        self,
+        ticker: str,
+        start: date,
+        end: date,
+        *,
+        timespan: str = "day",
+        multiplier: int = 1,
+    ) -> BarSeries:
+        # Keeps one contiguous, settled span per (ticker, bar size) and only downloads the days
+        # on either side of it, so widening a lookback from 1Y to 5Y fetches the missing 4Y.
+        if timespan not in INCREMENTAL_TIMESPANS:
+            return await super().fetch_range(
+                ticker, start, end, timespan=timespan, multiplier=multiplier
+            )
+        symbol = ticker.upper()
+        key = f"polygon:range:{symbol}:{multiplier}{timespan}"
+        parts: list[BarSeries] = []
+        covered = None
+        cached = self._cache.get(key)
+        if cached is not None:
+            logger.debug("Polygon cache hit for %s", key)
+            entry = json_codec.loads(cached)
+            parts.append(BarSeries.from_dict(entry["series"]))
+            covered = (date.fromisoformat(entry["start"]), date.fromisoformat(entry["end"]))
+        spans = missing_spans(start, end, covered)
+        for span_start, span_end in spans:
+            parts.append(
+                await super().fetch_range(
+                    symbol, span_start, span_end, timespan=timespan, multiplier=multiplier
+                )
+            )
+        if not parts:
+            return BarSeries.empty(symbol, timespan=timespan)
+        series = BarSeries.concat(parts)
+        if spans:
+            # Today's bars are still forming; they are stored but refetched on the next call.
+            settled = self._now().astimezone(EXCHANGE_TZ).date() - timedelta(days=1)
+            coverage = extend_coverage(covered, start, min(end, settled))
+            if coverage is not None:
+                entry = {
+                    "start": coverage[0].isoformat(),
+                    "end": coverage[1].isoformat(),
+                    "series": series.to_dict(),
+                }
+                expires_at = self._now().timestamp() + self._settings.polygon_history_ttl
+                self._cache.set(key, json_codec.dumps(entry), expires_at)
+        return series.between(day_start_ms(start), day_start_ms(end + timedelta(days=1)))
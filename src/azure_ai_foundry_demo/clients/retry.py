@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+
+import httpx
+
+from azure_ai_foundry_demo.clients.http import send_rate_limited
+from azure_ai_foundry_demo.config import Settings
+from azure_ai_foundry_demo.rate_limit import RateLimiter, retry_after_seconds
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+Send = Callable[[], Awaitable[httpx.Response]]
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 3
+    initial_backoff: float = 0.2
+    multiplier: float = 2.0
+    max_backoff: float = 2.0
+    jitter: float = 0.1
+    # Total budget across attempts and backoff sleeps, in seconds.
+    deadline: float = 20.0
+    hedge: bool = False
+    # Hedge delay used until enough latency samples exist to estimate the p95.
+    hedge_delay: float = 1.0
+
+    def __post_init__(self) -> None:
+        if self.max_attempts < 1 or self.deadline <= 0 or self.hedge_delay <= 0:
+            raise ValueError("max_attempts, deadline and hedge_delay must be positive")
+        if self.initial_backoff < 0 or self.max_backoff < self.initial_backoff:
+            raise ValueError("Backoff must satisfy 0 <= initial_backoff <= max_backoff")
+        if self.multiplier < 1 or not 0 <= self.jitter < 1:
+            raise ValueError("Invalid retry backoff parameters")
+
+    @classmethod
+    def from_settings(cls, settings: Settings, *, hedge: bool | None = None) -> RetryPolicy:
+        # ``hedge`` overrides HTTP_HEDGE_ENABLED for clients whose requests are billed.
+        return cls(
+            max_attempts=settings.http_retry_attempts,
+            initial_backoff=settings.http_retry_backoff,
+            max_backoff=settings.http_retry_max_backoff,
+            deadline=settings.http_retry_deadline,
+            hedge=settings.http_hedge_enabled if hedge is None else hedge,
+            hedge_delay=settings.http_hedge_delay,
+        )
+
+    def backoff(self, retry: int, rng: random.Random | None = None) -> float:
+        base = min(self.initial_backoff * self.multiplier**retry, self.max_backoff)
+        if not self.jitter:
+            return base
+        spread = base * self.jitter
+        return max(0.0, base + (rng or random).uniform(-spread, spread))
+
+
+@dataclass
+class RetryStats:
+    requests: int = 0
+    retries: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    deadline_exceeded: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class LatencyTracker:
+    def __init__(self, window: int = 200, min_samples: int = 20) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self._min_samples = min_samples
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def p95(self) -> float | None:
+        if len(self._samples) < self._min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[max(0, int(len(ordered) * 0.95) - 1)]
+
+
+class ResilientSender:
+    # Retries connect/read failures and 5xx responses with exponential backoff inside one deadline
+    # budget. 429s are retried here only without a rate limiter; with one, send_rate_limited has
+    # already honoured Retry-After. Hedging sends a duplicate request once the first has been
+    # outstanding for the observed p95 latency and keeps whichever response arrives first.
+    def __init__(
+        self,
+        policy: RetryPolicy,
+        rate_limiter: RateLimiter | None = None,
+        *,
+        rate_limit_retries: int = 0,
+        rng: random.Random | None = None,
+    ) -> None:
+        self._policy = policy
+        self._rate_limiter = rate_limiter
+        self._rate_limit_retries = rate_limit_retries
+        self._rng = rng
+        self.latency = LatencyTracker()
+        self.stats = RetryStats()
+
+    async def send(self, send: Send, *, hedge: bool | None = None) -> httpx.Response:
+        policy = self._policy
+        use_hedge = policy.hedge if hedge is None else hedge
+        deadline = time.monotonic() + policy.deadline
+        self.stats.requests += 1
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                async with asyncio.timeout(remaining):
+                    if use_hedge:
+                        response = await self._hedged(send)
+                    else:
+                        response = await self._attempt(send)
+            except TimeoutError:
+                self.stats.deadline_exceeded += 1
+                raise httpx.TimeoutException(
+                    f"Request exceeded its {policy.deadline:.1f}s retry budget"
+                ) from None
+            except httpx.TransportError as exc:
+                delay = self._retry_delay(attempt, None, deadline)
+                if delay is None:
+                    raise
+                logger.info("Transient HTTP error (%s); retrying in %.2fs", exc, delay)
+            else:
+                if not self._is_retryable(response):
+                    return response
+                delay = self._retry_delay(attempt, response, deadline)
+                if delay is None:
+                    return response
+                logger.info("HTTP %d from upstream; retrying in %.2fs", response.status_code, delay)
+            self.stats.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def _is_retryable(self, response: httpx.Response) -> bool:
+        if response.status_code == 429:
+            return self._rate_limiter is None
+        return response.status_code in RETRYABLE_STATUSES
+
+    def _retry_delay(
+        self, attempt: int, response: httpx.Response | None, deadline: float
+    ) -> float | None:
+        if attempt + 1 >= self._policy.max_attempts:
+            return None
+        delay = self._policy.backoff(attempt, self._rng)
+        if response is not None:
+            retry_after = retry_after_seconds(response.headers)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+        if time.monotonic() + delay >= deadline:
+            return None
+        return delay
+
+    async def _attempt(self, send: Send) -> httpx.Response:
+        started = time.monotonic()
+        response = await send_rate_limited(
+            send, self._rate_limiter, max_retries=self._rate_limit_retries
+        )
+        self.latency.record(time.monotonic() - started)
+        return response
+
+    async def _hedged(self, send: Send) -> httpx.Response:
+        hedge_after = self.latency.p95() or self._policy.hedge_delay
+        primary = asyncio.ensure_future(self._attempt(send))
+        pending: set[asyncio.Future[httpx.Response]] = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=hedge_after)
+            if done:
+                return primary.result()
+            self.stats.hedges += 1
+            pending.add(asyncio.ensure_future(self._attempt(send)))
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                succeeded = [task for task in done if task.exception() is None]
+                if succeeded:
+                    winner = primary if primary in succeeded else succeeded[0]
+                    if winner is not primary:
+                        self.stats.hedge_wins += 1
+                    return winner.result()
+                if not pending:
+                    # Both requests failed; surface the error.
+                    return done.pop().result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
@@ -1,23 +1,53 @@
 from __future__ import annotations
 
-from collections.abc import Callable
 from typing import Any
 
-import httpx
 from pydantic import HttpUrl
 
+from azure_ai_foundry_demo.clients.http import AsyncClientFactory, SharedHttpClient
+from azure_ai_foundry_demo.clients.retry import ResilientSender, RetryPolicy, RetryStats
 from azure_ai_foundry_demo.config import Settings
-from azure_ai_foundry_demo.models import NewsHeadline
-
-AsyncClientFactory = Callable[[], httpx.AsyncClient]
+from azure_ai_foundry_demo.json_codec import response_json
+from azure_ai_foundry_demo.models import Headline
+from azure_ai_foundry_demo.rate_limit import RateLimiter
 
 
 class SerperClient:
     def __init__(
-        self, settings: Settings, client_factory: AsyncClientFactory | None = None
+        self,
+        settings: Settings,
+        client_factory: AsyncClientFactory | None = None,
+        *,
+        http_client: SharedHttpClient | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
     ) -> None:
         self._settings = settings
-        self._client_factory = client_factory or (lambda: httpx.AsyncClient(timeout=10.0))
+        self._owns_http_client = http_client is None
+        self._http_client = http_client or SharedHttpClient(settings, client_factory)
+        # Serper bills every request, so hedged duplicates are opt-in (SERPER_HEDGE_ENABLED).
+        policy = retry_policy or RetryPolicy.from_settings(
+            settings, hedge=settings.serper_hedge_enabled
+        )
+        self._sender = ResilientSender(
+            policy,
+            rate_limiter,
+            rate_limit_retries=settings.rate_limit_max_retries,
+        )
+
+    @property
+    def retry_stats(self) -> RetryStats:
+        return self._sender.stats
+
+    async def aclose(self) -> None:
+        if self._owns_http_client:
+            await self._http_client.aclose()
+
+    async def __aenter__(self) -> SerperClient:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
 
     async def fetch_news(
         self,
@@ -27,7 +57,7 @@ class SerperClient:
         language: str = "en",
         timeframe: str | None = "7d",
         num_results: int | None = None,
-    ) -> list[NewsHeadline]:
+    ) -> list[Headline]:
         params: dict[str, Any] = {"q": query, "gl": location, "hl": language}
         if timeframe:
             params["timeframe"] = timeframe
@@ -43,45 +73,47 @@ class SerperClient:
         return [result for result in results if isinstance(result, dict)]
 
     async def _post(self, url: HttpUrl, payload: dict[str, Any]) -> dict[str, Any]:
-        async with self._client_factory() as client:
-            response = await client.post(
+        response = await self._sender.send(
+            lambda: self._http_client.client.post(
                 str(url),
                 json=payload,
                 headers=self._settings.serper_headers(),
             )
-            response.raise_for_status()
-            data = response.json()
+        )
+        response.raise_for_status()
+        data = response_json(response)
         if not isinstance(data, dict):
             raise ValueError("Unexpected response from Serper.dev; expected a JSON object")
         return data
 
     async def _get(self, url: HttpUrl, params: dict[str, Any]) -> dict[str, Any]:
-        async with self._client_factory() as client:
-            response = await client.get(
+        response = await self._sender.send(
+            lambda: self._http_client.client.get(
                 str(url),
                 params=params,
                 headers=self._settings.serper_headers(),
             )
-            response.raise_for_status()
-            data = response.json()
+        )
+        response.raise_for_status()
+        data = response_json(response)
         if not isinstance(data, dict):
             raise ValueError("Unexpected response from Serper.dev; expected a JSON object")
         return data
 
-    def _extract_news(self, data: dict[str, Any]) -> list[NewsHeadline]:
+    def _extract_news(self, data: dict[str, Any]) -> list[Headline]:
         news_items = data.get("news", []) if isinstance(data, dict) else []
-        results: list[NewsHeadline] = []
+        if not isinstance(news_items, list):
+            return []
+        # No URL validation here; that happens once the headlines reach the research payload.
+        results: list[Headline] = []
         for item in news_items:
-            if not isinstance(item, dict):
+            if not isinstance(item, dict) or not item.get("link"):
                 continue
-            try:
-                results.append(
-                    NewsHeadline(
-                        title=item.get("title", ""),
-                        link=item["link"],
-                        snippet=item.get("snippet"),
-                    )
+            results.append(
+                Headline(
+                    title=item.get("title", ""),
+                    link=item["link"],
+                    snippet=item.get("snippet"),
                 )
-            except (KeyError, TypeError, ValueError):
-                continue
+            )
         return results
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from pydantic import HttpUrl
+
+from azure_ai_foundry_demo import json_codec
+from azure_ai_foundry_demo.cache import CacheBackend, CacheStats, Clock
+from azure_ai_foundry_demo.clients.http import AsyncClientFactory, SharedHttpClient
+from azure_ai_foundry_demo.clients.retry import RetryPolicy
+from azure_ai_foundry_demo.clients.serper import SerperClient
+from azure_ai_foundry_demo.config import Settings
+from azure_ai_foundry_demo.rate_limit import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+_KEYED_PARAMS = ("gl", "hl", "timeframe", "num")
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(sorted(query.casefold().split()))
+
+
+def cache_key(url: HttpUrl | str, params: dict[str, Any]) -> str:
+    normalized = {"q": normalize_query(str(params.get("q", "")))}
+    for name in _KEYED_PARAMS:
+        if params.get(name) is not None:
+            normalized[name] = str(params[name]).casefold()
+    return f"serper:{url}:{json.dumps(normalized, sort_keys=True)}"
+
+
+class CachedSerperClient(SerperClient):
+    # Entries are fresh for ``ttl`` seconds and may then be served for ``stale_ttl`` more seconds
+    # while a background refresh runs. Concurrent identical lookups share one upstream request.
+    def __init__(
+        self,
+        settings: Settings,
+        cache: CacheBackend,
+        client_factory: AsyncClientFactory | None = None,
+        *,
+        http_client: SharedHttpClient | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        ttl: float = 900.0,
+        stale_ttl: float = 3600.0,
+        clock: Clock = time.time,
+    ) -> None:
+        super().__init__(
+            settings,
+            client_factory,
+            http_client=http_client,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+        )
+        if ttl <= 0 or stale_ttl < 0:
+            raise ValueError("ttl must be positive and stale_ttl must not be negative")
+        self._cache = cache
+        self._ttl = ttl
+        self._stale_ttl = stale_ttl
+        self._clock = clock
+        self._in_flight: dict[str, asyncio.Task[dict[str, Any]]] = {}
+        self._refreshes: set[asyncio.Task[dict[str, Any]]] = set()
+        self.stale_hits = 0
+        self.shared_requests = 0
+
+    @property
+    def cache_stats(self) -> CacheStats:
+        return self._cache.stats
+
+    async def _get(self, url: HttpUrl, params: dict[str, Any]) -> dict[str, Any]:
+        fetch = super()._get
+        return await self._cached(cache_key(url, params), lambda: fetch(url, params))
+
+    async def _post(self, url: HttpUrl, payload: dict[str, Any]) -> dict[str, Any]:
+        fetch = super()._post
+        return await self._cached(cache_key(url, payload), lambda: fetch(url, payload))
+
+    async def _cached(
+        self, key: str, fetch: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> dict[str, Any]:
+        cached = self._cache.get(key)
+        if cached is not None:
+            entry = json_codec.loads(cached)
+            if entry["fresh_until"] <= self._clock():
+                self.stale_hits += 1
+                refresh, created = self._single_flight(key, fetch)
+                # Only the reader that started the refresh tracks it, so a failure logs once.
+                if created:
+                    self._refreshes.add(refresh)
+                    refresh.add_done_callback(self._finish_refresh)
+            return entry["data"]
+        task, _ = self._single_flight(key, fetch)
+        return await asyncio.shield(task)
+
+    def _single_flight(
+        self, key: str, fetch: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> tuple[asyncio.Task[dict[str, Any]], bool]:
+        # Returns the upstream task for ``key`` and whether this call started it.
+        task = self._in_flight.get(key)
+        if task is not None and not task.done():
+            self.shared_requests += 1
+            return task, False
+        task = asyncio.ensure_future(self._fetch_and_store(key, fetch))
+        self._in_flight[key] = task
+        task.add_done_callback(lambda finished: self._forget(key, finished))
+        return task, True
+
+    def _forget(self, key: str, task: asyncio.Task[dict[str, Any]]) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+    async def _fetch_and_store(
+        self, key: str, fetch: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> dict[str, Any]:
+        data = await fetch()
+        now = self._clock()
+        entry = {"fresh_until": now + self._ttl, "data": data}
+        self._cache.set(key, json_codec.dumps(entry), now + self._ttl + self._stale_ttl)
+        return data
+
+    def _finish_refresh(self, task: asyncio.Task[dict[str, Any]]) -> None:
+        self._refreshes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Background Serper refresh failed", exc_info=task.exception())
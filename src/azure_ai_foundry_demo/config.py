@@ -6,6 +6,9 @@ from dotenv import load_dotenv
 from pydantic import Field, HttpUrl, SecretStr, field_validator
 from pydantic_settings import BaseSettings
 
+from azure_ai_foundry_demo.cache import CacheBackendName
+from azure_ai_foundry_demo.warehouse import WarehouseMode
+
 load_dotenv()
 
 
@@ -23,6 +26,70 @@ class Settings(BaseSettings):
     )
     polygon_api_key: SecretStr = Field(alias="POLYGON_API_KEY")
     polygon_base_url: HttpUrl = Field(default="https://api.polygon.io", alias="POLYGON_BASE_URL")
+    http_timeout: float = Field(default=10.0, alias="HTTP_TIMEOUT", gt=0)
+    http_connect_timeout: float = Field(default=3.0, alias="HTTP_CONNECT_TIMEOUT", gt=0)
+    http_max_connections: int = Field(default=20, alias="HTTP_MAX_CONNECTIONS", ge=1)
+    http_max_keepalive_connections: int = Field(
+        default=10, alias="HTTP_MAX_KEEPALIVE_CONNECTIONS", ge=0
+    )
+    http_keepalive_expiry: float = Field(default=30.0, alias="HTTP_KEEPALIVE_EXPIRY", ge=0)
+    http2_enabled: bool = Field(default=True, alias="HTTP2_ENABLED")
+    http_retry_attempts: int = Field(default=3, alias="HTTP_RETRY_ATTEMPTS", ge=1)
+    http_retry_backoff: float = Field(default=0.2, alias="HTTP_RETRY_BACKOFF", ge=0)
+    http_retry_max_backoff: float = Field(default=2.0, alias="HTTP_RETRY_MAX_BACKOFF", ge=0)
+    http_retry_deadline: float = Field(default=20.0, alias="HTTP_RETRY_DEADLINE", gt=0)
+    # Hedging covers Polygon's idempotent GETs. Every Serper request is billed, so a hedged
+    # Serper query can cost twice and needs its own opt-in.
+    http_hedge_enabled: bool = Field(default=False, alias="HTTP_HEDGE_ENABLED")
+    serper_hedge_enabled: bool = Field(default=False, alias="SERPER_HEDGE_ENABLED")
+    http_hedge_delay: float = Field(default=1.0, alias="HTTP_HEDGE_DELAY", gt=0)
+    polygon_cache_backend: CacheBackendName = Field(default="memory", alias="POLYGON_CACHE_BACKEND")
+    polygon_cache_path: str = Field(
+        default=".cache/polygon-cache.sqlite3", alias="POLYGON_CACHE_PATH"
+    )
+    polygon_cache_max_entries: int = Field(default=1024, alias="POLYGON_CACHE_MAX_ENTRIES", ge=1)
+    polygon_cache_max_bytes: int = Field(
+        default=16 * 1024 * 1024, alias="POLYGON_CACHE_MAX_BYTES", ge=1
+    )
+    # Settled history ranges are kept this long (seconds) before being refetched in full.
+    polygon_history_ttl: float = Field(default=7 * 86400.0, alias="POLYGON_HISTORY_TTL", gt=0)
+    polygon_page_size: int = Field(default=5000, alias="POLYGON_PAGE_SIZE", ge=1, le=50000)
+    # "ingest" keeps downloaded bars on disk; "warehouse-first" also answers overviews from it.
+    bar_warehouse_mode: WarehouseMode = Field(default="off", alias="BAR_WAREHOUSE_MODE")
+    bar_warehouse_path: str = Field(default=".cache/bars.sqlite3", alias="BAR_WAREHOUSE_PATH")
+    bar_warehouse_mmap_bytes: int = Field(
+        default=256 * 1024 * 1024, alias="BAR_WAREHOUSE_MMAP_BYTES", ge=0
+    )
+
+    serper_cache_backend: CacheBackendName = Field(default="memory", alias="SERPER_CACHE_BACKEND")
+    serper_cache_path: str = Field(default=".cache/serper-cache.sqlite3", alias="SERPER_CACHE_PATH")
+    serper_cache_ttl: float = Field(default=900.0, alias="SERPER_CACHE_TTL", gt=0)
+    serper_cache_stale_ttl: float = Field(default=3600.0, alias="SERPER_CACHE_STALE_TTL", ge=0)
+    serper_cache_max_entries: int = Field(default=2048, alias="SERPER_CACHE_MAX_ENTRIES", ge=1)
+    serper_cache_max_bytes: int = Field(
+        default=32 * 1024 * 1024, alias="SERPER_CACHE_MAX_BYTES", ge=1
+    )
+    polygon_rate_limit: float = Field(default=20.0, alias="POLYGON_RATE_LIMIT", ge=0)
+    polygon_max_in_flight: int = Field(default=10, alias="POLYGON_MAX_IN_FLIGHT", ge=1)
+    serper_rate_limit: float = Field(default=10.0, alias="SERPER_RATE_LIMIT", ge=0)
+    serper_max_in_flight: int = Field(default=5, alias="SERPER_MAX_IN_FLIGHT", ge=1)
+    azure_agents_rate_limit: float = Field(default=20.0, alias="AZURE_AGENTS_RATE_LIMIT", ge=0)
+    azure_agents_max_in_flight: int = Field(default=16, alias="AZURE_AGENTS_MAX_IN_FLIGHT", ge=1)
+    rate_limit_max_retries: int = Field(default=3, alias="RATE_LIMIT_MAX_RETRIES", ge=0)
+
+    batch_concurrency: int = Field(default=4, alias="BATCH_CONCURRENCY", ge=1)
+    batch_ticker_timeout: float = Field(default=300.0, alias="BATCH_TICKER_TIMEOUT", gt=0)
+    # Input tokens the analysis prompt may use; older conversation turns are condensed first.
+    prompt_token_budget: int = Field(default=6000, alias="PROMPT_TOKEN_BUDGET", ge=512)
+    # Follow-up chats keep this many recent turns verbatim (each clipped to the token cap);
+    # older turns are folded into a short running digest.
+    conversation_window_turns: int = Field(default=6, alias="CONVERSATION_WINDOW_TURNS", ge=1)
+    conversation_turn_tokens: int = Field(default=400, alias="CONVERSATION_TURN_TOKENS", ge=16)
+    # Follow-ups the local intent classifier is at least this sure about skip the router agent.
+    router_fast_path: bool = Field(default=True, alias="ROUTER_FAST_PATH")
+    router_fast_path_confidence: float = Field(
+        default=0.85, alias="ROUTER_FAST_PATH_CONFIDENCE", ge=0.5, le=1.0
+    )
 
     model_config = {
         "env_file": ".env",
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import httpx
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without the optional accelerator
+    orjson = None
+
+# orjson parses straight from the response bytes into Python objects several times faster than
+# the stdlib decoder; without it everything falls back to ``json`` with identical results.
+FAST_JSON = orjson is not None
+
+
+def loads(data: bytes | bytearray | memoryview | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def response_json(response: httpx.Response) -> Any:
+    # Decodes the raw body without building the intermediate ``str`` that ``Response.json`` does.
+    return loads(response.content)
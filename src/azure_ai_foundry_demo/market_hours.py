@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+EXCHANGE_TZ = ZoneInfo("America/New_York")
+SESSION_OPEN = time(9, 30)
+SESSION_CLOSE = time(16, 0)
+
+
+def day_start_ms(day: date) -> int:
+    # Epoch milliseconds at exchange-local midnight; Polygon stamps daily bars at this instant.
+    return int(datetime.combine(day, time(), tzinfo=EXCHANGE_TZ).timestamp() * 1000)
+
+
+class MarketCalendar:
+    # Regular-hours US equity sessions. Exchange holidays are not modelled unless supplied, so a
+    # holiday only causes an extra upstream refresh, never stale data.
+    def __init__(self, holidays: Iterable[date] = ()) -> None:
+        self._holidays = frozenset(holidays)
+
+    def is_trading_day(self, day: date) -> bool:
+        return day.weekday() < 5 and day not in self._holidays
+
+    def next_open(self, now: datetime) -> datetime:
+        return self._next_boundary(now, SESSION_OPEN)
+
+    def next_close(self, now: datetime) -> datetime:
+        return self._next_boundary(now, SESSION_CLOSE)
+
+    def last_closed_session(self, now: datetime) -> date:
+        # Today once the regular session has closed, otherwise the trading day before.
+        local = now.astimezone(EXCHANGE_TZ)
+        day = local.date()
+        if self.is_trading_day(day) and local.time() >= SESSION_CLOSE:
+            return day
+        return self.previous_trading_day(day)
+
+    def previous_trading_day(self, day: date) -> date:
+        candidate = day - timedelta(days=1)
+        while not self.is_trading_day(candidate):
+            candidate -= timedelta(days=1)
+        return candidate
+
+    def _next_boundary(self, now: datetime, boundary: time) -> datetime:
+        local = now.astimezone(EXCHANGE_TZ)
+        day = local.date()
+        if not self.is_trading_day(day) or local.time() >= boundary:
+            day = self._next_trading_day(day)
+        return datetime.combine(day, boundary, tzinfo=EXCHANGE_TZ)
+
+    def _next_trading_day(self, day: date) -> date:
+        candidate = day + timedelta(days=1)
+        while not self.is_trading_day(candidate):
+            candidate += timedelta(days=1)
+        return candidate
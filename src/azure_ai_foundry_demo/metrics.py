@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from azure_ai_foundry_demo.models import TrendMetrics
+
+FloatArray = NDArray[np.float64]
+
+TRADING_DAYS_PER_YEAR = 252
+# Bars per year for annualizing volatility, by bar size. Intraday counts assume regular-hours
+# bars (390 minutes, 6.5 hours a session).
+BARS_PER_YEAR = {
+    "minute": TRADING_DAYS_PER_YEAR * 390,
+    "hour": TRADING_DAYS_PER_YEAR * 6.5,
+    "day": TRADING_DAYS_PER_YEAR,
+    "week": 52,
+    "month": 12,
+}
+# Largest decay**-j weight in a block of the closed-form Wilder average; keeps it in float range.
+_WILDER_BLOCK_GROWTH = 1e8
+
+
+@dataclass(frozen=True)
+class MetricsConfig:
+    volatility_window: int = 20
+    atr_period: int = 14
+    rsi_period: int = 14
+    volume_window: int = 20
+    moving_average_windows: tuple[int, ...] = (5, 20, 50)
+
+    def __post_init__(self) -> None:
+        windows = (
+            self.volatility_window,
+            self.atr_period,
+            self.rsi_period,
+            self.volume_window,
+            *self.moving_average_windows,
+        )
+        if min(windows) < 1:
+            raise ValueError("Metric windows must be at least one bar")
+
+
+DEFAULT_METRICS_CONFIG = MetricsConfig()
+
+
+@dataclass
+class MetricsResult:
+    # Every series is shaped (tickers, bars) and aligned with the input columns; NaN marks bars
+    # where a metric is undefined. Trailing-window metrics use whatever history is available
+    # when a series is shorter than the window, so a 7-bar lookback still yields values.
+    open: FloatArray
+    high: FloatArray
+    low: FloatArray
+    close: FloatArray
+    volume: FloatArray
+    returns: FloatArray
+    volatility: FloatArray
+    vwap: FloatArray
+    atr: FloatArray
+    rsi: FloatArray
+    drawdown: FloatArray
+    volume_zscore: FloatArray
+    moving_averages: dict[int, FloatArray] = field(default_factory=dict)
+
+    @property
+    def max_drawdown(self) -> FloatArray:
+        return _nan_reduce(np.nanmin, self.drawdown)
+
+    def summary(self, row: int = 0) -> TrendMetrics | None:
+        close = self.close[row]
+        valid_close = close[~np.isnan(close)]
+        period_days = int(np.count_nonzero(~np.isnan(close) | ~np.isnan(self.volume[row])))
+        if not period_days:
+            return None
+        absolute_change = None
+        percent_change = None
+        if valid_close.size >= 2:
+            start, end = float(valid_close[0]), float(valid_close[-1])
+            absolute_change = end - start
+            if start != 0:
+                percent_change = absolute_change / start * 100
+        high = _optional(_nan_reduce(np.nanmax, self.high[row]))
+        low = _optional(_nan_reduce(np.nanmin, self.low[row]))
+        if high is None and valid_close.size:
+            high = float(valid_close.max())
+        if low is None and valid_close.size:
+            low = float(valid_close.min())
+        return TrendMetrics(
+            period_days=period_days,
+            absolute_change=absolute_change,
+            percent_change=percent_change,
+            average_volume=_optional(_nan_reduce(np.nanmean, self.volume[row])),
+            high=high,
+            low=low,
+            volatility=_last(self.volatility[row]),
+            vwap=_last(self.vwap[row]),
+            atr=_last(self.atr[row]),
+            rsi=_last(self.rsi[row]),
+            max_drawdown=_optional(self.max_drawdown[row]),
+            volume_zscore=_last(self.volume_zscore[row]),
+            moving_averages={
+                f"sma_{window}": value
+                for window, series in self.moving_averages.items()
+                if (value := _last(series[row])) is not None
+            },
+        )
+
+
+def compute_metrics(
+    open: ArrayLike,
+    high: ArrayLike,
+    low: ArrayLike,
+    close: ArrayLike,
+    volume: ArrayLike,
+    *,
+    config: MetricsConfig = DEFAULT_METRICS_CONFIG,
+    timespan: str = "day",
+) -> MetricsResult:
+    # Accepts one series (bars,) or a batch (tickers, bars); missing values are NaN.
+    # ``timespan`` is the bar size, used to annualize volatility.
+    if timespan not in BARS_PER_YEAR:
+        raise ValueError(f"timespan must be one of {', '.join(BARS_PER_YEAR)}")
+    opens, highs, lows, closes, volumes = (
+        _as_matrix(values) for values in (open, high, low, close, volume)
+    )
+    if not opens.shape == highs.shape == lows.shape == closes.shape == volumes.shape:
+        raise ValueError("OHLCV columns must share one shape")
+
+    previous_close = _shift(closes)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = closes / previous_close - 1.0
+    volatility = np.sqrt(
+        _rolling_var(returns, config.volatility_window, min_periods=2) * BARS_PER_YEAR[timespan]
+    )
+
+    typical = (highs + lows + closes) / 3.0
+    traded = np.where(np.isnan(typical) | np.isnan(volumes), 0.0, typical * volumes)
+    weights = np.where(np.isnan(typical), 0.0, np.nan_to_num(volumes))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vwap = np.cumsum(traded, axis=1) / np.cumsum(weights, axis=1)
+    vwap[~np.isfinite(vwap)] = np.nan
+
+    true_range = np.fmax(
+        highs - lows,
+        np.fmax(np.abs(highs - previous_close), np.abs(lows - previous_close)),
+    )
+    atr = _rolling_mean(true_range, config.atr_period, min_periods=1)
+
+    # Wilder's RSI: gains and losses are smoothed with his running average, not a rolling mean.
+    change = closes - previous_close
+    moves = np.vstack((np.maximum(change, 0.0), np.maximum(-change, 0.0)))
+    gains, losses = np.split(_wilder_mean(moves, config.rsi_period), 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100.0 - 100.0 / (1.0 + gains / losses)
+    rsi = np.where((losses == 0) & (gains > 0), 100.0, rsi)
+    rsi = np.where((losses == 0) & (gains == 0), 50.0, rsi)
+
+    running_peak = np.fmax.accumulate(closes, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = closes / running_peak - 1.0
+
+    # Z-score of each bar's volume against the preceding window.
+    prior_volume = _shift(volumes)
+    volume_mean = _rolling_mean(prior_volume, config.volume_window, min_periods=2)
+    volume_std = np.sqrt(_rolling_var(prior_volume, config.volume_window, min_periods=2))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        volume_zscore = (volumes - volume_mean) / volume_std
+    volume_zscore[~np.isfinite(volume_zscore)] = np.nan
+
+    moving_averages = {
+        window: _rolling_mean(closes, window, min_periods=window)
+        for window in config.moving_average_windows
+    }
+    return MetricsResult(
+        open=opens,
+        high=highs,
+        low=lows,
+        close=closes,
+        volume=volumes,
+        returns=returns,
+        volatility=volatility,
+        vwap=vwap,
+        atr=atr,
+        rsi=rsi,
+        drawdown=drawdown,
+        volume_zscore=volume_zscore,
+        moving_averages=moving_averages,
+    )
+
+
+def _as_matrix(values: ArrayLike) -> FloatArray:
+    array = np.asarray(values, dtype=np.float64)
+    if array.ndim == 1:
+        return array[np.newaxis, :]
+    if array.ndim != 2:
+        raise ValueError("OHLCV columns must be one- or two-dimensional")
+    return array
+
+
+def _shift(values: FloatArray) -> FloatArray:
+    shifted = np.empty_like(values)
+    shifted[:, 0] = np.nan
+    shifted[:, 1:] = values[:, :-1]
+    return shifted
+
+
+def _trailing_sum(values: FloatArray, window: int) -> FloatArray:
+    # Prefix sums give every trailing-window sum in O(bars) regardless of the window length.
+    sums = np.cumsum(values, axis=1)
+    sums[:, window:] -= sums[:, :-window].copy()
+    return sums
+
+
+def _window_counts(missing: NDArray[np.bool_], window: int) -> FloatArray:
+    if not missing.any():
+        # Dense input: the count only depends on the bar position, so one row broadcasts.
+        return np.minimum(np.arange(1, missing.shape[1] + 1), window).astype(np.float64)
+    return _trailing_sum((~missing).astype(np.float64), window)
+
+
+def _rolling_mean(values: FloatArray, window: int, *, min_periods: int = 1) -> FloatArray:
+    missing = np.isnan(values)
+    counts = _window_counts(missing, window)
+    sums = _trailing_sum(np.where(missing, 0.0, values), window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = sums / counts
+    return np.where(counts >= min_periods, means, np.nan)
+
+
+def _wilder_mean(values: FloatArray, period: int) -> FloatArray:
+    # Wilder's running average over each row's non-NaN values: the mean of the values so far
+    # for the first ``period`` of them (so short series still get a value), then
+    # avg += (value - avg) / period. NaN bars carry the previous average forward.
+    missing = np.isnan(values)
+    dense = np.where(missing, 0.0, values)
+    if missing.any():
+        # Pack each row's values to the left so every row starts its recursion at column 0.
+        dense = np.take_along_axis(dense, np.argsort(missing, axis=1, kind="stable"), axis=1)
+    bars = dense.shape[1]
+    smoothed = np.empty_like(dense)
+    seed = min(period, bars)
+    smoothed[:, :seed] = np.cumsum(dense[:, :seed], axis=1) / np.arange(1, seed + 1)
+    decay = 1.0 - 1.0 / period
+    if decay == 0:
+        smoothed[:, seed:] = dense[:, seed:]
+    else:
+        # avg[s + j] = decay**(j + 1) * avg[s - 1] + sum(decay**(j - i) * value[s + i]) / period,
+        # evaluated a block at a time so decay**-j cannot overflow.
+        block = max(1, int(math.log(_WILDER_BLOCK_GROWTH) / -math.log(decay)))
+        for start in range(seed, bars, block):
+            stop = min(start + block, bars)
+            powers = decay ** np.arange(1, stop - start + 1)
+            carried = smoothed[:, start - 1 : start] * powers
+            added = np.cumsum(dense[:, start:stop] / powers, axis=1) * powers / period
+            smoothed[:, start:stop] = carried + added
+    counts = np.cumsum(~missing, axis=1)
+    averages = np.take_along_axis(smoothed, np.maximum(counts - 1, 0), axis=1)
+    return np.where(counts > 0, averages, np.nan)
+
+
+def _rolling_var(values: FloatArray, window: int, *, min_periods: int = 2) -> FloatArray:
+    # Sample variance; values are centred per row first to limit cancellation in the squares.
+    centre = _nan_reduce(np.nanmean, values)
+    centred = values - np.where(np.isnan(centre), 0.0, centre)[:, np.newaxis]
+    missing = np.isnan(centred)
+    filled = np.where(missing, 0.0, centred)
+    counts = _window_counts(missing, window)
+    sums = _trailing_sum(filled, window)
+    squares = _trailing_sum(filled * filled, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance = (squares - sums * sums / counts) / (counts - 1)
+    variance = np.maximum(variance, 0.0)
+    return np.where(counts >= max(min_periods, 2), variance, np.nan)
+
+
+def _nan_reduce(reducer, values: FloatArray) -> FloatArray:
+    # nan-reductions warn on all-NaN rows; those rows simply yield NaN here.
+    if values.ndim == 1:
+        values = values[np.newaxis, :]
+    result = np.full(values.shape[0], np.nan)
+    populated = ~np.all(np.isnan(values), axis=1)
+    if populated.any():
+        result[populated] = reducer(values[populated], axis=1)
+    return result
+
+
+def _optional(value: float | np.floating) -> float | None:
+    value = float(np.asarray(value).reshape(-1)[0])
+    return None if math.isnan(value) else value
+
+
+def _last(series: FloatArray) -> float | None:
+    return _optional(series[-1]) if series.size else None
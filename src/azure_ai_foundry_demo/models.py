@@ -1,6 +1,20 @@
 from __future__ import annotations
 
-from pydantic import BaseModel, ConfigDict, Field, HttpUrl, field_validator
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    HttpUrl,
+    TypeAdapter,
+    ValidationError,
+    field_validator,
+)
+
+from azure_ai_foundry_demo.bars import BarSeries
 
 
 class StockQuote(BaseModel):
@@ -28,13 +42,35 @@ class NewsHeadline(BaseModel):
     snippet: str | None = None
 
 
-class HistoricalBar(BaseModel):
-    date: str
-    open: float | None = None
-    high: float | None = None
-    low: float | None = None
-    close: float | None = None
-    volume: float | None = None
+@dataclass(slots=True)
+class Headline:
+    # Unvalidated headline used between the Serper client and the tool output; converted to
+    # ``NewsHeadline`` (URL validation included) only when it reaches the payload.
+    title: str
+    link: str
+    snippet: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"title": self.title, "link": self.link, "snippet": self.snippet}
+
+
+_HEADLINES_ADAPTER = TypeAdapter(list[NewsHeadline])
+
+
+def validate_headlines(items: Iterable[Mapping[str, Any]]) -> list[NewsHeadline]:
+    items = list(items)
+    try:
+        # One validation call for the whole list; extra fields are ignored.
+        return _HEADLINES_ADAPTER.validate_python(items)
+    except ValidationError:
+        pass
+    headlines: list[NewsHeadline] = []
+    for item in items:
+        try:
+            headlines.append(NewsHeadline.model_validate(item))
+        except ValidationError:
+            continue
+    return headlines
 
 
 class TrendMetrics(BaseModel):
@@ -44,6 +80,13 @@ class TrendMetrics(BaseModel):
     average_volume: float | None = None
     high: float | None = None
     low: float | None = None
+    volatility: float | None = None
+    vwap: float | None = None
+    atr: float | None = None
+    rsi: float | None = None
+    max_drawdown: float | None = None
+    volume_zscore: float | None = None
+    moving_averages: dict[str, float] = Field(default_factory=dict)
 
 
 class FinanceResearchPayload(BaseModel):
@@ -52,5 +95,5 @@ class FinanceResearchPayload(BaseModel):
     quote: StockQuote
     news: list[NewsHeadline] = Field(default_factory=list)
     organic_results: list[dict[str, object]] = Field(default_factory=list)
-    historical: list[HistoricalBar] = Field(default_factory=list)
+    historical: BarSeries = Field(default_factory=BarSeries.empty)
     metrics: TrendMetrics | None = None
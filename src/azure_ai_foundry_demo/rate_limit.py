@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterator, Mapping
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+from azure.core.pipeline import PipelineRequest, PipelineResponse
+from azure.core.pipeline.policies import HTTPPolicy
+
+logger = logging.getLogger(__name__)
+
+Clock = Callable[[], float]
+
+# Used when a 429 arrives without a usable Retry-After header.
+DEFAULT_RETRY_AFTER = 1.0
+
+
+@dataclass
+class RateLimitStats:
+    acquired: int = 0
+    throttled: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    in_flight: int = 0
+    wait_seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return asdict(self)
+
+
+class RateLimiter:
+    # Token bucket (``rate`` requests per second, ``burst`` tokens) combined with a cap on
+    # concurrent requests. Tokens are reserved under a lock, so sync and async callers share the
+    # same budget; the in-flight cap is tracked separately for threads and for the event loop.
+    # ``rate=0`` disables the token bucket and keeps only the in-flight cap.
+    def __init__(
+        self,
+        name: str,
+        *,
+        rate: float,
+        max_in_flight: int,
+        burst: int | None = None,
+        clock: Clock = time.monotonic,
+    ) -> None:
+        if rate < 0 or max_in_flight < 1:
+            raise ValueError("rate must be >= 0 and max_in_flight >= 1")
+        self.name = name
+        self._rate = rate
+        self._burst = float(burst if burst is not None else max(1, round(rate)))
+        self._max_in_flight = max_in_flight
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = self._burst
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._thread_slots = threading.BoundedSemaphore(max_in_flight)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_slots: asyncio.Semaphore | None = None
+        self.stats = RateLimitStats()
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        started = self._enqueue()
+        queued = True
+        try:
+            async with self._async_slots():
+                delay = self._reserve()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self._start(started)
+                queued = False
+                try:
+                    yield
+                finally:
+                    self._finish()
+        finally:
+            if queued:
+                self._dequeue()
+
+    @contextmanager
+    def acquire_sync(self) -> Iterator[None]:
+        started = self._enqueue()
+        queued = True
+        try:
+            with self._thread_slots:
+                delay = self._reserve()
+                if delay > 0:
+                    time.sleep(delay)
+                self._start(started)
+                queued = False
+                try:
+                    yield
+                finally:
+                    self._finish()
+        finally:
+            if queued:
+                self._dequeue()
+
+    def defer(self, seconds: float) -> None:
+        # Called on a 429: nobody gets a token until the provider's Retry-After has elapsed.
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, self._clock() + max(seconds, 0.0))
+            self.stats.throttled += 1
+        logger.info("%s throttled upstream; pausing for %.2fs", self.name, seconds)
+
+    def _reserve(self) -> float:
+        with self._lock:
+            now = self._clock()
+            delay = max(0.0, self._blocked_until - now)
+            if self._rate:
+                elapsed = now - self._updated
+                self._tokens = min(self._burst, self._tokens + elapsed * self._rate)
+                self._updated = now
+                self._tokens -= 1
+                if self._tokens < 0:
+                    delay = max(delay, -self._tokens / self._rate)
+            return delay
+
+    def _async_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._loop_slots is None or self._loop is not loop:
+                self._loop = loop
+                self._loop_slots = asyncio.Semaphore(self._max_in_flight)
+            return self._loop_slots
+
+    def _enqueue(self) -> float:
+        with self._lock:
+            self.stats.queue_depth += 1
+            self.stats.max_queue_depth = max(self.stats.max_queue_depth, self.stats.queue_depth)
+            return self._clock()
+
+    def _dequeue(self) -> None:
+        with self._lock:
+            self.stats.queue_depth -= 1
+
+    def _start(self, started: float) -> None:
+        with self._lock:
+            self.stats.queue_depth -= 1
+            self.stats.acquired += 1
+            self.stats.in_flight += 1
+            self.stats.wait_seconds += self._clock() - started
+
+    def _finish(self) -> None:
+        with self._lock:
+            self.stats.in_flight -= 1
+
+
+class RateLimitPolicy(HTTPPolicy):
+    # azure-core per-retry policy: every attempt made by the SDK's RetryPolicy takes a slot, and
+    # 429 responses pause the shared limiter for the other threads as well.
+    def __init__(self, limiter: RateLimiter) -> None:
+        super().__init__()
+        self._limiter = limiter
+
+    def send(self, request: PipelineRequest) -> PipelineResponse:
+        with self._limiter.acquire_sync():
+            response = self.next.send(request)
+        if response.http_response.status_code == 429:
+            retry_after = retry_after_seconds(response.http_response.headers)
+            self._limiter.defer(retry_after if retry_after is not None else DEFAULT_RETRY_AFTER)
+        return response
+
+
+def retry_after_seconds(headers: Mapping[str, str], *, now: datetime | None = None) -> float | None:
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=UTC)
+    return max((when - (now or datetime.now(UTC))).total_seconds(), 0.0)
@@ -1,20 +1,35 @@
 from __future__ import annotations
 
+import atexit
+from collections.abc import Callable
 from typing import Any
 
 import altair as alt
-import pandas as pd
 import streamlit as st
 
+from azure_ai_foundry_demo.agents.loop_bridge import shutdown_loop_bridge
 from azure_ai_foundry_demo.agents.orchestrator import StockAgentOrchestrator
+from azure_ai_foundry_demo.agents.utils import StreamingNormalizer, sync_await
+from azure_ai_foundry_demo.clients.http import SharedHttpClient
+from azure_ai_foundry_demo.config import get_settings
 from azure_ai_foundry_demo.workflow import AgentResearchReport, StockResearchWorkflow
 
 
 @st.cache_resource(show_spinner=False)
 def get_services() -> dict[str, Any]:
-    orchestrator = StockAgentOrchestrator()
-    workflow = StockResearchWorkflow(orchestrator=orchestrator)
-    return {"orchestrator": orchestrator, "workflow": workflow}
+    settings = get_settings()
+    http_client = SharedHttpClient(settings)
+    orchestrator = StockAgentOrchestrator(settings, http_client=http_client)
+    workflow = StockResearchWorkflow(settings=settings, orchestrator=orchestrator)
+    atexit.register(_release_services, orchestrator, http_client)
+    return {"orchestrator": orchestrator, "workflow": workflow, "http_client": http_client}
+
+
+def _release_services(orchestrator: StockAgentOrchestrator, http_client: SharedHttpClient) -> None:
+    if http_client.is_open:
+        sync_await(http_client.aclose())
+    orchestrator.close()
+    shutdown_loop_bridge()
 
 
 def _init_session_state() -> None:
@@ -24,6 +39,8 @@ def _init_session_state() -> None:
         st.session_state.summary = None
     if "chat_history" not in st.session_state:
         st.session_state.chat_history = []
+    if "memory" not in st.session_state:
+        st.session_state.memory = None
     if "selected_ticker" not in st.session_state:
         st.session_state.selected_ticker = "MSFT"
 
@@ -63,28 +80,13 @@ def _render_report(report: AgentResearchReport) -> None:
             trend[2].metric("Range", " / ".join(range_parts))
     if report.historical:
         st.markdown("### Recent daily performance")
-        ordered_history = sorted(
-            report.historical,
-            key=lambda entry: entry.get("date", ""),
-            reverse=True,
+        history = report.historical.to_frame()
+        st.dataframe(history.iloc[::-1], use_container_width=True, hide_index=True)
+
+        price_frame = history.loc[:, ["date", "open", "close"]].dropna(
+            subset=["open", "close"], how="all"
         )
-        st.dataframe(ordered_history, use_container_width=True)
-
-        chart_rows = [
-            {
-                "date": entry.get("date"),
-                "open": entry.get("open"),
-                "close": entry.get("close"),
-            }
-            for entry in report.historical
-            if entry.get("date") and (
-                entry.get("open") is not None or entry.get("close") is not None
-            )
-        ]
-        if chart_rows:
-            sorted_rows = sorted(chart_rows, key=lambda entry: entry["date"])
-            price_frame = pd.DataFrame(sorted_rows)
-            price_frame["date"] = pd.to_datetime(price_frame["date"])  # type: ignore[assignment]
+        if not price_frame.empty:
             melted = price_frame.melt(
                 id_vars="date",
                 value_vars=["open", "close"],
@@ -121,15 +123,8 @@ def _render_report(report: AgentResearchReport) -> None:
             )
             st.altair_chart(price_chart.interactive(), use_container_width=True)
 
-        volume_rows = [
-            {"date": entry.get("date"), "volume": entry.get("volume")}
-            for entry in report.historical
-            if entry.get("date") and entry.get("volume") is not None
-        ]
-        if volume_rows:
-            sorted_volume = sorted(volume_rows, key=lambda entry: entry["date"])
-            volume_frame = pd.DataFrame(sorted_volume)
-            volume_frame["date"] = pd.to_datetime(volume_frame["date"])  # type: ignore[assignment]
+        volume_frame = history.loc[:, ["date", "volume"]].dropna(subset=["volume"])
+        if not volume_frame.empty:
             volume_chart = (
                 alt.Chart(volume_frame)
                 .mark_bar()
@@ -173,19 +168,29 @@ def _render_chat_interface(orchestrator: StockAgentOrchestrator) -> None:
     if not prompt:
         return
     st.session_state.chat_history.append({"role": "user", "content": prompt})
-    with st.spinner("Thinking..."):
-        try:
-            follow_up = orchestrator.follow_up(
-                ticker=report.ticker,
-                user_message=prompt,
-                summary=st.session_state.summary,
-                conversation_history=st.session_state.chat_history[:-1],
-            )
-        except Exception as exc:  # pragma: no cover
-            st.session_state.chat_history.pop()
-            st.error(f"Chat request failed: {exc}")
-            return
-    reply = follow_up.get("reply", "") or "I'm not sure how to respond."
+    with st.chat_message("user"):
+        st.markdown(prompt)
+    if st.session_state.memory is None:
+        st.session_state.memory = orchestrator.conversation_memory()
+    with st.chat_message("assistant"):
+        placeholder = st.empty()
+        with st.spinner("Thinking..."):
+            try:
+                follow_up = orchestrator.follow_up(
+                    ticker=report.ticker,
+                    user_message=prompt,
+                    summary=st.session_state.summary,
+                    conversation_history=st.session_state.chat_history[:-1],
+                    memory=st.session_state.memory,
+                    on_delta=_streaming_renderer(placeholder),
+                )
+            except Exception as exc:  # pragma: no cover
+                st.session_state.chat_history.pop()
+                placeholder.empty()
+                st.error(f"Chat request failed: {exc}")
+                return
+        reply = follow_up.get("reply", "") or "I'm not sure how to respond."
+        placeholder.markdown(reply)
     st.session_state.chat_history.append({"role": "assistant", "content": reply})
     if follow_up.get("quote"):
         report.quote = follow_up["quote"]
@@ -199,8 +204,18 @@ def _render_chat_interface(orchestrator: StockAgentOrchestrator) -> None:
         report.metrics = follow_up["metrics"]
     st.session_state.report = report
     st.session_state.summary = report.formatted_summary()
-    with st.chat_message("assistant"):
-        st.markdown(reply)
+
+
+def _streaming_renderer(placeholder: Any) -> Callable[[str], None]:
+    # Deltas are shown already normalized, matching the final report text as it settles.
+    normalizer = StreamingNormalizer()
+    received: list[str] = []
+
+    def render(delta: str) -> None:
+        received.append(normalizer.feed(delta))
+        placeholder.markdown("".join(received) + "▌")
+
+    return render
 
 
 def main() -> None:
@@ -234,15 +249,18 @@ def main() -> None:
             st.error("Please select or enter a ticker symbol.")
         else:
             st.session_state.selected_ticker = ticker
+            live_briefing = st.empty()
             with st.spinner(f"Researching {ticker}..."):
                 try:
-                    report = workflow.run(ticker)
+                    report = workflow.run(ticker, on_delta=_streaming_renderer(live_briefing))
                 except Exception as exc:  # pragma: no cover
                     st.error(f"Workflow run failed: {exc}")
                 else:
+                    live_briefing.empty()
                     st.session_state.report = report
                     st.session_state.summary = report.formatted_summary()
                     st.session_state.chat_history = []
+                    st.session_state.memory = None
                     st.success(f"Research complete for {ticker}")
     if st.session_state.report:
         _render_report(st.session_state.report)
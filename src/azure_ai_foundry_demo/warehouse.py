@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+import threading
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
+import httpx
+import numpy as np
+
+from azure_ai_foundry_demo.bars import (
+    INCREMENTAL_TIMESPANS,
+    BarSeries,
+    Span,
+    extend_coverage,
+    missing_spans,
+)
+from azure_ai_foundry_demo.market_hours import EXCHANGE_TZ, day_start_ms
+
+if TYPE_CHECKING:
+    from azure_ai_foundry_demo.clients.polygon import PolygonClient
+
+logger = logging.getLogger(__name__)
+
+WarehouseMode = Literal["off", "ingest", "warehouse-first"]
+
+DEFAULT_MMAP_BYTES = 256 * 1024 * 1024
+# Weekends and holidays have no bars, so a fetch whose last settled bar is at most this many
+# days before the end of the requested range is taken to cover all of it.
+_MAX_CLOSED_DAYS = 4
+
+
+@dataclass
+class WarehouseStats:
+    appended: int = 0
+    bars_read: int = 0
+    spans_fetched: int = 0
+    fetch_failures: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class BarWarehouse:
+    # Append-only on-disk store of settled bars. Rows are clustered by (ticker, bar size,
+    # timestamp) in a WITHOUT ROWID table, so each ticker is its own contiguous partition and a
+    # range query is one B-tree scan; reads go through sqlite's memory-mapped I/O. Bars from the
+    # current session are never stored because they keep changing until the close.
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        mmap_bytes: int = DEFAULT_MMAP_BYTES,
+        now: Callable[[], datetime] | None = None,
+    ) -> None:
+        if mmap_bytes < 0:
+            raise ValueError("mmap_bytes must be zero or positive")
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._now = now or (lambda: datetime.now(UTC))
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(f"PRAGMA mmap_size={int(mmap_bytes)}")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS bars ("
+            " ticker TEXT NOT NULL,"
+            " interval TEXT NOT NULL,"
+            " ts INTEGER NOT NULL,"
+            " open REAL, high REAL, low REAL, close REAL, volume REAL,"
+            " PRIMARY KEY (ticker, interval, ts)) WITHOUT ROWID"
+        )
+        # The day range per partition known to hold every settled bar (no gaps).
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS coverage ("
+            " ticker TEXT NOT NULL,"
+            " interval TEXT NOT NULL,"
+            " first_day TEXT NOT NULL,"
+            " last_day TEXT NOT NULL,"
+            " PRIMARY KEY (ticker, interval))"
+        )
+        self._connection.commit()
+        self.stats = WarehouseStats()
+
+    def today(self) -> date:
+        return self._now().astimezone(EXCHANGE_TZ).date()
+
+    def append(self, series: BarSeries, *, multiplier: int = 1) -> int:
+        # Existing bars are never rewritten; only bars from sessions before today are kept.
+        cutoff = np.searchsorted(series.timestamps, day_start_ms(self.today()), side="left")
+        if not cutoff or not series.ticker:
+            return 0
+        symbol, interval = series.ticker.upper(), _interval(series.timespan, multiplier)
+        # sqlite binds NaN as NULL, which reads back as NaN.
+        rows = (
+            (symbol, interval, timestamp, *values)
+            for timestamp, values in zip(
+                series.timestamps[:cutoff].tolist(),
+                series.values[:, :cutoff].T.tolist(),
+                strict=True,
+            )
+        )
+        with self._lock, self._connection:
+            before = self._connection.total_changes
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO bars (ticker, interval, ts, open, high, low, close, volume)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            inserted = self._connection.total_changes - before
+            self.stats.appended += inserted
+        return inserted
+
+    def query(
+        self,
+        ticker: str,
+        start_ms: int,
+        end_ms: int,
+        *,
+        timespan: str = "day",
+        multiplier: int = 1,
+    ) -> BarSeries:
+        # Bars with start_ms <= ts < end_ms, oldest first.
+        symbol = ticker.upper()
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT ts, open, high, low, close, volume FROM bars"
+                " WHERE ticker = ? AND interval = ? AND ts >= ? AND ts < ? ORDER BY ts",
+                (symbol, _interval(timespan, multiplier), start_ms, end_ms),
+            ).fetchall()
+            self.stats.bars_read += len(rows)
+        if not rows:
+            return BarSeries.empty(symbol, timespan=timespan)
+        table = np.array(rows, dtype=np.float64)
+        return BarSeries(
+            symbol,
+            table[:, 0].astype(np.int64),
+            np.ascontiguousarray(table[:, 1:].T),
+            timespan=timespan,
+        )
+
+    def coverage(self, ticker: str, *, timespan: str = "day", multiplier: int = 1) -> Span | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT first_day, last_day FROM coverage WHERE ticker = ? AND interval = ?",
+                (ticker.upper(), _interval(timespan, multiplier)),
+            ).fetchone()
+        if row is None:
+            return None
+        return date.fromisoformat(row[0]), date.fromisoformat(row[1])
+
+    def tickers(self) -> list[str]:
+        with self._lock:
+            rows = self._connection.execute("SELECT DISTINCT ticker FROM bars ORDER BY ticker")
+            return [row[0] for row in rows]
+
+    async def load(
+        self,
+        client: PolygonClient,
+        ticker: str,
+        start: date,
+        end: date,
+        *,
+        timespan: str = "day",
+        multiplier: int = 1,
+    ) -> BarSeries:
+        # Serves [start, end] from disk and downloads only the days outside the stored coverage
+        # (in practice the tail since the last run). If the network is unavailable the stored
+        # bars are returned on their own, which is what offline backtests rely on. sqlite work
+        # runs in a worker thread so large ingests do not stall other coroutines on the loop.
+        if timespan not in INCREMENTAL_TIMESPANS:
+            return await client.fetch_range(
+                ticker, start, end, timespan=timespan, multiplier=multiplier
+            )
+        symbol, interval = ticker.upper(), _interval(timespan, multiplier)
+        covered = await asyncio.to_thread(
+            self.coverage, symbol, timespan=timespan, multiplier=multiplier
+        )
+        settled = self.today() - timedelta(days=1)
+        fetched: list[BarSeries] = []
+        for span_start, span_end in missing_spans(start, end, covered):
+            try:
+                series = await client.fetch_range(
+                    symbol, span_start, span_end, timespan=timespan, multiplier=multiplier
+                )
+            except httpx.HTTPError:
+                self.stats.fetch_failures += 1
+                logger.warning(
+                    "Could not fetch %s %s bars for %s to %s; serving stored bars",
+                    symbol,
+                    timespan,
+                    span_start,
+                    span_end,
+                    exc_info=True,
+                )
+                continue
+            self.stats.spans_fetched += 1
+            await asyncio.to_thread(self.append, series, multiplier=multiplier)
+            fetched.append(series)
+            wanted = min(span_end, settled)
+            through = _settled_through(series, wanted)
+            if covered is not None and span_end < covered[0]:
+                # Backfill: an empty answer means the days have no bars (before the listing,
+                # holidays) and is covered; a short one would leave a gap, so it is retried.
+                if through is None:
+                    through = wanted
+                elif through < wanted:
+                    continue
+            elif through is None:
+                # Nothing settled came back for the tail; fetch these days again next time.
+                continue
+            covered = extend_coverage(covered, span_start, through)
+            if covered is not None:
+                await asyncio.to_thread(self._store_coverage, symbol, interval, covered)
+        start_ms, end_ms = day_start_ms(start), day_start_ms(end + timedelta(days=1))
+        stored = await asyncio.to_thread(
+            self.query, symbol, start_ms, end_ms, timespan=timespan, multiplier=multiplier
+        )
+        # Fetched parts come last so today's forming bars (never stored) are included.
+        return BarSeries.concat([stored, *fetched]).between(start_ms, end_ms)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._connection.execute("SELECT COUNT(*) FROM bars").fetchone()[0])
+
+    def _store_coverage(self, ticker: str, interval: str, covered: Span) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO coverage (ticker, interval, first_day, last_day)"
+                " VALUES (?, ?, ?, ?)",
+                (ticker, interval, covered[0].isoformat(), covered[1].isoformat()),
+            )
+
+
+def _settled_through(series: BarSeries, wanted: date) -> date | None:
+    # The last day up to ``wanted`` that ``series`` is known to cover; None without any bars.
+    count = np.searchsorted(series.timestamps, day_start_ms(wanted + timedelta(days=1)))
+    if not count:
+        return None
+    last_bar = datetime.fromtimestamp(series.timestamps[count - 1] / 1000, EXCHANGE_TZ).date()
+    return wanted if (wanted - last_bar).days <= _MAX_CLOSED_DAYS else last_bar
+
+
+def _interval(timespan: str, multiplier: int) -> str:
+    return f"{multiplier}/{timespan}"
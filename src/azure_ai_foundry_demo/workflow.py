@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import logging
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from typing import Any
 
 from azure_ai_foundry_demo.agents.orchestrator import StockAgentOrchestrator
+from azure_ai_foundry_demo.bars import BarSeries
 from azure_ai_foundry_demo.config import Settings, get_settings
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class AgentResearchReport:
@@ -15,9 +22,12 @@ class AgentResearchReport:
     organic_results: list[dict[str, Any]]
     research_notes: list[str]
     analysis: list[str]
-    historical: list[dict[str, Any]] = field(default_factory=list)
+    historical: BarSeries = field(default_factory=BarSeries.empty)
     metrics: dict[str, Any] | None = None
 
+    def __post_init__(self) -> None:
+        self.historical = BarSeries.coerce(self.historical)
+
     def formatted_summary(self) -> str:
         notes_section = "\n\n".join(self.research_notes) or "No intermediate notes"
         analysis_section = "\n\n".join(self.analysis) or "No analysis produced"
@@ -66,6 +76,19 @@ class AgentResearchReport:
         )
 
 
+@dataclass
+class TickerOutcome:
+    ticker: str
+    report: AgentResearchReport | None = None
+    error: str | None = None
+    timed_out: bool = False
+    elapsed_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.report is not None
+
+
 class StockResearchWorkflow:
     def __init__(
         self,
@@ -76,10 +99,110 @@ class StockResearchWorkflow:
         self._settings = settings or get_settings()
         self._orchestrator = orchestrator or StockAgentOrchestrator(settings=self._settings)
 
-    def run(self, ticker: str) -> AgentResearchReport:
-        payload = self._orchestrator.run(ticker)
+    def run(
+        self, ticker: str, *, on_delta: Callable[[str], None] | None = None
+    ) -> AgentResearchReport:
+        if on_delta is None:
+            payload = self._orchestrator.run(ticker)
+        else:
+            payload = self._orchestrator.run(ticker, on_delta=on_delta)
         return AgentResearchReport(**payload)
 
+    def run_many(
+        self,
+        tickers: Iterable[str],
+        concurrency: int | None = None,
+        *,
+        timeout: float | None = None,
+    ) -> Iterator[TickerOutcome]:
+        # Yields one outcome per unique ticker in completion order; failures and timeouts are
+        # reported instead of raised. Each orchestrator run works on its own tooling state. A
+        # timed-out run cannot be interrupted: its outcome is reported as soon as the deadline
+        # passes, but it keeps its worker (and its share of ``concurrency``) until the agent
+        # runner's own timeout fires, so queued tickers never wait behind it on their clock.
+        workers = concurrency or self._settings.batch_concurrency
+        if workers < 1:
+            raise ValueError("concurrency must be at least 1")
+        deadline_seconds = timeout or self._settings.batch_ticker_timeout
+        queue = list(dict.fromkeys(ticker.strip().upper() for ticker in tickers if ticker.strip()))
+        self._prefetch_quotes(queue)
+        queue.reverse()
+        started: dict[str, float] = {}
+        in_flight: dict[Future[AgentResearchReport], str] = {}
+        abandoned: set[Future[AgentResearchReport]] = set()
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="research")
+        try:
+            while queue or in_flight:
+                abandoned = {future for future in abandoned if not future.done()}
+                while queue and len(in_flight) + len(abandoned) < workers:
+                    ticker = queue.pop()
+                    in_flight[pool.submit(self._run_timed, ticker, started)] = ticker
+                done, _ = wait(
+                    in_flight.keys() | abandoned,
+                    timeout=self._next_deadline(in_flight, started, deadline_seconds),
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done & in_flight.keys():
+                    yield self._outcome(in_flight.pop(future), future, started)
+                now = time.monotonic()
+                for future, ticker in list(in_flight.items()):
+                    start = started.get(ticker)
+                    if start is not None and now - start >= deadline_seconds:
+                        del in_flight[future]
+                        abandoned.add(future)
+                        logger.warning("Research for %s exceeded %.0fs", ticker, deadline_seconds)
+                        yield TickerOutcome(
+                            ticker=ticker,
+                            error=f"Timed out after {deadline_seconds:.0f}s",
+                            timed_out=True,
+                            elapsed_seconds=now - start,
+                        )
+        finally:
+            for future in in_flight:
+                future.cancel()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _prefetch_quotes(self, tickers: list[str]) -> None:
+        prefetch = getattr(self._orchestrator, "prefetch_quotes", None)
+        if prefetch is None or len(tickers) < 2:
+            return
+        try:
+            prefetch(tickers)
+        except Exception:
+            # Best effort: every run can still fetch its own quote.
+            logger.warning("Bulk quote prefetch failed", exc_info=True)
+
+    def _run_timed(self, ticker: str, started: dict[str, float]) -> AgentResearchReport:
+        started[ticker] = time.monotonic()
+        return self.run(ticker)
+
+    @staticmethod
+    def _next_deadline(
+        in_flight: dict[Future[AgentResearchReport], str],
+        started: dict[str, float],
+        deadline_seconds: float,
+    ) -> float | None:
+        if not in_flight:
+            # Only abandoned runs are left; wait for one of them to free its worker.
+            return None
+        starts = [started[ticker] for ticker in in_flight.values() if ticker in started]
+        if len(starts) < len(in_flight):
+            # A queued task has not recorded its start yet; check back shortly.
+            return min(deadline_seconds, 0.05)
+        return max(0.0, min(starts) + deadline_seconds - time.monotonic())
+
+    @staticmethod
+    def _outcome(
+        ticker: str, future: Future[AgentResearchReport], started: dict[str, float]
+    ) -> TickerOutcome:
+        elapsed = time.monotonic() - started.get(ticker, time.monotonic())
+        error = future.exception()
+        if error is not None:
+            logger.warning("Research for %s failed: %s", ticker, error)
+            message = str(error) or type(error).__name__
+            return TickerOutcome(ticker=ticker, error=message, elapsed_seconds=elapsed)
+        return TickerOutcome(ticker=ticker, report=future.result(), elapsed_seconds=elapsed)
+
 
 def render_report(report: AgentResearchReport, *, include_sources: bool = False) -> str:
     summary = report.formatted_summary()
@@ -0,0 +1,158 @@
+import json
+from datetime import date
+
+import numpy as np
+import pytest
+
+from azure_ai_foundry_demo.bars import BarSeries, Lookback
+from azure_ai_foundry_demo.metrics import compute_metrics
+from azure_ai_foundry_demo.models import FinanceResearchPayload, StockQuote
+from azure_ai_foundry_demo.workflow import AgentResearchReport
+
+DAY = 86_400_000
+START = 1_727_654_400_000  # 2024-09-30T00:00:00Z
+
+
+def _results() -> list[dict]:
+    # Newest first, like the aggregates endpoint with sort=desc.
+    return [
+        {"t": START + 2 * DAY, "o": 3.0, "h": 3.5, "l": 2.5, "c": 3.2, "v": 300},
+        {"t": START + DAY, "o": 2.0, "h": 2.5, "l": None, "c": 2.2, "v": 200},
+        {"o": 9.9},
+        {"t": START, "o": 1.0, "h": 1.5, "l": 0.5, "c": 1.2, "v": 100},
+    ]
+
+
+def test_from_polygon_results_orders_ascending_and_marks_missing_values():
+    series = BarSeries.from_polygon_results("MSFT", _results())
+
+    assert len(series) == 3
+    assert series.dates() == ["2024-09-30", "2024-10-01", "2024-10-02"]
+    assert series.close.tolist() == [1.2, 2.2, 3.2]
+    assert np.isnan(series.low[1])
+    assert np.shares_memory(series.close, series.values)
+
+
+def test_unordered_input_is_sorted():
+    results = _results()
+    results[0], results[3] = results[3], results[0]
+    series = BarSeries.from_polygon_results("MSFT", results)
+    assert series.timestamps.tolist() == [START, START + DAY, START + 2 * DAY]
+    assert series.open.tolist() == [1.0, 2.0, 3.0]
+
+
+def test_tail_is_a_view():
+    series = BarSeries.from_polygon_results("MSFT", _results())
+    tail = series.tail(2)
+    assert tail.dates() == ["2024-10-01", "2024-10-02"]
+    assert np.shares_memory(tail.values, series.values)
+    assert series.tail(10) is series
+
+
+def test_columns_round_trip_and_nulls():
+    series = BarSeries.from_polygon_results("MSFT", _results())
+    columns = series.to_columns()
+    assert columns["low"] == [0.5, None, 2.5]
+    assert BarSeries.from_columns(json.loads(json.dumps(columns)), ticker="MSFT") == series
+
+
+def test_json_round_trip_is_lossless():
+    series = BarSeries.from_polygon_results("MSFT", _results())
+    assert BarSeries.from_json(series.to_json()) == series
+    assert BarSeries.from_json(BarSeries.empty("X").to_json()) == BarSeries.empty("X")
+
+
+def test_coerce_accepts_legacy_rows():
+    series = BarSeries.coerce(
+        [{"date": "2024-10-01", "close": 2.0}, {"date": "2024-09-30", "close": 1.0}]
+    )
+    assert series.dates() == ["2024-09-30", "2024-10-01"]
+    assert series.close.tolist() == [1.0, 2.0]
+    assert len(BarSeries.coerce([])) == 0
+    with pytest.raises(TypeError):
+        BarSeries.coerce(3)
+
+
+def test_metrics_read_the_columns_without_copying():
+    series = BarSeries.from_polygon_results("MSFT", _results())
+    result = compute_metrics(series.open, series.high, series.low, series.close, series.volume)
+    assert np.shares_memory(result.close, series.values)
+    assert result.summary().absolute_change == pytest.approx(2.0)
+
+
+def test_payload_serializes_columns_once():
+    series = BarSeries.from_polygon_results("MSFT", _results())
+    payload = FinanceResearchPayload(quote=StockQuote(ticker="MSFT"), historical=series)
+
+    assert payload.model_dump()["historical"] is series
+    dumped = json.loads(payload.model_dump_json())
+    assert dumped["historical"]["date"] == series.dates()
+    assert FinanceResearchPayload.model_validate(dumped).historical == BarSeries.from_columns(
+        dumped["historical"]
+    )
+
+
+def test_report_frame_matches_series():
+    series = BarSeries.from_polygon_results("MSFT", _results())
+    report = AgentResearchReport(
+        ticker="MSFT",
+        quote={},
+        news=[],
+        organic_results=[],
+        research_notes=[],
+        analysis=[],
+        historical=series.to_columns(),
+    )
+    frame = report.historical.to_frame()
+    assert list(frame.columns) == ["date", "open", "high", "low", "close", "volume"]
+    assert frame["date"].dt.strftime("%Y-%m-%d").tolist() == series.dates()
+    assert frame["close"].tolist() == [1.2, 2.2, 3.2]
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("7D", date(2024, 2, 22)),
+        ("2w", date(2024, 2, 15)),
+        ("1M", date(2024, 1, 29)),
+        ("6M", date(2023, 8, 29)),
+        ("1Y", date(2023, 2, 28)),
+        (30, date(2024, 1, 30)),
+    ],
+)
+def test_lookback_start(value, expected):
+    assert Lookback.parse(value).start(date(2024, 2, 29)) == expected
+
+
+@pytest.mark.parametrize("value", ["", "0D", "5", "3Q", "M6"])
+def test_lookback_rejects_malformed_values(value):
+    with pytest.raises(ValueError):
+        Lookback.parse(value)
+
+
+def test_concat_orders_and_prefers_later_parts():
+    older = BarSeries.from_polygon_results("MSFT", _results()[2:])
+    newer = BarSeries.from_polygon_results("MSFT", _results()[:2])
+    revised = BarSeries.from_polygon_results("MSFT", [{"t": START + DAY, "c": 9.0}])
+
+    merged = BarSeries.concat([newer, older, revised])
+
+    assert merged.timestamps.tolist() == [START, START + DAY, START + 2 * DAY]
+    assert merged.close.tolist() == [1.2, 9.0, 3.2]
+    with pytest.raises(ValueError):
+        BarSeries.concat([older, BarSeries.empty("MSFT", timespan="minute")])
+
+
+def test_between_selects_a_half_open_window():
+    series = BarSeries.from_polygon_results("MSFT", _results())
+    window = series.between(START + DAY, START + 2 * DAY)
+    assert window.dates() == ["2024-10-01"]
+    assert series.between(0, START + 10 * DAY) is series
+
+
+def test_intraday_series_keep_minute_timestamps():
+    series = BarSeries.from_polygon_results(
+        "MSFT", [{"t": START + 60_000, "c": 1.0}], timespan="minute"
+    )
+    assert series.dates() == ["2024-09-30T00:01"]
+    assert BarSeries.from_json(series.to_json()) == series
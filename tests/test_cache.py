@@ -0,0 +1,92 @@
+import pytest
+
+from azure_ai_foundry_demo.cache import (
+    MemoryCacheBackend,
+    SqliteCacheBackend,
+    build_cache_backend,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_backend(request, tmp_path):
+    def factory(**kwargs):
+        if request.param == "memory":
+            return MemoryCacheBackend(**kwargs)
+        return SqliteCacheBackend(tmp_path / "cache.sqlite3", **kwargs)
+
+    return factory
+
+
+def test_backend_counts_hits_misses_and_expirations(make_backend):
+    clock = FakeClock()
+    cache = make_backend(clock=clock)
+    assert cache.get("a") is None
+    cache.set("a", b"value", expires_at=clock.now + 10)
+    assert cache.get("a") == b"value"
+    clock.now += 11
+    assert cache.get("a") is None
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 2
+    assert cache.stats.expirations == 1
+    assert cache.stats.hit_rate == pytest.approx(1 / 3)
+    cache.close()
+
+
+def test_backend_evicts_least_recently_used_entry(make_backend):
+    clock = FakeClock()
+    cache = make_backend(max_entries=2, clock=clock)
+    cache.set("a", b"1", expires_at=clock.now + 60)
+    clock.now += 1
+    cache.set("b", b"2", expires_at=clock.now + 60)
+    clock.now += 1
+    assert cache.get("a") == b"1"
+    clock.now += 1
+    cache.set("c", b"3", expires_at=clock.now + 60)
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    assert cache.get("c") == b"3"
+    assert cache.stats.evictions == 1
+    assert len(cache) == 2
+    cache.close()
+
+
+def test_backend_enforces_memory_budget(make_backend):
+    clock = FakeClock()
+    cache = make_backend(max_bytes=10, clock=clock)
+    cache.set("a", b"12345", expires_at=clock.now + 60)
+    clock.now += 1
+    cache.set("b", b"12345", expires_at=clock.now + 60)
+    clock.now += 1
+    cache.set("c", b"123", expires_at=clock.now + 60)
+    cache.set("huge", b"x" * 11, expires_at=clock.now + 60)
+    assert cache.get("a") is None
+    assert cache.get("huge") is None
+    assert cache.size_bytes == 8
+    cache.close()
+
+
+def test_sqlite_backend_persists_between_instances(tmp_path):
+    path = tmp_path / "nested" / "cache.sqlite3"
+    first = SqliteCacheBackend(path)
+    first.set("key", b"payload", expires_at=float("inf"))
+    first.close()
+    second = SqliteCacheBackend(path)
+    assert second.get("key") == b"payload"
+    second.close()
+
+
+def test_build_cache_backend_selects_implementation(tmp_path):
+    kwargs = {"path": tmp_path / "cache.sqlite3", "max_entries": 4, "max_bytes": 1024}
+    assert build_cache_backend("none", **kwargs) is None
+    assert isinstance(build_cache_backend("memory", **kwargs), MemoryCacheBackend)
+    sqlite_backend = build_cache_backend("sqlite", **kwargs)
+    assert isinstance(sqlite_backend, SqliteCacheBackend)
+    sqlite_backend.close()
@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+import respx
+from httpx import Response
+
+from azure_ai_foundry_demo.clients.http import SharedHttpClient, build_async_client
+from azure_ai_foundry_demo.clients.polygon import PolygonClient
+from azure_ai_foundry_demo.clients.serper import SerperClient
+from azure_ai_foundry_demo.config import Settings
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    monkeypatch.setenv("AZURE_AI_ENDPOINT", "https://unit.azure.com")
+    monkeypatch.setenv("AZURE_AI_PROJECT_NAME", "demo-project")
+    monkeypatch.setenv("AZURE_AI_CONNECTION_ID", "conn-id")
+    monkeypatch.setenv("SERPER_API_KEY", "secret")
+    monkeypatch.setenv("SERPER_SEARCH_URL", "https://example.com/search")
+    monkeypatch.setenv("SERPER_NEWS_URL", "https://example.com/news")
+    monkeypatch.setenv("POLYGON_API_KEY", "poly")
+    monkeypatch.setenv("POLYGON_BASE_URL", "https://polygon.example.com")
+    monkeypatch.setenv("HTTP_MAX_CONNECTIONS", "7")
+    return Settings()
+
+
+def test_build_async_client_applies_pool_settings(settings):
+    client = build_async_client(settings)
+    pool = client._transport._pool
+    assert pool._max_connections == 7
+    assert client.timeout.read == pytest.approx(settings.http_timeout)
+    assert client.timeout.connect == pytest.approx(settings.http_connect_timeout)
+
+
+@pytest.mark.asyncio
+async def test_shared_client_is_reused_until_closed(settings):
+    built: list[httpx.AsyncClient] = []
+
+    def factory() -> httpx.AsyncClient:
+        client = httpx.AsyncClient()
+        built.append(client)
+        return client
+
+    shared = SharedHttpClient(settings, factory)
+    assert shared.client is shared.client
+    assert shared.is_open
+    await shared.aclose()
+    assert built[0].is_closed
+    assert not shared.is_open
+    assert shared.client is not built[0]
+    assert len(built) == 2
+    await shared.aclose()
+
+
+def test_loop_switch_closes_the_old_client_on_its_loop(settings):
+    built: list[httpx.AsyncClient] = []
+
+    def factory() -> httpx.AsyncClient:
+        client = httpx.AsyncClient()
+        built.append(client)
+        return client
+
+    shared = SharedHttpClient(settings, factory)
+    old_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=old_loop.run_forever, daemon=True)
+    thread.start()
+
+    async def current() -> httpx.AsyncClient:
+        return shared.client
+
+    try:
+        old = asyncio.run_coroutine_threadsafe(current(), old_loop).result(timeout=5)
+        new = asyncio.run(current())
+        deadline = time.monotonic() + 5
+        while not old.is_closed and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        old_loop.call_soon_threadsafe(old_loop.stop)
+        thread.join(timeout=5)
+        old_loop.close()
+    assert new is not old
+    assert old.is_closed
+    assert not new.is_closed
+    assert len(built) == 2
+
+
+@pytest.mark.asyncio
+async def test_clients_share_one_pooled_transport(settings):
+    built: list[httpx.AsyncClient] = []
+
+    def factory() -> httpx.AsyncClient:
+        client = httpx.AsyncClient()
+        built.append(client)
+        return client
+
+    async with SharedHttpClient(settings, factory) as shared:
+        polygon = PolygonClient(settings, http_client=shared)
+        serper = SerperClient(settings, http_client=shared)
+        with respx.mock(assert_all_called=True) as router:
+            router.get(settings.polygon_url("v2/aggs/ticker/MSFT/prev")).mock(
+                return_value=Response(200, json={"results": [{"c": 1.0, "t": 1_700_000_000_000}]})
+            )
+            router.get("https://example.com/news").mock(return_value=Response(200, json={}))
+            await polygon.fetch_previous_close("MSFT")
+            await polygon.fetch_previous_close("MSFT")
+            await serper.fetch_news("msft")
+        await polygon.aclose()
+        assert shared.is_open
+    assert len(built) == 1
+    assert built[0].is_closed
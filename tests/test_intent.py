@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import pytest
+
+from azure_ai_foundry_demo.agents.intent import (
+    FastPathRouter,
+    IntentClassifier,
+    RouterStats,
+    tokenize,
+)
+
+
+def _unreachable() -> list[str]:
+    raise AssertionError("the LLM router should not be called")
+
+
+@pytest.mark.parametrize(
+    ("message", "stages"),
+    [
+        ("What's the price now?", ["price", "analysis"]),
+        ("Any news?", ["news", "analysis"]),
+        ("What are the latest headlines", ["news", "analysis"]),
+        ("Should I buy it?", ["analysis"]),
+    ],
+)
+def test_obvious_requests_take_the_fast_path(message: str, stages: list[str]) -> None:
+    router = FastPathRouter()
+    assert router.route(message, _unreachable) == stages
+    assert router.stats.fast_path == 1
+    assert router.stats.llm_routed == 0
+
+
+@pytest.mark.parametrize(
+    "message",
+    ["hi", "No news please, just the price", "word " * 40],
+)
+def test_uncertain_requests_fall_back_to_the_llm_router(message: str) -> None:
+    router = FastPathRouter()
+    assert router.classify(message).confidence < 0.85
+    assert router.route(message, lambda: ["price"]) == ["price"]
+    assert router.stats.llm_routed == 1
+
+
+def test_router_learns_from_llm_decisions() -> None:
+    router = FastPathRouter()
+    message = "tell me about their supply chain in asia"
+    assert router.classify(message).confidence < 0.85
+    for _ in range(5):
+        router.route(message, lambda: ["news", "analysis"])
+    assert router.route(message, _unreachable) == ["news", "analysis"]
+    router.route("hello there", lambda: [])
+    assert "hello" not in router.classify("hello there").stages
+
+
+def test_disabled_router_always_calls_the_llm() -> None:
+    router = FastPathRouter(enabled=False)
+    assert router.route("Any news?", lambda: ["news"]) == ["news"]
+    assert router.stats.fast_path == 0
+    with pytest.raises(ValueError):
+        FastPathRouter(threshold=0.2)
+
+
+def test_classifier_and_stats() -> None:
+    assert tokenize("What's new?") == ["what's", "new", "what's new"]
+    classifier = IntentClassifier().fit([("any news", ["news"]), ("the price", ["price"])])
+    probabilities = classifier.predict("news")
+    assert probabilities["news"] > 0.5 > probabilities["price"]
+    assert classifier.predict("unseen words") == {"price": 0.5, "news": 0.5}
+    stats = RouterStats(fast_path=3, llm_routed=1, fast_seconds=0.001, llm_seconds=2.0)
+    assert stats.fast_path_rate == 0.75
+    assert stats.as_dict()["saved_seconds"] == pytest.approx(5.999)
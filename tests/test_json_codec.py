@@ -0,0 +1,45 @@
+import math
+
+import httpx
+import numpy as np
+
+from azure_ai_foundry_demo import json_codec
+from azure_ai_foundry_demo.bars import BarSeries
+
+
+def test_round_trip_is_compact_bytes():
+    payload = {"a": [1, 2.5, None], "b": "text"}
+    encoded = json_codec.dumps(payload)
+    assert isinstance(encoded, bytes)
+    assert b" " not in encoded.replace(b'"text"', b"")
+    assert json_codec.loads(encoded) == payload
+    assert json_codec.loads(encoded.decode()) == payload
+
+
+def test_response_json_decodes_raw_body():
+    response = httpx.Response(200, content=b'{"results": [{"t": 1, "c": 2.0}]}')
+    assert json_codec.response_json(response) == {"results": [{"t": 1, "c": 2.0}]}
+
+
+def test_polygon_results_decode_into_columns():
+    results = [
+        {"t": 2, "o": 1, "h": 2, "l": 0.5, "c": 1.5, "v": 10},
+        {"t": 1, "o": 1, "h": 2, "l": 0.5, "c": 1.0},
+        {"o": 9, "c": 9},
+    ]
+    series = BarSeries.from_polygon_results("abc", results)
+    assert series.timestamps.tolist() == [1, 2]
+    assert series.close.tolist() == [1.0, 1.5]
+    assert math.isnan(series.volume[0])
+
+
+def test_polygon_results_fall_back_on_unexpected_fields():
+    results = [
+        {"t": 1, "o": 1, "h": 2, "l": 0.5, "c": "n/a", "v": 10},
+        {"t": 2, "o": 1, "h": 2, "l": 0.5, "c": {"value": 3}, "v": 10},
+        {"t": 3, "o": 1, "h": 2, "l": 0.5, "c": 1.5, "v": 10},
+    ]
+    series = BarSeries.from_polygon_results("abc", results)
+    assert series.timestamps.tolist() == [1, 2, 3]
+    assert np.isnan(series.close[:2]).all()
+    assert series.close[2] == 1.5
@@ -0,0 +1,72 @@
+import asyncio
+import threading
+
+import pytest
+
+from azure_ai_foundry_demo.agents.loop_bridge import LoopBridge
+from azure_ai_foundry_demo.agents.utils import sync_await
+
+
+async def _current_loop() -> asyncio.AbstractEventLoop:
+    await asyncio.sleep(0)
+    return asyncio.get_running_loop()
+
+
+@pytest.fixture
+def bridge():
+    instance = LoopBridge(name="test-bridge")
+    yield instance
+    instance.shutdown()
+
+
+def test_bridge_reuses_one_loop_across_calls(bridge):
+    first = bridge.run(_current_loop())
+    second = bridge.run(_current_loop())
+    assert first is second
+    assert bridge.is_running
+
+
+def test_bridge_runs_from_inside_a_running_loop(bridge):
+    async def caller() -> asyncio.AbstractEventLoop:
+        return bridge.run(_current_loop())
+
+    outer = asyncio.new_event_loop()
+    try:
+        inner = outer.run_until_complete(caller())
+    finally:
+        outer.close()
+    assert inner is bridge.loop
+
+
+def test_bridge_shutdown_cancels_pending_work_and_restarts_lazily(bridge):
+    started = threading.Event()
+
+    async def hang() -> None:
+        started.set()
+        await asyncio.sleep(3600)
+
+    future = bridge.submit(hang())
+    started.wait(timeout=1)
+    first_loop = bridge.loop
+    bridge.shutdown()
+    assert future.cancelled()
+    assert first_loop.is_closed()
+    assert not bridge.is_running
+    assert bridge.run(_current_loop()) is not first_loop
+
+
+def test_bridge_rejects_blocking_calls_from_its_own_thread(bridge):
+    async def nested() -> None:
+        bridge.run(_current_loop())
+
+    with pytest.raises(RuntimeError):
+        bridge.run(nested())
+
+
+def test_bridge_run_times_out(bridge):
+    with pytest.raises(TimeoutError):
+        bridge.run(asyncio.sleep(1), timeout=0.01)
+
+
+def test_sync_await_uses_shared_bridge():
+    assert sync_await(_current_loop()) is sync_await(_current_loop())
@@ -0,0 +1,33 @@
+from datetime import date, datetime
+
+from azure_ai_foundry_demo.market_hours import EXCHANGE_TZ, MarketCalendar
+
+
+def _et(*args: int) -> datetime:
+    return datetime(*args, tzinfo=EXCHANGE_TZ)
+
+
+def test_next_open_before_and_after_session():
+    calendar = MarketCalendar()
+    assert calendar.next_open(_et(2024, 10, 1, 8, 0)) == _et(2024, 10, 1, 9, 30)
+    assert calendar.next_open(_et(2024, 10, 1, 12, 0)) == _et(2024, 10, 2, 9, 30)
+
+
+def test_next_close_rolls_over_weekends_and_holidays():
+    calendar = MarketCalendar(holidays=[date(2024, 10, 7)])
+    assert calendar.next_close(_et(2024, 10, 4, 12, 0)) == _et(2024, 10, 4, 16, 0)
+    assert calendar.next_close(_et(2024, 10, 4, 17, 0)) == _et(2024, 10, 8, 16, 0)
+    assert calendar.next_close(_et(2024, 10, 5, 12, 0)) == _et(2024, 10, 8, 16, 0)
+
+
+def test_previous_trading_day_skips_weekends_and_holidays():
+    calendar = MarketCalendar(holidays=[date(2024, 10, 4)])
+    assert calendar.previous_trading_day(date(2024, 10, 8)) == date(2024, 10, 7)
+    assert calendar.previous_trading_day(date(2024, 10, 7)) == date(2024, 10, 3)
+
+
+def test_last_closed_session_includes_today_after_the_close():
+    calendar = MarketCalendar()
+    assert calendar.last_closed_session(_et(2024, 10, 2, 15, 59)) == date(2024, 10, 1)
+    assert calendar.last_closed_session(_et(2024, 10, 2, 16, 0)) == date(2024, 10, 2)
+    assert calendar.last_closed_session(_et(2024, 10, 5, 17, 0)) == date(2024, 10, 4)
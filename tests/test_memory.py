@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import pytest
+
+from azure_ai_foundry_demo.agents.memory import NO_HISTORY, ConversationMemory
+from azure_ai_foundry_demo.agents.prompt_budget import count_tokens
+from azure_ai_foundry_demo.agents.prompt_builders import build_router_prompt
+
+
+def _history(turns: int) -> list[dict[str, str]]:
+    return [
+        {
+            "role": "user" if index % 2 == 0 else "assistant",
+            "content": (
+                f"Question {index} about margins? More detail."
+                if index % 2 == 0
+                else f"Answer {index} with analysis."
+            ),
+        }
+        for index in range(turns)
+    ]
+
+
+def test_memory_keeps_a_window_and_condenses_evicted_turns() -> None:
+    memory = ConversationMemory.from_history(_history(10), window_turns=4, summary_topics=2)
+    lines = memory.render().splitlines()
+    assert len(memory) == 10
+    assert memory.evicted == 6
+    assert (
+        lines[0]
+        == "Earlier (6 turns, condensed): Question 2 about margins?; Question 4 about margins?"
+    )
+    assert lines[1:] == [
+        "User: Question 6 about margins? More detail.",
+        "Assistant: Answer 7 with analysis.",
+        "User: Question 8 about margins? More detail.",
+        "Assistant: Answer 9 with analysis.",
+    ]
+    assert ConversationMemory().render() == NO_HISTORY
+
+
+def test_memory_sync_folds_in_new_entries_and_caches_the_render() -> None:
+    history = _history(4)
+    memory = ConversationMemory.from_history(history, window_turns=2)
+    rendered = memory.render()
+    memory.sync(history)
+    assert memory.render() is rendered
+    history += _history(6)[4:]
+    memory.sync(history)
+    assert len(memory) == 6
+    assert memory.render() is not rendered
+    assert memory.render().endswith("Assistant: Answer 5 with analysis.")
+
+
+def test_memory_sync_replays_an_edited_history() -> None:
+    history = _history(6)
+    memory = ConversationMemory.from_history(history, window_turns=2)
+    edited = [*history[:-1], {"role": "assistant", "content": "Revised answer."}]
+    memory.sync(edited)
+    assert len(memory) == 6
+    assert memory.render().endswith("Assistant: Revised answer.")
+    memory.sync(history[:2])
+    assert len(memory) == 2
+    assert memory.evicted == 0
+
+
+def test_memory_clips_long_turns_and_renders_within_an_allowance() -> None:
+    memory = ConversationMemory(window_turns=3, turn_tokens=20)
+    memory.append("user", "word " * 500)
+    assert count_tokens(memory.render()) <= 20
+    memory.sync(_history(40))
+    text = memory.render_within(60, title="Conversation history:")
+    assert text.startswith("Conversation history:\nEarlier (")
+    assert count_tokens(text) <= 60
+    assert memory.render_within(60, title="Conversation history:") is text
+    with pytest.raises(ValueError):
+        ConversationMemory(window_turns=0)
+
+
+def test_router_prompt_uses_the_memory_block() -> None:
+    memory = ConversationMemory.from_history(_history(12), window_turns=2)
+    prompt = build_router_prompt(
+        "msft",
+        summary=None,
+        conversation_history=None,
+        user_message="Any news?",
+        last_payload=None,
+        memory=memory,
+    )
+    assert memory.render() in prompt
+    assert "Question 0 about margins? More detail." not in prompt
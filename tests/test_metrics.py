@@ -0,0 +1,125 @@
+import math
+
+import numpy as np
+import pytest
+
+from azure_ai_foundry_demo.metrics import MetricsConfig, compute_metrics
+
+
+def _random_ohlcv(rng: np.random.Generator, tickers: int, bars: int):
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (tickers, bars)), axis=1))
+    open_ = close * (1 + rng.normal(0, 0.005, close.shape))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.01, close.shape))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.01, close.shape))
+    volume = rng.uniform(1e6, 5e6, close.shape)
+    return open_, high, low, close, volume
+
+
+def test_simple_series_matches_hand_computed_values():
+    close = [10.0, 11.0, 12.0, 11.0, 13.0]
+    result = compute_metrics(close, close, close, close, [100, 100, 100, 100, 100])
+    summary = result.summary()
+
+    assert summary.absolute_change == pytest.approx(3.0)
+    assert summary.percent_change == pytest.approx(30.0)
+    assert summary.max_drawdown == pytest.approx(11 / 12 - 1)
+    # Fewer changes than the RSI period, so Wilder's average is the plain mean so far:
+    # gains 1 + 1 + 2 and one loss of 1 over four changes.
+    assert summary.rsi == pytest.approx(100 - 100 / (1 + 4 / 1))
+    assert summary.vwap == pytest.approx(np.mean(close))
+    assert summary.moving_averages == {"sma_5": pytest.approx(11.4)}
+
+
+def test_trailing_windows_match_reference_calculations():
+    rng = np.random.default_rng(7)
+    open_, high, low, close, volume = _random_ohlcv(rng, 1, 60)
+    config = MetricsConfig(volatility_window=20, atr_period=14, volume_window=20)
+    result = compute_metrics(open_, high, low, close, volume, config=config)
+    c, h, lo, v = close[0], high[0], low[0], volume[0]
+
+    returns = c[1:] / c[:-1] - 1
+    expected_vol = np.std(returns[-20:], ddof=1) * math.sqrt(252)
+    assert result.volatility[0, -1] == pytest.approx(expected_vol)
+
+    true_range = np.maximum(h[1:] - lo[1:], np.maximum(abs(h[1:] - c[:-1]), abs(lo[1:] - c[:-1])))
+    assert result.atr[0, -1] == pytest.approx(true_range[-14:].mean())
+
+    prior = v[-21:-1]
+    assert result.volume_zscore[0, -1] == pytest.approx((v[-1] - prior.mean()) / prior.std(ddof=1))
+
+    assert result.moving_averages[50][0, -1] == pytest.approx(c[-50:].mean())
+    assert np.isnan(result.moving_averages[50][0, 48])
+
+    peak = np.maximum.accumulate(c)
+    assert result.max_drawdown[0] == pytest.approx((c / peak - 1).min())
+
+
+def _wilder_rsi(close: list[float], period: int) -> list[float]:
+    # Reference loop: seed with the mean of the first changes, then Wilder's recursion. A gap
+    # drops the changes on both sides of it and the RSI carries forward.
+    gain = loss = 0.0
+    seen = 0
+    rsi = [math.nan]
+    for previous, value in zip(close, close[1:], strict=False):
+        change = value - previous
+        if math.isnan(change):
+            rsi.append(rsi[-1])
+            continue
+        seen += 1
+        weight = 1 / min(seen, period)
+        gain += (max(change, 0.0) - gain) * weight
+        loss += (max(-change, 0.0) - loss) * weight
+        rsi.append(100.0 if loss == 0 else 100 - 100 / (1 + gain / loss))
+    return rsi
+
+
+def test_rsi_uses_wilder_smoothing():
+    rng = np.random.default_rng(3)
+    close = list(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 400))))
+    result = compute_metrics(close, close, close, close, np.ones(400))
+    expected = _wilder_rsi(close, 14)
+    np.testing.assert_allclose(result.rsi[0, 1:], expected[1:], rtol=1e-9)
+
+    gapped = [math.nan if index % 7 == 3 else value for index, value in enumerate(close)]
+    result = compute_metrics(gapped, gapped, gapped, gapped, np.ones(400))
+    expected = _wilder_rsi(gapped, 14)
+    np.testing.assert_allclose(result.rsi[0, 1:], expected[1:], rtol=1e-9)
+
+
+def test_volatility_is_annualized_for_the_bar_size():
+    rng = np.random.default_rng(5)
+    columns = _random_ohlcv(rng, 1, 60)
+    daily = compute_metrics(*columns).volatility[0, -1]
+    minute = compute_metrics(*columns, timespan="minute").volatility[0, -1]
+    weekly = compute_metrics(*columns, timespan="week").volatility[0, -1]
+    assert minute == pytest.approx(daily * math.sqrt(390))
+    assert weekly == pytest.approx(daily * math.sqrt(52 / 252))
+    with pytest.raises(ValueError):
+        compute_metrics(*columns, timespan="second")
+
+
+def test_batch_rows_match_single_series():
+    rng = np.random.default_rng(11)
+    columns = _random_ohlcv(rng, 5, 40)
+    batch = compute_metrics(*columns)
+    for row in range(5):
+        single = compute_metrics(*(column[row] for column in columns))
+        assert single.summary() == batch.summary(row)
+
+
+def test_missing_values_are_skipped():
+    nan = math.nan
+    close = [nan, 10.0, 11.0, nan, 12.0]
+    volume = [nan, 100.0, 200.0, nan, 300.0]
+    result = compute_metrics(close, close, close, close, volume)
+    summary = result.summary()
+
+    assert summary.period_days == 3
+    assert summary.absolute_change == pytest.approx(2.0)
+    assert summary.average_volume == pytest.approx(200.0)
+    assert summary.high == pytest.approx(12.0)
+
+
+def test_mismatched_columns_are_rejected():
+    with pytest.raises(ValueError):
+        compute_metrics([1.0], [1.0], [1.0], [1.0, 2.0], [1.0])
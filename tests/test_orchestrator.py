@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from datetime import date
+from unittest.mock import MagicMock
+
+import pytest
+import respx
+from httpx import Response
+
+from azure_ai_foundry_demo.agents import orchestrator as orchestrator_module
+from azure_ai_foundry_demo.agents.orchestrator import StockAgentOrchestrator
+from azure_ai_foundry_demo.agents.runner import AgentRunResult
+from azure_ai_foundry_demo.config import Settings
+from azure_ai_foundry_demo.market_hours import day_start_ms
+
+
+class StubRunner:
+    # Answers every stage with a canned message and records the prompt it was given.
+    def __init__(self, router_reply: str) -> None:
+        self.router_reply = router_reply
+        self.prompts: dict[str, str] = {}
+
+    def run_with_functions(self, *, agent, user_prompt, tooling, polling) -> AgentRunResult:
+        self.prompts[agent.name] = user_prompt
+        reply = self.router_reply if agent.name == "followup-router" else f"{agent.name} notes"
+        return AgentRunResult(run_id="run", thread_id="thread", messages=[reply])
+
+
+class StubRegistry:
+    def get_or_create(self, *, name, instructions, tools):
+        agent = MagicMock()
+        agent.name = name
+        return agent
+
+    def shutdown(self) -> None:
+        pass
+
+
+def _build(monkeypatch, **env: str) -> StockAgentOrchestrator:
+    for name, value in {
+        "AZURE_AI_ENDPOINT": "https://unit.azure.com",
+        "AZURE_AI_PROJECT_NAME": "demo-project",
+        "AZURE_AI_CONNECTION_ID": "conn-id",
+        "SERPER_API_KEY": "secret",
+        "POLYGON_API_KEY": "poly",
+        "POLYGON_BASE_URL": "https://polygon.example.com",
+        "POLYGON_CACHE_BACKEND": "none",
+        "SERPER_CACHE_BACKEND": "none",
+        "BAR_WAREHOUSE_MODE": "off",
+        **env,
+    }.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.setattr(orchestrator_module, "DefaultAzureCredential", MagicMock())
+    monkeypatch.setattr(orchestrator_module, "AIProjectClient", MagicMock())
+    instance = StockAgentOrchestrator(Settings(_env_file=None))
+    instance._agent_registry = StubRegistry()
+    return instance
+
+
+@pytest.fixture
+def orchestrator(monkeypatch):
+    instance = _build(monkeypatch)
+    yield instance
+    instance.close()
+
+
+def _runner(orchestrator: StockAgentOrchestrator, router_reply: str = "") -> StubRunner:
+    runner = StubRunner(router_reply)
+    orchestrator._runner = runner
+    return runner
+
+
+def test_run_builds_every_stage_prompt(orchestrator) -> None:
+    runner = _runner(orchestrator)
+    payload = orchestrator.run("msft")
+    assert set(runner.prompts) == {"price-specialist", "news-researcher", "lead-analyst"}
+    assert "MSFT" in runner.prompts["lead-analyst"]
+    assert payload["analysis"] == ["lead-analyst notes"]
+
+
+def test_follow_up_through_the_router_agent_uses_the_history(orchestrator) -> None:
+    runner = _runner(orchestrator, '{"stages": ["news", "analysis"]}')
+    history = [
+        {"role": "user", "content": "How did the quarter go?"},
+        {"role": "assistant", "content": "Revenue beat guidance."},
+    ]
+    payload = orchestrator.follow_up(
+        ticker="msft",
+        user_message="Tell me about their supply chain in Asia",
+        conversation_history=history,
+    )
+    assert set(runner.prompts) == {"followup-router", "news-researcher", "lead-analyst"}
+    assert "Revenue beat guidance." in runner.prompts["followup-router"]
+    assert "Revenue beat guidance." in runner.prompts["lead-analyst"]
+    assert payload["reply"] == "lead-analyst notes"
+    assert orchestrator.router_stats()["llm_routed"] == 1
+
+
+def test_obvious_follow_up_skips_the_router_agent(orchestrator) -> None:
+    runner = _runner(orchestrator)
+    orchestrator.follow_up(ticker="msft", user_message="Any news?")
+    assert set(runner.prompts) == {"news-researcher", "lead-analyst"}
+    assert orchestrator.router_stats()["fast_path"] == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["ingest", "warehouse-first"])
+async def test_each_downloaded_page_is_stored_once(monkeypatch, tmp_path, mode) -> None:
+    instance = _build(
+        monkeypatch,
+        BAR_WAREHOUSE_MODE=mode,
+        BAR_WAREHOUSE_PATH=str(tmp_path / "bars.sqlite3"),
+    )
+    warehouse = instance._warehouse
+    writes = []
+    append = warehouse.append
+    monkeypatch.setattr(
+        warehouse, "append", lambda series, **kwargs: writes.append(1) or append(series, **kwargs)
+    )
+    url = instance._settings.polygon_url("v2/aggs/ticker/MSFT/range/1/day/2024-09-03/2024-09-04")
+    bars = [{"t": day_start_ms(date(2024, 9, day)), "c": 400.0 + day} for day in (3, 4)]
+    with respx.mock(assert_all_called=True) as router:
+        router.get(url).mock(return_value=Response(200, json={"results": bars}))
+        if mode == "ingest":
+            await instance._polygon_client.fetch_range("MSFT", date(2024, 9, 3), date(2024, 9, 4))
+        else:
+            await warehouse.load(
+                instance._polygon_client, "MSFT", date(2024, 9, 3), date(2024, 9, 4)
+            )
+    await instance._http_client.aclose()
+    instance.close()
+    assert writes == [1]
@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+from azure_ai_foundry_demo.agents.polling import PollingStrategy, PollStats
+
+
+def test_strategy_polls_fast_then_backs_off_to_cap():
+    strategy = PollingStrategy(
+        initial_interval=0.1, fast_polls=2, multiplier=2.0, max_interval=0.5, jitter=0
+    )
+    delays = [strategy.interval(attempt) for attempt in range(6)]
+    assert delays == pytest.approx([0.1, 0.1, 0.2, 0.4, 0.5, 0.5])
+    assert strategy.interval(10_000) == pytest.approx(0.5)
+
+
+def test_strategy_jitter_stays_within_bounds():
+    strategy = PollingStrategy(initial_interval=1.0, fast_polls=1, max_interval=1.0, jitter=0.2)
+    rng = random.Random(7)
+    delays = {strategy.interval(0, rng) for _ in range(50)}
+    assert all(0.8 <= delay <= 1.2 for delay in delays)
+    assert len(delays) > 1
+
+
+def test_fixed_strategy_matches_legacy_interval():
+    strategy = PollingStrategy.fixed(1.0)
+    assert {strategy.interval(attempt) for attempt in range(5)} == {1.0}
+
+
+def test_strategy_rejects_invalid_configuration():
+    with pytest.raises(ValueError):
+        PollingStrategy(initial_interval=2.0, max_interval=1.0)
+    with pytest.raises(ValueError):
+        PollingStrategy(multiplier=0.5)
+
+
+def test_poll_stats_accumulate():
+    stats = PollStats()
+    stats.record(0.2)
+    stats.record(0.3)
+    assert stats.polls == 2
+    assert stats.waited_seconds == pytest.approx(0.5)
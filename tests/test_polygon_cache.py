@@ -0,0 +1,135 @@
+from datetime import UTC, date, datetime, time, timedelta
+
+import pytest
+import respx
+from httpx import Response
+
+from azure_ai_foundry_demo.cache import MemoryCacheBackend
+from azure_ai_foundry_demo.clients.polygon import PolygonDailyBar, PolygonQuote
+from azure_ai_foundry_demo.clients.polygon_cache import CachedPolygonClient
+from azure_ai_foundry_demo.config import Settings
+from azure_ai_foundry_demo.market_hours import EXCHANGE_TZ
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    monkeypatch.setenv("AZURE_AI_ENDPOINT", "https://unit.azure.com")
+    monkeypatch.setenv("AZURE_AI_PROJECT_NAME", "demo-project")
+    monkeypatch.setenv("AZURE_AI_CONNECTION_ID", "conn-id")
+    monkeypatch.setenv("SERPER_API_KEY", "serper")
+    monkeypatch.setenv("POLYGON_API_KEY", "poly")
+    monkeypatch.setenv("POLYGON_BASE_URL", "https://polygon.example.com")
+    return Settings()
+
+
+@pytest.mark.asyncio
+async def test_previous_close_is_cached_until_the_session_closes(settings):
+    now = datetime(2024, 10, 1, 12, 0, tzinfo=EXCHANGE_TZ)
+    clock_now = now.timestamp()
+    cache = MemoryCacheBackend(clock=lambda: clock_now)
+    client = CachedPolygonClient(settings, cache, now=lambda: now)
+    session = datetime(2024, 9, 30, tzinfo=EXCHANGE_TZ).timestamp() * 1000
+    payload = {"results": [{"c": 400.5, "o": 395.0, "t": session}]}
+    with respx.mock(assert_all_called=True) as router:
+        route = router.get(settings.polygon_url("v2/aggs/ticker/MSFT/prev")).mock(
+            return_value=Response(200, json=payload)
+        )
+        first = await client.fetch_previous_close("msft")
+        clock_now = datetime(2024, 10, 1, 15, 59, tzinfo=EXCHANGE_TZ).timestamp()
+        second = await client.fetch_previous_close("MSFT")
+        clock_now = datetime(2024, 10, 1, 16, 1, tzinfo=EXCHANGE_TZ).timestamp()
+        await client.fetch_previous_close("MSFT")
+    assert route.call_count == 2
+    assert second == first
+    assert client.cache_stats.hits == 1
+    assert client.cache_stats.expirations == 1
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_recent_bars_are_cached_per_window(settings):
+    now = datetime(2024, 10, 1, 17, 0, tzinfo=EXCHANGE_TZ)
+    cache = MemoryCacheBackend(clock=now.timestamp)
+    client = CachedPolygonClient(settings, cache, now=lambda: now)
+    payload = {"results": [{"o": 1, "h": 2, "l": 0.5, "c": 1.5, "v": 10, "t": 1_700_000_000_000}]}
+    with respx.mock(assert_all_called=True) as router:
+        route = router.get(url__startswith=settings.polygon_url("v2/aggs/ticker/MSFT/range")).mock(
+            return_value=Response(200, json=payload)
+        )
+        first = await client.fetch_recent_bars("MSFT", days=7)
+        second = await client.fetch_recent_bars("MSFT", days=7)
+        await client.fetch_recent_bars("MSFT", days=30)
+    assert route.call_count == 2
+    assert second == first
+    assert second.close[0] == pytest.approx(1.5)
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_grouped_daily_seeds_per_ticker_cache_entries(settings):
+    now = datetime(2024, 10, 2, 12, 0, tzinfo=EXCHANGE_TZ)
+    cache = MemoryCacheBackend(clock=now.timestamp)
+    grouped = {"results": [{"T": "MSFT", "c": 410.0, "o": 400.0, "t": 1_727_726_400_000}]}
+    url = settings.polygon_url("v2/aggs/grouped/locale/us/market/stocks/2024-10-01")
+    with respx.mock(assert_all_called=True) as router:
+        route = router.get(url).mock(return_value=Response(200, json=grouped))
+        first = CachedPolygonClient(settings, cache, now=lambda: now)
+        await first.fetch_previous_closes(["MSFT"])
+        # A fresh client (e.g. another process on a sqlite cache) reuses the cached grouped bars.
+        second = CachedPolygonClient(settings, cache, now=lambda: now)
+        quotes = await second.fetch_previous_closes(["MSFT"])
+    assert route.call_count == 1
+    assert quotes["MSFT"].close == pytest.approx(410.0)
+    assert cache.get("polygon:prev:MSFT") is not None
+
+
+def _daily_range(request):
+    # One bar per calendar day in the requested range, stamped at the session date.
+    *_, first, last = request.url.path.split("/")
+    day, end = date.fromisoformat(first), date.fromisoformat(last)
+    results = []
+    while day <= end:
+        stamp = datetime.combine(day, time(), tzinfo=EXCHANGE_TZ).timestamp() * 1000
+        results.append({"t": int(stamp), "c": float(day.toordinal())})
+        day += timedelta(days=1)
+    return Response(200, json={"results": results})
+
+
+@pytest.mark.asyncio
+async def test_history_only_fetches_days_outside_the_cached_span(settings):
+    now = datetime(2024, 10, 2, 12, 0, tzinfo=EXCHANGE_TZ)
+    cache = MemoryCacheBackend(clock=now.timestamp)
+    client = CachedPolygonClient(settings, cache, now=lambda: now)
+    with respx.mock(assert_all_called=True) as router:
+        route = router.get(url__startswith=settings.polygon_url("v2/aggs/ticker/MSFT/range")).mock(
+            side_effect=_daily_range
+        )
+        month = await client.fetch_history("MSFT", "1M")
+        quarter = await client.fetch_history("MSFT", "3M")
+        two_months = await client.fetch_history("MSFT", "2M")
+
+    spans = [call.request.url.path.rsplit("/", 2)[1:] for call in route.calls]
+    assert spans == [
+        ["2024-09-02", "2024-10-02"],
+        ["2024-07-02", "2024-09-01"],
+        # Today's bar is still forming, so it is the only day fetched again.
+        ["2024-10-02", "2024-10-02"],
+        ["2024-10-02", "2024-10-02"],
+    ]
+    assert len(month) == 31
+    assert len(quarter) == 93
+    assert two_months.dates()[0] == "2024-08-02"
+    assert two_months.dates()[-1] == "2024-10-02"
+    await client.aclose()
+
+
+def test_cached_records_round_trip():
+    as_of = datetime(2024, 10, 1, 4, tzinfo=UTC)
+    bar = PolygonDailyBar(ticker="MSFT", as_of=as_of, open=400.0, close=410.0)
+    quote = PolygonQuote(ticker="MSFT", close=410.0, open=None, as_of=as_of)
+
+    assert PolygonDailyBar.from_dict(bar.to_dict()) == bar
+    assert PolygonQuote.from_dict(quote.to_dict()) == quote
+    # Entries written by the earlier pydantic models (``Z`` suffix) still load.
+    legacy = {"ticker": "MSFT", "close": 410.0, "open": 400.0, "as_of": "2024-10-01T04:00:00Z"}
+    assert PolygonQuote.from_dict(legacy).as_of == as_of
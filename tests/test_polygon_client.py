@@ -4,8 +4,10 @@ import pytest
 import respx
 from httpx import Response
 
-from azure_ai_foundry_demo.clients.polygon import PolygonClient
+from azure_ai_foundry_demo.clients.polygon import GROUPED_RECHECK, PolygonClient
 from azure_ai_foundry_demo.config import Settings
+from azure_ai_foundry_demo.market_hours import EXCHANGE_TZ, day_start_ms
+from azure_ai_foundry_demo.warehouse import BarWarehouse
 
 
 @pytest.fixture
@@ -39,3 +41,150 @@ async def test_fetch_previous_close_converts_quote(settings):
     stock_quote = quote.to_stock_quote()
     assert stock_quote.price == quote.close
     assert stock_quote.change == pytest.approx(quote.close - quote.open)
+
+
+def _grouped_url(settings, day: str) -> str:
+    return settings.polygon_url(f"v2/aggs/grouped/locale/us/market/stocks/{day}")
+
+
+@pytest.mark.asyncio
+async def test_fetch_previous_closes_uses_one_grouped_request(settings):
+    now = dt.datetime(2024, 10, 2, 12, 0, tzinfo=EXCHANGE_TZ)
+    client = PolygonClient(settings, now=lambda: now)
+    grouped = {
+        "results": [
+            {"T": "MSFT", "c": 410.0, "o": 400.0, "t": 1_727_726_400_000},
+            {"T": "AAPL", "c": 230.0, "o": 228.0, "t": 1_727_726_400_000},
+        ]
+    }
+    with respx.mock(assert_all_called=True) as router:
+        grouped_route = router.get(_grouped_url(settings, "2024-10-01")).mock(
+            return_value=Response(200, json=grouped)
+        )
+        router.get(settings.polygon_url("v2/aggs/ticker/NVDA/prev")).mock(
+            return_value=Response(200, json={"results": [{"c": 120.0, "t": 1_727_726_400_000}]})
+        )
+        quotes = await client.fetch_previous_closes(["msft", "AAPL", "nvda"])
+        single = await client.fetch_previous_close("msft")
+    assert grouped_route.call_count == 1
+    assert sorted(quotes) == ["AAPL", "MSFT", "NVDA"]
+    assert quotes["MSFT"].close == pytest.approx(410.0)
+    assert single == quotes["MSFT"]
+
+
+@pytest.mark.asyncio
+async def test_grouped_lookup_walks_back_over_unlisted_holidays(settings):
+    now = dt.datetime(2024, 12, 26, 12, 0, tzinfo=EXCHANGE_TZ)
+    client = PolygonClient(settings, now=lambda: now)
+    bar = {"T": "MSFT", "c": 430.0, "o": 425.0, "t": 1_734_998_400_000}
+    with respx.mock(assert_all_called=True) as router:
+        router.get(_grouped_url(settings, "2024-12-25")).mock(
+            return_value=Response(200, json={"resultsCount": 0})
+        )
+        router.get(_grouped_url(settings, "2024-12-24")).mock(
+            return_value=Response(200, json={"results": [bar]})
+        )
+        session = await client.load_previous_session()
+        quote = await client.fetch_previous_close("MSFT")
+    assert session == dt.date(2024, 12, 24)
+    assert quote.close == pytest.approx(430.0)
+
+
+@pytest.mark.asyncio
+async def test_previous_session_is_today_after_the_close(settings):
+    clock = {"now": dt.datetime(2024, 10, 2, 15, 0, tzinfo=EXCHANGE_TZ)}
+    client = PolygonClient(settings, now=lambda: clock["now"])
+    bars = {
+        day: {"T": "MSFT", "c": close, "o": 400.0, "t": 1_727_000_000_000}
+        for day, close in (("2024-10-01", 410.0), ("2024-10-02", 415.0))
+    }
+    with respx.mock(assert_all_called=True) as router:
+        for day, bar in bars.items():
+            router.get(_grouped_url(settings, day)).mock(
+                return_value=Response(200, json={"results": [bar]})
+            )
+        assert await client.load_previous_session() == dt.date(2024, 10, 1)
+        assert (await client.fetch_previous_close("MSFT")).close == pytest.approx(410.0)
+        clock["now"] = dt.datetime(2024, 10, 2, 16, 5, tzinfo=EXCHANGE_TZ)
+        assert await client.load_previous_session() == dt.date(2024, 10, 2)
+        assert (await client.fetch_previous_close("MSFT")).close == pytest.approx(415.0)
+    # Only the newest grouped session is kept in memory.
+    assert client._indexed_grouped(dt.date(2024, 10, 1)) is None
+    assert client._indexed_grouped(dt.date(2024, 10, 2)) is not None
+
+
+@pytest.mark.asyncio
+async def test_unpublished_session_is_requested_again_later(settings):
+    clock = {"now": dt.datetime(2024, 10, 2, 16, 5, tzinfo=EXCHANGE_TZ)}
+    client = PolygonClient(settings, now=lambda: clock["now"])
+    bar = {"T": "MSFT", "c": 410.0, "o": 400.0, "t": 1_727_000_000_000}
+    with respx.mock(assert_all_called=True) as router:
+        today = router.get(_grouped_url(settings, "2024-10-02")).mock(
+            return_value=Response(200, json={"resultsCount": 0})
+        )
+        router.get(_grouped_url(settings, "2024-10-01")).mock(
+            return_value=Response(200, json={"results": [bar]})
+        )
+        assert await client.load_previous_session() == dt.date(2024, 10, 1)
+        assert await client.load_previous_session() == dt.date(2024, 10, 1)
+        assert today.call_count == 1
+        clock["now"] += GROUPED_RECHECK
+        await client.load_previous_session()
+        assert today.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_range_follows_next_url_pages(settings):
+    client = PolygonClient(settings)
+    base = settings.polygon_url("v2/aggs/ticker/MSFT/range/5/minute/2024-10-01/2024-10-01")
+    next_url = f"{base}?cursor=page-2"
+    pages = [
+        {"results": [{"t": 1_727_789_400_000, "c": 1.0}], "next_url": next_url},
+        {"results": [{"t": 1_727_789_700_000, "c": 2.0}]},
+    ]
+    requests = []
+
+    def respond(request):
+        requests.append(request)
+        return Response(200, json=pages[len(requests) - 1])
+
+    with respx.mock(assert_all_called=True) as router:
+        router.get(url__startswith=base).mock(side_effect=respond)
+        series = await client.fetch_range(
+            "msft", dt.date(2024, 10, 1), dt.date(2024, 10, 1), timespan="minute", multiplier=5
+        )
+    assert series.timespan == "minute"
+    assert series.close.tolist() == [1.0, 2.0]
+    assert series.dates() == ["2024-10-01T13:30", "2024-10-01T13:35"]
+    assert requests[0].url.params["sort"] == "asc"
+    assert requests[0].url.params["limit"] == str(settings.polygon_page_size)
+    assert requests[1].url.params["cursor"] == "page-2"
+    assert requests[1].url.params["apiKey"] == "poly"
+
+
+@pytest.mark.asyncio
+async def test_fetch_range_rejects_unknown_timespan(settings):
+    client = PolygonClient(settings)
+    with pytest.raises(ValueError):
+        await client.fetch_range(
+            "MSFT", dt.date(2024, 10, 1), dt.date(2024, 10, 2), timespan="tick"
+        )
+
+
+@pytest.mark.asyncio
+async def test_recent_bars_are_appended_to_the_warehouse(settings, tmp_path):
+    now = dt.datetime(2024, 10, 2, 12, 0, tzinfo=EXCHANGE_TZ)
+    warehouse = BarWarehouse(tmp_path / "bars.sqlite3", now=lambda: now)
+    client = PolygonClient(settings, warehouse=warehouse)
+    days = [dt.date(2024, 10, 2), dt.date(2024, 10, 1), dt.date(2024, 9, 30)]
+    payload = {"results": [{"t": day_start_ms(day), "c": float(day.day)} for day in days]}
+    with respx.mock(assert_all_called=True) as router:
+        router.get(url__startswith=settings.polygon_url("v2/aggs/ticker/MSFT/range")).mock(
+            return_value=Response(200, json=payload)
+        )
+        bars = await client.fetch_recent_bars("MSFT", days=3)
+    stored = warehouse.query("MSFT", 0, day_start_ms(dt.date(2024, 10, 3)))
+    assert len(bars) == 3
+    assert stored.dates() == ["2024-09-30", "2024-10-01"]
+    warehouse.close()
+    await client.aclose()
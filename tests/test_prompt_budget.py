@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+
+from azure_ai_foundry_demo.agents.prompt_budget import (
+    TRUNCATION_MARK,
+    PromptSection,
+    assemble_prompt,
+    compact_payload,
+    count_tokens,
+    render_history,
+    shrink_payload,
+    truncate_tokens,
+)
+from azure_ai_foundry_demo.agents.prompt_builders import build_analysis_prompt
+from azure_ai_foundry_demo.agents.stage_models import StageResult
+from azure_ai_foundry_demo.bars import BarSeries
+from azure_ai_foundry_demo.models import FinanceResearchPayload
+
+
+def _payload(bars: int = 0) -> FinanceResearchPayload:
+    timestamps = 1_700_000_000_000 + np.arange(bars, dtype=np.int64) * 86_400_000
+    values = np.linspace(100.0, 200.0, 5 * bars).reshape(5, bars) + 0.123456
+    return FinanceResearchPayload.model_validate(
+        {
+            "quote": {"ticker": "MSFT", "price": 412.345678, "currency": "USD"},
+            "historical": BarSeries("MSFT", timestamps, values),
+            "news": [{"title": "Headline", "link": "https://example.com/a"}],
+            "organic_results": [{"title": "Result"}],
+        }
+    )
+
+
+def test_count_and_truncate_tokens() -> None:
+    text = "The quick brown fox jumps over the lazy dog " * 20
+    assert count_tokens("") == 0
+    assert count_tokens(text) > count_tokens("The quick brown fox")
+    assert count_tokens(text, limit=5) > 5
+    truncated = truncate_tokens(text, 10)
+    assert truncated.endswith(TRUNCATION_MARK)
+    assert count_tokens(truncated) <= 10
+    assert truncate_tokens("short", 10) == "short"
+    assert truncate_tokens(text, 0) == ""
+
+
+def test_assemble_prompt_grants_tokens_by_priority_and_keeps_order() -> None:
+    filler = "word " * 50
+    sections = [
+        PromptSection("first", "Required header", priority=0),
+        PromptSection("dropped", filler, priority=2),
+        PromptSection(
+            "shrunk",
+            filler,
+            priority=1,
+            shrink=lambda allowance: truncate_tokens(filler, allowance),
+        ),
+        PromptSection("last", "Required footer", priority=0),
+    ]
+    prompt = assemble_prompt(sections, budget=30)
+    parts = prompt.split("\n\n")
+    assert parts[0] == "Required header"
+    assert parts[-1] == "Required footer"
+    assert len(parts) == 3
+    assert parts[1].endswith(TRUNCATION_MARK)
+    assert count_tokens(prompt) <= 30
+
+
+def test_compact_payload_is_columnar_rounded_and_unindented() -> None:
+    text = compact_payload(_payload(bars=3))
+    data = json.loads(text)
+    assert "\n" not in text
+    assert data["quote"]["price"] == 412.35
+    assert set(data["historical"]) == {"date", "open", "high", "low", "close", "volume"}
+    assert len(data["historical"]["close"]) == 3
+    assert all(round(value, 2) == value for value in data["historical"]["close"])
+
+
+def test_shrink_payload_keeps_the_most_recent_bars() -> None:
+    payload = _payload(bars=2000)
+    full = compact_payload(payload)
+    text = shrink_payload(payload, 600)
+    data = json.loads(text)
+    assert count_tokens(text) <= 600 < count_tokens(full)
+    kept = len(data["historical"]["date"])
+    assert 0 < kept < 2000
+    assert data["historical"]["date"][-1] == payload.historical.dates()[-1]
+    assert shrink_payload(payload, 5) == ""
+
+
+def test_render_history_keeps_newest_turns_and_condenses_older_ones() -> None:
+    turns = []
+    for index in range(40):
+        turns.append(f"User: Question {index} about margins? Follow-up detail.")
+        turns.append(f"Assistant: Answer {index} with plenty of supporting analysis.")
+    text = render_history(turns, 120, title="Conversation history:")
+    lines = text.splitlines()
+    assert lines[0] == "Conversation history:"
+    assert lines[1].startswith("Earlier (")
+    assert "Question 3" in lines[1] or "Question 2" in lines[1]
+    assert lines[-1] == turns[-1]
+    assert count_tokens(text) <= 120
+
+
+def test_build_analysis_prompt_stays_within_budget() -> None:
+    history = [
+        {"role": "user" if index % 2 == 0 else "assistant", "content": f"Turn {index} " * 40}
+        for index in range(300)
+    ]
+    prompt = build_analysis_prompt(
+        "msft",
+        [StageResult(name="price-stage", messages=["Price notes"])],
+        last_payload=_payload(bars=3000),
+        summary="Panel summary",
+        conversation_history=history,
+        user_message="Latest question",
+        token_budget=2000,
+    )
+    assert count_tokens(prompt) <= 2000
+    assert "MSFT" in prompt
+    assert "Latest question" in prompt
+    assert "Price notes" in prompt
+    assert "Price Snapshot" in prompt
+    assert "Turn 299" in prompt
+    assert "Turn 0 Turn 0" not in prompt
+    assert '"historical"' in prompt
@@ -0,0 +1,122 @@
+import asyncio
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from azure_ai_foundry_demo.clients.http import send_rate_limited
+from azure_ai_foundry_demo.rate_limit import RateLimiter, RateLimitPolicy, retry_after_seconds
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_allows_burst_then_paces_requests():
+    clock = FakeClock()
+    limiter = RateLimiter("test", rate=2, burst=2, max_in_flight=10, clock=clock)
+
+    delays = [limiter._reserve() for _ in range(4)]
+
+    assert delays == [0.0, 0.0, pytest.approx(0.5), pytest.approx(1.0)]
+    clock.now += 5
+    assert limiter._reserve() == 0.0
+
+
+def test_defer_blocks_tokens_until_retry_after_elapses():
+    clock = FakeClock()
+    limiter = RateLimiter("test", rate=0, max_in_flight=1, clock=clock)
+
+    limiter.defer(3)
+
+    assert limiter._reserve() == pytest.approx(3)
+    assert limiter.stats.throttled == 1
+    clock.now += 3
+    assert limiter._reserve() == 0.0
+
+
+@pytest.mark.asyncio
+async def test_in_flight_cap_queues_excess_callers():
+    limiter = RateLimiter("test", rate=0, max_in_flight=2)
+    release = asyncio.Event()
+    peak = 0
+
+    async def call() -> None:
+        nonlocal peak
+        async with limiter.acquire():
+            peak = max(peak, limiter.stats.in_flight)
+            await release.wait()
+
+    tasks = [asyncio.create_task(call()) for _ in range(5)]
+    await asyncio.sleep(0.01)
+    assert limiter.stats.in_flight == 2
+    assert limiter.stats.queue_depth == 3
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert peak == 2
+    assert limiter.stats.as_dict() | {"wait_seconds": 0} == {
+        "acquired": 5,
+        "throttled": 0,
+        "queue_depth": 0,
+        "max_queue_depth": 3,
+        "in_flight": 0,
+        "wait_seconds": 0,
+    }
+
+
+def test_retry_after_parses_seconds_and_http_dates():
+    now = datetime(2024, 10, 1, 12, 0, tzinfo=UTC)
+    assert retry_after_seconds({"Retry-After": "2.5"}) == 2.5
+    assert retry_after_seconds({"Retry-After": "Tue, 01 Oct 2024 12:00:04 GMT"}, now=now) == 4
+    assert retry_after_seconds({"Retry-After": "soon"}) is None
+    assert retry_after_seconds({}) is None
+
+
+@pytest.mark.asyncio
+async def test_send_rate_limited_retries_429_after_retry_after():
+    limiter = RateLimiter("test", rate=0, max_in_flight=1)
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "0.01"}),
+        httpx.Response(200, json={"ok": True}),
+    ]
+
+    async def send() -> httpx.Response:
+        return responses.pop(0)
+
+    response = await send_rate_limited(send, limiter, max_retries=3)
+
+    assert response.status_code == 200
+    assert limiter.stats.throttled == 1
+    assert limiter.stats.acquired == 2
+
+
+@pytest.mark.asyncio
+async def test_send_rate_limited_returns_429_once_retries_are_exhausted():
+    limiter = RateLimiter("test", rate=0, max_in_flight=1)
+
+    async def send() -> httpx.Response:
+        return httpx.Response(429, headers={"Retry-After": "0"})
+
+    response = await send_rate_limited(send, limiter, max_retries=1)
+
+    assert response.status_code == 429
+    assert limiter.stats.acquired == 2
+
+
+def test_azure_policy_takes_a_slot_and_defers_on_429():
+    clock = FakeClock()
+    limiter = RateLimiter("azure", rate=0, max_in_flight=1, clock=clock)
+    policy = RateLimitPolicy(limiter)
+    http_response = SimpleNamespace(status_code=429, headers={"Retry-After": "7"})
+    policy.next = SimpleNamespace(send=lambda request: SimpleNamespace(http_response=http_response))
+
+    policy.send(object())
+
+    assert limiter.stats.acquired == 1
+    assert limiter._reserve() == pytest.approx(7)
@@ -0,0 +1,95 @@
+from types import SimpleNamespace
+
+from azure_ai_foundry_demo.agents.registry import (
+    REGISTRY_APP,
+    REGISTRY_VERSION,
+    AgentRegistry,
+    agent_key,
+)
+
+
+class FakeAgentsClient:
+    def __init__(self, existing=None) -> None:
+        self.agents = {agent.id: agent for agent in existing or []}
+        self.created: list[str] = []
+        self.deleted: list[str] = []
+
+    def create_agent(self, *, model, name, instructions, tools, metadata):
+        agent = SimpleNamespace(
+            id=f"agent-{len(self.agents) + 1}", name=name, model=model, metadata=metadata
+        )
+        self.agents[agent.id] = agent
+        self.created.append(agent.id)
+        return agent
+
+    def list_agents(self):
+        return list(self.agents.values())
+
+    def delete_agent(self, agent_id):
+        self.deleted.append(agent_id)
+        self.agents.pop(agent_id)
+
+
+def _tagged(agent_id: str, name: str, key: str, version: str = REGISTRY_VERSION):
+    metadata = {"app": REGISTRY_APP, "registry_version": version, "registry_key": key}
+    return SimpleNamespace(id=agent_id, name=name, metadata=metadata)
+
+
+def test_agent_key_changes_with_instructions_tools_and_model():
+    base = {"name": "price", "instructions": "Do it", "tools": [], "model": "m"}
+    assert agent_key(**base) == agent_key(**base)
+    assert agent_key(**base) != agent_key(**base | {"instructions": "Do it differently"})
+    assert agent_key(**base) != agent_key(**base | {"tools": [{"type": "function"}]})
+    assert agent_key(**base) != agent_key(**base | {"model": "other"})
+
+
+def test_registry_reuses_agents_across_runs():
+    client = FakeAgentsClient()
+    registry = AgentRegistry(client, "model")
+
+    first = registry.get_or_create(name="price", instructions="A", tools=[])
+    second = registry.get_or_create(name="price", instructions="A", tools=[])
+
+    assert first is second
+    assert client.created == [first.id]
+    assert (registry.created, registry.reused) == (1, 1)
+
+
+def test_registry_adopts_agents_from_previous_sessions():
+    key = agent_key(name="price", instructions="A", tools=[], model="model")
+    client = FakeAgentsClient([_tagged("agent-old", "price", key)])
+    registry = AgentRegistry(client, "model")
+
+    agent = registry.get_or_create(name="price", instructions="A", tools=[])
+
+    assert agent.id == "agent-old"
+    assert client.created == []
+
+
+def test_registry_collects_superseded_and_outdated_agents():
+    old_key = agent_key(name="price", instructions="old", tools=[], model="model")
+    client = FakeAgentsClient(
+        [
+            _tagged("agent-superseded", "price", old_key),
+            _tagged("agent-outdated", "news", "whatever", version="0"),
+            SimpleNamespace(id="agent-foreign", name="price", metadata={}),
+        ]
+    )
+    registry = AgentRegistry(client, "model")
+    current = registry.get_or_create(name="price", instructions="new", tools=[])
+
+    registry.shutdown()
+
+    assert sorted(client.deleted) == ["agent-outdated", "agent-superseded"]
+    assert current.id in client.agents
+    assert "agent-foreign" in client.agents
+
+
+def test_registry_shutdown_can_delete_active_agents():
+    client = FakeAgentsClient()
+    registry = AgentRegistry(client, "model")
+    agent = registry.get_or_create(name="router", instructions="Route", tools=[])
+
+    registry.shutdown(delete_active=True)
+
+    assert client.deleted == [agent.id]
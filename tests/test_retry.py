@@ -0,0 +1,140 @@
+import asyncio
+
+import httpx
+import pytest
+
+from azure_ai_foundry_demo.clients.retry import LatencyTracker, ResilientSender, RetryPolicy
+from azure_ai_foundry_demo.rate_limit import RateLimiter
+
+FAST = RetryPolicy(initial_backoff=0.001, max_backoff=0.01, jitter=0, deadline=2.0)
+
+
+def _scripted(*outcomes):
+    calls: list[int] = []
+
+    async def send() -> httpx.Response:
+        calls.append(1)
+        outcome = outcomes[min(len(calls), len(outcomes)) - 1]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return send, calls
+
+
+def test_backoff_grows_exponentially_up_to_the_cap():
+    policy = RetryPolicy(initial_backoff=0.1, multiplier=2, max_backoff=0.3, jitter=0)
+    assert [policy.backoff(retry) for retry in range(4)] == [0.1, 0.2, 0.3, 0.3]
+
+
+@pytest.mark.asyncio
+async def test_retries_server_errors_until_success():
+    send, calls = _scripted(httpx.Response(503), httpx.Response(502), httpx.Response(200))
+    sender = ResilientSender(FAST)
+
+    response = await sender.send(send)
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+    assert sender.stats.retries == 2
+
+
+@pytest.mark.asyncio
+async def test_connect_errors_are_raised_once_attempts_run_out():
+    send, calls = _scripted(httpx.ConnectError("refused"))
+    sender = ResilientSender(FAST)
+
+    with pytest.raises(httpx.ConnectError):
+        await sender.send(send)
+
+    assert len(calls) == FAST.max_attempts
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried():
+    send, calls = _scripted(httpx.Response(404))
+
+    response = await ResilientSender(FAST).send(send)
+
+    assert response.status_code == 404
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_429_is_left_to_the_rate_limiter_when_one_is_configured():
+    send, calls = _scripted(httpx.Response(429, headers={"Retry-After": "0"}))
+    limiter = RateLimiter("test", rate=0, max_in_flight=1)
+
+    response = await ResilientSender(FAST, limiter, rate_limit_retries=1).send(send)
+
+    assert response.status_code == 429
+    assert len(calls) == 2
+    assert limiter.stats.throttled == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_after_longer_than_the_budget_stops_retrying():
+    send, calls = _scripted(httpx.Response(503, headers={"Retry-After": "60"}))
+
+    response = await ResilientSender(FAST).send(send)
+
+    assert response.status_code == 503
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_deadline_budget_bounds_slow_attempts():
+    async def send() -> httpx.Response:
+        await asyncio.sleep(1)
+        return httpx.Response(200)
+
+    sender = ResilientSender(RetryPolicy(deadline=0.05))
+
+    with pytest.raises(httpx.TimeoutException):
+        await sender.send(send)
+    assert sender.stats.deadline_exceeded == 1
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_wins_when_primary_is_slow():
+    delays = [1.0, 0.0]
+    cancelled: list[bool] = []
+
+    async def send() -> httpx.Response:
+        delay = delays.pop(0)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return httpx.Response(200, json={"delay": delay})
+
+    sender = ResilientSender(RetryPolicy(hedge=True, hedge_delay=0.02))
+
+    response = await sender.send(send)
+
+    assert response.json() == {"delay": 0.0}
+    assert sender.stats.hedges == 1
+    assert sender.stats.hedge_wins == 1
+    assert cancelled == [True]
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_is_not_hedged():
+    send, calls = _scripted(httpx.Response(200))
+    sender = ResilientSender(RetryPolicy(hedge=True, hedge_delay=0.5))
+
+    await sender.send(send)
+
+    assert len(calls) == 1
+    assert sender.stats.hedges == 0
+
+
+def test_latency_tracker_reports_p95_after_enough_samples():
+    tracker = LatencyTracker(min_samples=20)
+    for value in range(19):
+        tracker.record(value / 100)
+    assert tracker.p95() is None
+    for value in range(19, 100):
+        tracker.record(value / 100)
+    assert tracker.p95() == pytest.approx(0.94)
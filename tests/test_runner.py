@@ -1,8 +1,24 @@
 import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from azure.ai.agents.models import (
+    MessageDelta,
+    MessageDeltaChunk,
+    MessageDeltaTextContent,
+    MessageDeltaTextContentObject,
+    RequiredFunctionToolCall,
+    RequiredFunctionToolCallDetails,
+    RunStatus,
+    SubmitToolOutputsAction,
+    SubmitToolOutputsDetails,
+    ThreadRun,
+    ToolOutput,
+)
 
-from azure_ai_foundry_demo.agents.runner import AzureAgentRunner
+from azure_ai_foundry_demo.agents.polling import PollingStrategy
+from azure_ai_foundry_demo.agents.runner import AsyncAzureAgentRunner, AzureAgentRunner
 
 
 def test_parse_function_arguments_returns_empty_dict_for_blank_input():
@@ -16,7 +32,216 @@ def test_parse_function_arguments_requires_object():
         AzureAgentRunner._parse_function_arguments("[]")
 
 
-
 def test_parse_function_arguments_parses_json_object():
     result = AzureAgentRunner._parse_function_arguments('{"ticker": "MSFT"}')
     assert result == {"ticker": "MSFT"}
+
+
+class FakeAsyncMessages:
+    def __init__(self) -> None:
+        self.created: list[str] = []
+
+    async def create(self, *, thread_id, role, content):
+        self.created.append(content)
+        return SimpleNamespace(id="msg-user")
+
+    async def list(self, *, thread_id):
+        for message in [
+            SimpleNamespace(role="user", run_id="run-1", text_messages=[]),
+            SimpleNamespace(
+                role="assistant",
+                run_id="run-1",
+                text_messages=[SimpleNamespace(text=SimpleNamespace(value="**Done**"))],
+            ),
+        ]:
+            yield message
+
+
+class FakeAsyncThreads:
+    def __init__(self) -> None:
+        self.deleted: list[str] = []
+
+    async def create(self):
+        return SimpleNamespace(id="thread-1")
+
+    async def delete(self, *, thread_id):
+        self.deleted.append(thread_id)
+
+
+class FakeAsyncRuns:
+    def __init__(self, tool_calls) -> None:
+        self._tool_calls = tool_calls
+        self.submitted: list[ToolOutput] = []
+        self.polls = 0
+
+    def _run(self, status, required_action=None):
+        return SimpleNamespace(
+            id="run-1", thread_id="thread-1", status=status, required_action=required_action
+        )
+
+    async def create(self, *, thread_id, agent_id):
+        return self._run(RunStatus.QUEUED)
+
+    async def get(self, *, thread_id, run_id):
+        self.polls += 1
+        if not self.submitted:
+            action = SubmitToolOutputsAction(
+                submit_tool_outputs=SubmitToolOutputsDetails(tool_calls=self._tool_calls)
+            )
+            return self._run(RunStatus.REQUIRES_ACTION, action)
+        return self._run(RunStatus.COMPLETED)
+
+    async def submit_tool_outputs(self, *, thread_id, run_id, tool_outputs):
+        self.submitted = list(tool_outputs)
+        return self._run(RunStatus.IN_PROGRESS)
+
+
+def _tool_call(call_id: str, name: str, arguments: str) -> RequiredFunctionToolCall:
+    return RequiredFunctionToolCall(
+        id=call_id, function=RequiredFunctionToolCallDetails(name=name, arguments=arguments)
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_runner_executes_tool_calls_as_coroutines():
+    runs = FakeAsyncRuns(
+        [
+            _tool_call("call-1", "lookup_stock_overview", '{"ticker": "MSFT"}'),
+            _tool_call("call-2", "search_related_news", '{"query": "msft"}'),
+        ]
+    )
+    threads = FakeAsyncThreads()
+    agents = SimpleNamespace(threads=threads, runs=runs, messages=FakeAsyncMessages())
+    tooling = SimpleNamespace(
+        aexecute_function=AsyncMock(side_effect=lambda name, arguments: f"{name}:ok")
+    )
+    runner = AsyncAzureAgentRunner(SimpleNamespace(agents=agents), poll_interval=0)
+
+    result = await runner.run_with_functions(SimpleNamespace(id="agent-1"), "prompt", tooling)
+
+    assert result.messages == ["Done"]
+    assert [output.output for output in runs.submitted] == [
+        "lookup_stock_overview:ok",
+        "search_related_news:ok",
+    ]
+    assert tooling.aexecute_function.await_count == 2
+    assert threads.deleted == ["thread-1"]
+
+
+@pytest.mark.asyncio
+async def test_async_runner_requires_tooling_for_tool_calls():
+    runs = FakeAsyncRuns([_tool_call("call-1", "lookup_stock_overview", "{}")])
+    agents = SimpleNamespace(threads=FakeAsyncThreads(), runs=runs, messages=FakeAsyncMessages())
+    runner = AsyncAzureAgentRunner(SimpleNamespace(agents=agents), poll_interval=0)
+
+    with pytest.raises(RuntimeError):
+        await runner.run_with_functions(SimpleNamespace(id="agent-1"), "prompt", None)
+
+
+@pytest.mark.asyncio
+async def test_async_runner_reports_poll_counts_and_honours_per_run_strategy():
+    runs = FakeAsyncRuns([_tool_call("call-1", "lookup_stock_overview", '{"ticker": "MSFT"}')])
+    agents = SimpleNamespace(threads=FakeAsyncThreads(), runs=runs, messages=FakeAsyncMessages())
+    tooling = SimpleNamespace(aexecute_function=AsyncMock(return_value="{}"))
+    runner = AsyncAzureAgentRunner(SimpleNamespace(agents=agents), poll_interval=5.0)
+
+    result = await runner.run_with_functions(
+        SimpleNamespace(id="agent-1"), "prompt", tooling, polling=PollingStrategy.fixed(0)
+    )
+
+    assert result.poll_count == runs.polls == 2
+    assert result.poll_wait_seconds == 0
+
+
+class FakeEventStream:
+    def __init__(self, events) -> None:
+        self.events = list(events)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return None
+
+    def __iter__(self):
+        while self.events:
+            yield self.events.pop(0)
+
+
+class FakeStreamingRuns:
+    def __init__(self, first_leg, second_leg) -> None:
+        self._first_leg = first_leg
+        self._second_leg = second_leg
+        self.submitted: list[ToolOutput] = []
+
+    def stream(self, *, thread_id, agent_id):
+        self.stream_handle = FakeEventStream(self._first_leg)
+        return self.stream_handle
+
+    def submit_tool_outputs_stream(self, *, thread_id, run_id, tool_outputs, event_handler):
+        self.submitted = list(tool_outputs)
+        event_handler.events.extend(self._second_leg)
+
+
+def _delta(text: str) -> MessageDeltaChunk:
+    return MessageDeltaChunk(
+        id="delta",
+        delta=MessageDelta(
+            role="assistant",
+            content=[
+                MessageDeltaTextContent(index=0, text=MessageDeltaTextContentObject(value=text))
+            ],
+        ),
+    )
+
+
+def _thread_run(status, required_action=None) -> ThreadRun:
+    run = ThreadRun(id="run-1", thread_id="thread-1", status=status)
+    run.required_action = required_action
+    return run
+
+
+def test_stream_with_functions_yields_deltas_and_handles_tool_calls_inline():
+    action = SubmitToolOutputsAction(
+        submit_tool_outputs=SubmitToolOutputsDetails(
+            tool_calls=[_tool_call("call-1", "lookup_stock_overview", '{"ticker": "MSFT"}')]
+        )
+    )
+    runs = FakeStreamingRuns(
+        first_leg=[
+            ("thread.run.requires_action", _thread_run(RunStatus.REQUIRES_ACTION, action), None)
+        ],
+        second_leg=[
+            ("thread.message.delta", _delta("Price "), None),
+            ("thread.message.delta", _delta("is up"), None),
+            ("thread.run.completed", _thread_run(RunStatus.COMPLETED), None),
+        ],
+    )
+    threads = SimpleNamespace(create=lambda: SimpleNamespace(id="thread-1"), delete=MagicMock())
+    messages = SimpleNamespace(
+        create=MagicMock(),
+        list=lambda thread_id: [
+            SimpleNamespace(
+                role="assistant",
+                run_id="run-1",
+                text_messages=[SimpleNamespace(text=SimpleNamespace(value="Price is up"))],
+            )
+        ],
+    )
+    agents = SimpleNamespace(threads=threads, runs=runs, messages=messages)
+    tooling = SimpleNamespace(execute_function=MagicMock(return_value='{"ok": true}'))
+    runner = AzureAgentRunner(SimpleNamespace(agents=agents))
+
+    events = list(runner.stream_with_functions(SimpleNamespace(id="agent-1"), "prompt", tooling))
+
+    assert [event.kind for event in events] == [
+        "tool_call",
+        "text_delta",
+        "text_delta",
+        "completed",
+    ]
+    assert events[0].arguments == {"ticker": "MSFT"}
+    assert "".join(event.text for event in events) == "Price is up"
+    assert events[-1].result.messages == ["Price is up"]
+    assert [output.output for output in runs.submitted] == ['{"ok": true}']
+    threads.delete.assert_called_once_with(thread_id="thread-1")
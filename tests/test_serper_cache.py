@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+import respx
+from httpx import Response
+
+from azure_ai_foundry_demo.cache import MemoryCacheBackend
+from azure_ai_foundry_demo.clients.serper_cache import (
+    CachedSerperClient,
+    cache_key,
+    normalize_query,
+)
+from azure_ai_foundry_demo.config import Settings
+
+NEWS_PAYLOAD = {"news": [{"title": "Headline", "link": "https://news.example.com/a"}]}
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    monkeypatch.setenv("AZURE_AI_ENDPOINT", "https://unit.azure.com")
+    monkeypatch.setenv("AZURE_AI_PROJECT_NAME", "demo-project")
+    monkeypatch.setenv("AZURE_AI_CONNECTION_ID", "conn-id")
+    monkeypatch.setenv("SERPER_API_KEY", "secret")
+    monkeypatch.setenv("SERPER_SEARCH_URL", "https://example.com/search")
+    monkeypatch.setenv("SERPER_NEWS_URL", "https://example.com/news")
+    monkeypatch.setenv("POLYGON_API_KEY", "poly")
+    return Settings()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def client(settings, clock):
+    cache = MemoryCacheBackend(clock=clock)
+    return CachedSerperClient(settings, cache, ttl=60, stale_ttl=300, clock=clock)
+
+
+def test_normalize_query_ignores_case_spacing_and_order():
+    assert normalize_query("MSFT earnings news") == normalize_query(" msft  News\tearnings ")
+    base = {"q": "msft news", "gl": "us", "hl": "en"}
+    assert cache_key("u", base) == cache_key("u", base | {"q": "News MSFT"})
+    assert cache_key("u", base) != cache_key("u", base | {"timeframe": "7d"})
+    assert cache_key("u", base | {"num": 5}) != cache_key("u", base | {"num": 10})
+
+
+@pytest.mark.asyncio
+async def test_equivalent_queries_hit_the_cache(client):
+    with respx.mock(assert_all_called=True) as router:
+        route = router.get("https://example.com/news").mock(
+            return_value=Response(200, json=NEWS_PAYLOAD)
+        )
+        first = await client.fetch_news("MSFT earnings news")
+        second = await client.fetch_news("msft earnings  news")
+    assert route.call_count == 1
+    assert first == second
+    assert client.cache_stats.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_are_served_while_revalidating(client, clock):
+    refreshed = {"news": [{"title": "Fresh", "link": "https://news.example.com/b"}]}
+    with respx.mock(assert_all_called=True) as router:
+        route = router.get("https://example.com/news").mock(
+            side_effect=[Response(200, json=NEWS_PAYLOAD), Response(200, json=refreshed)]
+        )
+        await client.fetch_news("msft")
+        clock.now += 120
+        stale = await client.fetch_news("msft")
+        await asyncio.sleep(0.01)
+        fresh = await client.fetch_news("msft")
+    assert stale[0].title == "Headline"
+    assert fresh[0].title == "Fresh"
+    assert route.call_count == 2
+    assert client.stale_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_queries_share_one_request(client):
+    release = asyncio.Event()
+
+    async def slow_response(request):
+        await release.wait()
+        return Response(200, json=NEWS_PAYLOAD)
+
+    with respx.mock(assert_all_called=True) as router:
+        route = router.get("https://example.com/news").mock(side_effect=slow_response)
+        pending = [asyncio.ensure_future(client.fetch_news(q)) for q in ("msft", "MSFT", " msft")]
+        await asyncio.sleep(0.01)
+        release.set()
+        results = await asyncio.gather(*pending)
+    assert route.call_count == 1
+    assert client.shared_requests == 2
+    assert all(result == results[0] for result in results)
+
+
+@pytest.mark.asyncio
+async def test_failed_shared_refresh_is_logged_once(client, clock, caplog):
+    release = asyncio.Event()
+    responses = iter([Response(200, json=NEWS_PAYLOAD), Response(400, json={})])
+
+    async def respond(request):
+        response = next(responses)
+        if response.status_code != 200:
+            await release.wait()
+        return response
+
+    with respx.mock(assert_all_called=True) as router:
+        route = router.get("https://example.com/news").mock(side_effect=respond)
+        await client.fetch_news("msft")
+        clock.now += 120
+        stale = await asyncio.gather(*(client.fetch_news("msft") for _ in range(3)))
+        release.set()
+        await asyncio.sleep(0.01)
+    assert all(result[0].title == "Headline" for result in stale)
+    assert route.call_count == 2
+    assert client.stale_hits == 3
+    assert caplog.text.count("Background Serper refresh failed") == 1
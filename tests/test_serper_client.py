@@ -1,10 +1,12 @@
+import httpx
 import pytest
 import respx
 from httpx import Response
 
+from azure_ai_foundry_demo.clients.retry import RetryPolicy
 from azure_ai_foundry_demo.clients.serper import SerperClient
 from azure_ai_foundry_demo.config import Settings
-from azure_ai_foundry_demo.models import NewsHeadline, StockQuote
+from azure_ai_foundry_demo.models import Headline, StockQuote
 
 
 @pytest.fixture
@@ -36,7 +38,7 @@ async def test_fetch_news(settings):
         router.get("https://example.com/news").mock(return_value=Response(200, json=news_payload))
         headlines = await client.fetch_news("msft")
     assert len(headlines) == 1
-    assert isinstance(headlines[0], NewsHeadline)
+    assert isinstance(headlines[0], Headline)
     assert headlines[0].title == "Headline"
 
 
@@ -59,3 +61,47 @@ def test_stock_quote_dump(settings):
     quote = StockQuote(ticker="MSFT", price=100.0, change=1.5, change_percent=1.5, currency="USD")
     data = quote.model_dump()
     assert data["ticker"] == "MSFT"
+
+
+@pytest.mark.asyncio
+async def test_search_web_retries_transient_failures(settings):
+    policy = RetryPolicy(initial_backoff=0.001, max_backoff=0.01, jitter=0)
+    client = SerperClient(settings, retry_policy=policy)
+    with respx.mock(assert_all_called=True) as router:
+        route = router.post("https://example.com/search").mock(
+            side_effect=[
+                httpx.ConnectError("refused"),
+                Response(502),
+                Response(200, json={"organic": [{"title": "Item", "link": "https://x.example"}]}),
+            ]
+        )
+        results = await client.search_web("msft")
+    assert route.call_count == 3
+    assert results[0]["title"] == "Item"
+    assert client.retry_stats.retries == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_news_skips_invalid_items(settings):
+    client = SerperClient(settings)
+    news_payload = {
+        "news": [
+            {"title": "Valid", "link": "https://news.example.com/a", "extra": 1},
+            {"title": "Missing link"},
+            "not-an-object",
+            {"link": "https://news.example.com/b"},
+        ]
+    }
+    with respx.mock(assert_all_called=True) as router:
+        router.get("https://example.com/news").mock(return_value=Response(200, json=news_payload))
+        headlines = await client.fetch_news("msft")
+    assert [headline.title for headline in headlines] == ["Valid", ""]
+
+
+def test_serper_requests_are_only_hedged_when_opted_in(settings, monkeypatch):
+    # Serper bills every request, so the shared hedging switch does not apply to it.
+    monkeypatch.setenv("HTTP_HEDGE_ENABLED", "true")
+    assert SerperClient(Settings())._sender._policy.hedge is False
+    monkeypatch.setenv("SERPER_HEDGE_ENABLED", "true")
+    assert SerperClient(Settings())._sender._policy.hedge is True
+    assert RetryPolicy.from_settings(Settings()).hedge is True
@@ -0,0 +1,66 @@
+import threading
+
+import pytest
+
+from azure_ai_foundry_demo.agents.stage_graph import StageGraph
+from azure_ai_foundry_demo.agents.stage_models import StageResult
+from azure_ai_foundry_demo.agents.stage_specs import STAGE_REGISTRY, StageSpec
+
+
+def _spec(name: str, *depends_on: str) -> StageSpec:
+    return StageSpec(name=name, instructions="", uses_tools=False, depends_on=depends_on)
+
+
+def test_independent_stages_run_concurrently_and_join_before_analysis():
+    barrier = threading.Barrier(2, timeout=1)
+    seen: dict[str, list[str]] = {}
+
+    def execute(name, finished):
+        seen[name] = sorted(finished)
+        if name in {"price", "news"}:
+            barrier.wait()
+        return StageResult(name=name, messages=[name])
+
+    results = StageGraph(STAGE_REGISTRY).run(execute)
+
+    assert list(results) == ["price", "news", "analysis"]
+    assert seen["analysis"] == ["news", "price"]
+
+
+def test_single_ready_stage_runs_on_calling_thread():
+    threads: dict[str, threading.Thread] = {}
+
+    def execute(name, finished):
+        threads[name] = threading.current_thread()
+        return StageResult(name=name, messages=[])
+
+    StageGraph({"news": STAGE_REGISTRY["news"], "analysis": STAGE_REGISTRY["analysis"]}).run(
+        execute
+    )
+
+    assert threads["news"] is threading.current_thread()
+    assert threads["analysis"] is threading.current_thread()
+
+
+def test_dependencies_outside_the_plan_are_ignored():
+    graph = StageGraph({"analysis": STAGE_REGISTRY["analysis"]})
+    assert graph.order == ["analysis"]
+
+
+def test_cycles_are_rejected():
+    with pytest.raises(ValueError):
+        StageGraph({"a": _spec("a", "b"), "b": _spec("b", "a")})
+
+
+def test_stage_failure_propagates_and_skips_dependents():
+    ran: list[str] = []
+
+    def execute(name, finished):
+        ran.append(name)
+        if name == "news":
+            raise RuntimeError("news failed")
+        return StageResult(name=name, messages=[])
+
+    with pytest.raises(RuntimeError, match="news failed"):
+        StageGraph(STAGE_REGISTRY).run(execute)
+    assert "analysis" not in ran
@@ -1,7 +1,37 @@
-from unittest.mock import MagicMock
+import asyncio
+import json
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock
 
-from azure_ai_foundry_demo.agents.tooling import ResearchTooling
-from azure_ai_foundry_demo.models import FinanceResearchPayload, StockQuote
+import pytest
+
+from azure_ai_foundry_demo.agents.tooling import TOOL_HISTORY_BARS, ResearchTooling
+from azure_ai_foundry_demo.bars import BarSeries, Lookback
+from azure_ai_foundry_demo.clients.polygon import PolygonQuote
+from azure_ai_foundry_demo.models import FinanceResearchPayload, Headline, StockQuote
+
+
+def _quote() -> PolygonQuote:
+    return PolygonQuote(
+        ticker="MSFT", close=410.0, open=400.0, as_of=datetime(2024, 10, 1, tzinfo=UTC)
+    )
+
+
+def _bars() -> BarSeries:
+    return BarSeries.from_polygon_results(
+        "MSFT",
+        [
+            {
+                "t": int(datetime(2024, 9, day, tzinfo=UTC).timestamp() * 1000),
+                "o": 400.0 + day,
+                "h": 405.0 + day,
+                "l": 395.0 + day,
+                "c": 401.0 + day,
+                "v": 1_000.0 * day,
+            }
+            for day in (30, 27, 26)
+        ],
+    )
 
 
 def test_research_tooling_reset():
@@ -13,3 +43,129 @@ def test_research_tooling_reset():
 
     assert tooling.last_payload is None
     assert tooling.last_news_results == []
+
+
+@pytest.mark.asyncio
+async def test_fetch_overview_requests_quote_and_bars_concurrently():
+    both_started = asyncio.Event()
+    in_flight = 0
+
+    async def wait_for_peer() -> None:
+        nonlocal in_flight
+        in_flight += 1
+        if in_flight == 2:
+            both_started.set()
+        await asyncio.wait_for(both_started.wait(), timeout=1)
+
+    async def fetch_previous_close(ticker: str) -> PolygonQuote:
+        await wait_for_peer()
+        return _quote()
+
+    async def fetch_recent_bars(ticker: str, days: int) -> BarSeries:
+        await wait_for_peer()
+        return _bars()
+
+    polygon = MagicMock()
+    polygon.fetch_previous_close = fetch_previous_close
+    polygon.fetch_recent_bars = fetch_recent_bars
+    tooling = ResearchTooling(polygon_client=polygon, serper_client=MagicMock())
+
+    payload = await tooling._fetch_overview_async("msft")
+
+    assert payload.quote.price == pytest.approx(410.0)
+    assert len(payload.historical) == 3
+    assert payload.metrics is not None
+
+
+@pytest.mark.asyncio
+async def test_fetch_overview_keeps_bars_when_quote_fails():
+    polygon = MagicMock()
+    polygon.fetch_previous_close = AsyncMock(side_effect=ValueError("no quote"))
+    polygon.fetch_recent_bars = AsyncMock(return_value=_bars())
+    tooling = ResearchTooling(polygon_client=polygon, serper_client=MagicMock())
+
+    payload = await tooling._fetch_overview_async("msft")
+
+    assert payload.quote == StockQuote(ticker="MSFT")
+    assert payload.historical.dates() == ["2024-09-26", "2024-09-27", "2024-09-30"]
+    assert payload.metrics is not None
+    assert payload.metrics.period_days == 3
+
+
+@pytest.mark.asyncio
+async def test_fetch_overview_keeps_quote_when_bars_fail():
+    polygon = MagicMock()
+    polygon.fetch_previous_close = AsyncMock(return_value=_quote())
+    polygon.fetch_recent_bars = AsyncMock(side_effect=ValueError("no bars"))
+    tooling = ResearchTooling(polygon_client=polygon, serper_client=MagicMock())
+
+    payload = await tooling._fetch_overview_async("msft")
+
+    assert payload.quote.price == pytest.approx(410.0)
+    assert len(payload.historical) == 0
+    assert payload.metrics is None
+
+
+def test_fork_isolates_run_state_but_shares_clients():
+    polygon, serper = MagicMock(), MagicMock()
+    tooling = ResearchTooling(polygon_client=polygon, serper_client=serper)
+    tooling.last_news_results = [{"title": "Headline", "link": "https://example.com"}]
+
+    forked = tooling.fork()
+
+    assert forked.last_news_results == []
+    assert forked._polygon_client is polygon
+    assert forked._serper_client is serper
+
+
+@pytest.mark.asyncio
+async def test_lookback_fetches_history_and_caps_tool_output():
+    polygon = MagicMock()
+    polygon.fetch_previous_close = AsyncMock(return_value=_quote())
+    start = int(datetime(2020, 1, 1, tzinfo=UTC).timestamp() * 1000)
+    history = BarSeries.from_polygon_results(
+        "MSFT", [{"t": start + day * 86_400_000, "c": 100.0 + day} for day in range(1260)]
+    )
+    polygon.fetch_history = AsyncMock(return_value=history)
+    tooling = ResearchTooling(polygon_client=polygon, serper_client=MagicMock())
+
+    output = json.loads(
+        await tooling.aexecute_function(
+            "lookup_stock_overview", {"ticker": "msft", "lookback": "5y"}
+        )
+    )
+
+    polygon.fetch_history.assert_awaited_once_with("msft", Lookback(5, "Y"), timespan="day")
+    polygon.fetch_recent_bars.assert_not_called()
+    assert len(output["historical"]["close"]) == TOOL_HISTORY_BARS
+    assert output["metrics"]["period_days"] == 1260
+    assert len(tooling.last_payload.historical) == 1260
+
+
+@pytest.mark.asyncio
+async def test_invalid_lookback_is_reported_to_the_agent():
+    polygon = MagicMock()
+    tooling = ResearchTooling(polygon_client=polygon, serper_client=MagicMock())
+
+    output = json.loads(await tooling.alookup_stock_overview("MSFT", lookback="forever"))
+
+    assert "Invalid lookback" in output["error"]
+    polygon.fetch_history.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_news_headlines_are_validated_at_the_tool_boundary():
+    serper = MagicMock()
+    serper.fetch_news = AsyncMock(
+        return_value=[
+            Headline(title="Valid", link="https://news.example.com/a", snippet="Summary"),
+            Headline(title="Broken", link="not a url"),
+        ]
+    )
+    tooling = ResearchTooling(polygon_client=MagicMock(), serper_client=serper)
+    tooling.last_payload = FinanceResearchPayload(quote=StockQuote(ticker="MSFT"))
+
+    output = json.loads(await tooling.asearch_related_news("msft"))
+
+    assert [item["title"] for item in output] == ["Valid"]
+    assert [str(item.link) for item in tooling.last_payload.news] == ["https://news.example.com/a"]
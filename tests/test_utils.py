@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import random
+import re
 from dataclasses import dataclass
 
 import pytest
 
-from azure_ai_foundry_demo.agents.utils import message_to_text
+from azure_ai_foundry_demo.agents.utils import (
+    StreamingNormalizer,
+    _normalize_text,
+    message_to_text,
+)
 
 
 @dataclass
@@ -69,3 +75,96 @@ def test_message_to_text_normalises_formatting(payload: FakeMessage, expected: s
 def test_message_to_text_falls_back_to_content_items() -> None:
     message = FakeMessage(content=[FakeContentItem(FakeTextValue("Paragraph one"))])
     assert message_to_text(message) == "Paragraph one"
+
+
+# The previous multi-pass normalizer, kept as the reference for the single-scan version.
+_CODES = "USD|EUR|GBP|JPY|CAD|AUD|CHF"
+_MONTHS = "January|February|March|April|May|June|July|August|September|October|November|December"
+
+
+def _reference_normalize(raw: str) -> str:
+    text = raw.replace("\r\n", "\n")
+    text = re.sub(r"\\(\d)", r"\1", text)
+    text = re.sub(r"(\*\*|__|\*|_)(.+?)\1", lambda m: m.group(2), text)
+    text = re.sub(r"^(\s*)(\d+)[\.)]\s+", lambda m: f"{m.group(1)}- ", text, flags=re.MULTILINE)
+    text = re.sub(rf"(\d)({_CODES})", lambda m: f"{m.group(1)} {m.group(2)}", text)
+    text = re.sub(rf"({_CODES})(?=[A-Za-z])", lambda m: f"{m.group(1)} ", text)
+    text = re.sub(rf"({_MONTHS})(\d)", lambda m: f"{m.group(1)} {m.group(2)}", text)
+    text = re.sub(r",(?=\S)", ", ", text)
+    normalized: list[str] = []
+    for raw_line in text.split("\n"):
+        line = raw_line.strip()
+        if not line:
+            if normalized and normalized[-1] != "":
+                normalized.append("")
+            continue
+        if line.startswith("- "):
+            normalized.append(line)
+            continue
+        if normalized and not normalized[-1].startswith("- ") and normalized[-1] != "":
+            normalized[-1] = f"{normalized[-1]} {line}"
+            continue
+        normalized.append(line)
+    return "\n".join(normalized).strip()
+
+
+_FRAGMENTS = (
+    *("*", "**", "_", "__", "\\", "\\1", "1", "23", "1.", "2)", "10. ", "- ", "-", ".", ")"),
+    *(" ", "  ", "\t", "\n", "\n\n", "\r\n", "\r", "\x85", "\u2028", ",", ", "),
+    *("USD", "CAD", "EUR", "ecember", "September", "May", "December", "\u0663", "a", "A", "Bold"),
+)
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "1.\n2.\nfoo",
+        "1.\n  2. x",
+        "1.\n\n\nfoo\n3) bar",
+        "**2.** Summarise",
+        "5**USD**,x",
+        "CADecember5",
+        "\\1. item",
+        "a\n \n1. x",
+        "x\n1.\n",
+        "1. ",
+        "1.",
+    ],
+)
+def test_normalize_text_edge_cases_match_reference(raw: str) -> None:
+    assert _normalize_text(raw) == _reference_normalize(raw)
+
+
+def test_normalize_text_matches_reference_on_random_documents() -> None:
+    rng = random.Random(2024)
+    for _ in range(5000):
+        raw = "".join(rng.choice(_FRAGMENTS) for _ in range(rng.randint(0, 40)))
+        assert _normalize_text(raw) == _reference_normalize(raw), raw
+
+
+def test_streaming_normalizer_emits_settled_text_early() -> None:
+    normalizer = StreamingNormalizer()
+    assert normalizer.feed("**bo") == ""
+    assert normalizer.feed("ld** closed at 412") == "bold closed at 412"
+    assert normalizer.feed("USD on Octo") == " USD on "
+    assert normalizer.feed("ber17,up\n1.") == "October 17, up"
+    assert normalizer.feed(" item\n") == "\n- item"
+    assert normalizer.flush() == ""
+
+
+def test_streaming_normalizer_matches_batch_on_random_chunkings() -> None:
+    rng = random.Random(2025)
+    normalizer = StreamingNormalizer()
+    for _ in range(3000):
+        raw = "".join(rng.choice(_FRAGMENTS) for _ in range(rng.randint(0, 40)))
+        cuts = sorted(rng.sample(range(len(raw) + 1), min(len(raw) + 1, rng.randint(0, 8))))
+        pieces = [normalizer.feed(raw[start:end]) for start, end in zip([0, *cuts], cuts)]
+        pieces.append(normalizer.feed(raw[cuts[-1] if cuts else 0 :]))
+        assert "".join(pieces) + normalizer.flush() == _normalize_text(raw), (raw, cuts)
+
+
+@pytest.mark.parametrize("raw", ["1.\n2.\nfoo", "-\n____\r\na", "CADecember5", "a\\\r\n1."])
+def test_streaming_normalizer_matches_batch_one_character_at_a_time(raw: str) -> None:
+    normalizer = StreamingNormalizer()
+    streamed = "".join(normalizer.feed(char) for char in raw) + normalizer.flush()
+    assert streamed == _normalize_text(raw)
@@ -0,0 +1,172 @@
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import numpy as np
+import pytest
+
+from azure_ai_foundry_demo.agents.tooling import ResearchTooling
+from azure_ai_foundry_demo.bars import BarSeries
+from azure_ai_foundry_demo.clients.polygon import PolygonQuote
+from azure_ai_foundry_demo.market_hours import EXCHANGE_TZ, day_start_ms
+from azure_ai_foundry_demo.warehouse import BarWarehouse
+
+NOW = datetime(2024, 10, 2, 12, 0, tzinfo=EXCHANGE_TZ)
+
+
+def _daily(first: date, last: date, ticker: str = "MSFT") -> BarSeries:
+    days = [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+    return BarSeries.from_polygon_results(
+        ticker, [{"t": day_start_ms(day), "c": float(day.day), "v": None} for day in days]
+    )
+
+
+class FakePolygon:
+    def __init__(self) -> None:
+        self.spans: list[tuple[date, date]] = []
+        self.offline = False
+        # Serves bars only up to this day, like an empty or truncated response.
+        self.last_day: date | None = None
+
+    async def fetch_range(self, ticker, start, end, *, timespan="day", multiplier=1):
+        if self.offline:
+            raise httpx.ConnectError("offline")
+        self.spans.append((start, end))
+        if self.last_day is not None:
+            end = min(end, self.last_day)
+        if end < start:
+            return BarSeries.empty(ticker)
+        return _daily(start, end, ticker)
+
+
+@pytest.fixture
+def warehouse(tmp_path):
+    store = BarWarehouse(tmp_path / "bars.sqlite3", now=lambda: NOW)
+    yield store
+    store.close()
+
+
+def test_append_keeps_settled_bars_once(warehouse):
+    series = _daily(date(2024, 9, 28), date(2024, 10, 2))
+
+    assert warehouse.append(series) == 4
+    assert warehouse.append(series) == 0
+    stored = warehouse.query("msft", 0, day_start_ms(date(2024, 10, 3)))
+
+    assert stored.dates() == ["2024-09-28", "2024-09-29", "2024-09-30", "2024-10-01"]
+    assert stored.close.tolist() == [28.0, 29.0, 30.0, 1.0]
+    assert np.isnan(stored.volume).all()
+    assert warehouse.tickers() == ["MSFT"]
+    assert len(warehouse) == 4
+
+
+def test_bars_persist_across_reopen(tmp_path):
+    path = tmp_path / "bars.sqlite3"
+    first = BarWarehouse(path, now=lambda: NOW)
+    first.append(_daily(date(2024, 9, 1), date(2024, 9, 30)))
+    first.close()
+
+    reopened = BarWarehouse(path, now=lambda: NOW)
+    window = reopened.query(
+        "MSFT", day_start_ms(date(2024, 9, 10)), day_start_ms(date(2024, 9, 13))
+    )
+    assert window.dates() == ["2024-09-10", "2024-09-11", "2024-09-12"]
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_load_only_fetches_days_outside_coverage(warehouse):
+    polygon = FakePolygon()
+
+    first = await warehouse.load(polygon, "MSFT", date(2024, 9, 1), date(2024, 10, 2))
+    second = await warehouse.load(polygon, "MSFT", date(2024, 6, 1), date(2024, 10, 2))
+
+    assert polygon.spans == [
+        (date(2024, 9, 1), date(2024, 10, 2)),
+        (date(2024, 6, 1), date(2024, 8, 31)),
+        (date(2024, 10, 2), date(2024, 10, 2)),
+    ]
+    assert warehouse.coverage("MSFT") == (date(2024, 6, 1), date(2024, 10, 1))
+    assert len(first) == 32
+    assert second.dates()[0] == "2024-06-01"
+    # Today's bar is returned but not stored.
+    assert second.dates()[-1] == "2024-10-02"
+    assert len(warehouse) == len(second) - 1
+
+
+@pytest.mark.asyncio
+async def test_load_serves_stored_bars_when_offline(warehouse):
+    polygon = FakePolygon()
+    await warehouse.load(polygon, "MSFT", date(2024, 9, 1), date(2024, 10, 1))
+    polygon.offline = True
+
+    series = await warehouse.load(polygon, "MSFT", date(2024, 8, 1), date(2024, 10, 2))
+
+    assert series.dates()[0] == "2024-09-01"
+    assert series.dates()[-1] == "2024-10-01"
+    assert warehouse.stats.fetch_failures == 2
+    assert warehouse.coverage("MSFT") == (date(2024, 9, 1), date(2024, 10, 1))
+
+
+@pytest.mark.asyncio
+async def test_empty_or_short_fetches_are_retried_later(warehouse):
+    polygon = FakePolygon()
+    polygon.last_day = date(2024, 8, 1)
+
+    empty = await warehouse.load(polygon, "MSFT", date(2024, 9, 1), date(2024, 10, 1))
+    assert len(empty) == 0
+    assert warehouse.coverage("MSFT") is None
+
+    polygon.last_day = None
+    await warehouse.load(polygon, "MSFT", date(2024, 9, 1), date(2024, 10, 1))
+    assert warehouse.coverage("MSFT") == (date(2024, 9, 1), date(2024, 10, 1))
+
+    # A truncated backfill would leave a gap before the stored range, so it is not covered.
+    polygon.last_day = date(2024, 7, 15)
+    await warehouse.load(polygon, "MSFT", date(2024, 6, 1), date(2024, 10, 1))
+    assert warehouse.coverage("MSFT") == (date(2024, 9, 1), date(2024, 10, 1))
+
+    polygon.last_day = None
+    series = await warehouse.load(polygon, "MSFT", date(2024, 6, 1), date(2024, 10, 1))
+    assert polygon.spans[-1] == (date(2024, 6, 1), date(2024, 8, 31))
+    assert warehouse.coverage("MSFT") == (date(2024, 6, 1), date(2024, 10, 1))
+    assert len(series) == 123
+
+
+@pytest.mark.asyncio
+async def test_empty_backfill_is_covered(warehouse):
+    polygon = FakePolygon()
+    await warehouse.load(polygon, "MSFT", date(2024, 9, 1), date(2024, 10, 1))
+
+    # Before the listing: nothing to download, and the span is not asked for again.
+    polygon.last_day = date(2024, 5, 1)
+    series = await warehouse.load(polygon, "MSFT", date(2024, 6, 1), date(2024, 10, 1))
+    await warehouse.load(polygon, "MSFT", date(2024, 6, 1), date(2024, 10, 1))
+
+    assert polygon.spans == [
+        (date(2024, 9, 1), date(2024, 10, 1)),
+        (date(2024, 6, 1), date(2024, 8, 31)),
+    ]
+    assert warehouse.coverage("MSFT") == (date(2024, 6, 1), date(2024, 10, 1))
+    assert series.dates()[0] == "2024-09-01"
+
+
+@pytest.mark.asyncio
+async def test_warehouse_first_overview_reads_local_bars(warehouse):
+    polygon = MagicMock()
+    polygon.fetch_previous_close = AsyncMock(
+        return_value=PolygonQuote(ticker="MSFT", close=410.0, open=400.0, as_of=NOW)
+    )
+    polygon.fetch_range = AsyncMock(side_effect=FakePolygon().fetch_range)
+    tooling = ResearchTooling(
+        polygon_client=polygon, serper_client=MagicMock(), warehouse=warehouse
+    )
+
+    payload = await tooling._fetch_overview_async("msft", "1M")
+    await tooling.fork()._fetch_overview_async("msft", "1M")
+
+    assert polygon.fetch_range.await_count == 2
+    assert polygon.fetch_range.await_args_list[1].args[1:] == (date(2024, 10, 2), date(2024, 10, 2))
+    assert payload.historical.dates()[0] == "2024-09-02"
+    polygon.fetch_recent_bars.assert_not_called()
+    polygon.fetch_history.assert_not_called()
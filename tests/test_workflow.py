@@ -1,4 +1,7 @@
+import threading
+import time
 from dataclasses import dataclass
+from unittest.mock import MagicMock
 
 import pytest
 
@@ -50,3 +53,79 @@ def test_workflow_returns_dataclass(monkeypatch, orchestrator_payload):
     summary = render_report(report, include_sources=True)
     assert "Ticker: MSFT" in summary
     assert "Sources:" in summary
+
+
+class BatchOrchestrator:
+    def __init__(self, payload, *, fail=(), hang=()) -> None:
+        self._payload = payload
+        self._fail = set(fail)
+        self._hang = set(hang)
+        self.release = threading.Event()
+        self.active = 0
+        self.peak = 0
+        self.events: list[str] = []
+        self._lock = threading.Lock()
+
+    def run(self, ticker: str) -> dict[str, object]:
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.events.append(f"start {ticker}")
+        try:
+            if ticker in self._hang:
+                self.release.wait(timeout=5)
+            time.sleep(0.01)
+            if ticker in self._fail:
+                raise RuntimeError(f"{ticker} failed")
+            return dict(self._payload, ticker=ticker)
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.events.append(f"end {ticker}")
+
+
+def test_run_many_reports_partial_failures_with_bounded_concurrency(orchestrator_payload):
+    orchestrator = BatchOrchestrator(orchestrator_payload, fail={"BAD"})
+    workflow = StockResearchWorkflow(settings=MagicMock(), orchestrator=orchestrator)
+    tickers = ["msft", "aapl", "bad", "nvda", "MSFT", "amzn", "goog"]
+
+    outcomes = {outcome.ticker: outcome for outcome in workflow.run_many(tickers, 2, timeout=5)}
+
+    assert sorted(outcomes) == ["AAPL", "AMZN", "BAD", "GOOG", "MSFT", "NVDA"]
+    assert not outcomes["BAD"].ok
+    assert outcomes["BAD"].error == "BAD failed"
+    assert outcomes["NVDA"].report.ticker == "NVDA"
+    assert orchestrator.peak <= 2
+
+
+def test_run_many_reports_timeouts_without_blocking_other_tickers(orchestrator_payload):
+    orchestrator = BatchOrchestrator(orchestrator_payload, hang={"SLOW"})
+    workflow = StockResearchWorkflow(settings=MagicMock(), orchestrator=orchestrator)
+
+    try:
+        outcomes = list(workflow.run_many(["slow", "fast"], 2, timeout=0.2))
+    finally:
+        orchestrator.release.set()
+
+    assert [outcome.ticker for outcome in outcomes] == ["FAST", "SLOW"]
+    assert outcomes[1].timed_out
+    assert outcomes[1].report is None
+
+
+def test_timed_out_run_keeps_its_worker_until_it_returns(orchestrator_payload):
+    orchestrator = BatchOrchestrator(orchestrator_payload, hang={"SLOW"})
+    workflow = StockResearchWorkflow(settings=MagicMock(), orchestrator=orchestrator)
+    release = threading.Timer(0.5, orchestrator.release.set)
+    release.start()
+
+    try:
+        outcomes = list(workflow.run_many(["slow", "fast"], 1, timeout=0.3))
+    finally:
+        release.cancel()
+        orchestrator.release.set()
+
+    assert [outcome.ticker for outcome in outcomes] == ["SLOW", "FAST"]
+    assert outcomes[0].timed_out
+    # FAST waited for the worker and its deadline only started once it was running.
+    assert orchestrator.events == ["start SLOW", "end SLOW", "start FAST", "end FAST"]
+    assert outcomes[1].ok